@@ -1,56 +1,168 @@
 import { NextRequest, NextResponse } from 'next/server';
 import { getCurrentUser } from '@/lib/auth';
+import { prisma } from '@/lib/prisma';
 import { spawn } from 'child_process';
-import { promisify } from 'util';
+
+// Keep in sync with scrapers/registry.py and scrapers/worker.py
+const PLATFORMS = ['medium', 'core77', 'awwwards', 'behance', 'dribbble'];
+const JOB_KINDS = ['scrape', 'curation', 'rescore'];
+
+async function getAdmin(request: NextRequest) {
+  const token = request.headers.get('authorization')?.replace('Bearer ', '');
+  const user = await getCurrentUser(token);
+  return user && user.role === 'admin' ? user : null;
+}
+
+// Legacy mode: one Python process per request (SCRAPER_DISPATCH=spawn)
+function spawnScraper(platform: string | null) {
+  const pythonProcess = spawn('python3', [
+    'scrapers/run_scrapers.py',
+    ...(platform ? ['--platform', platform] : [])
+  ], {
+    cwd: process.cwd(),
+    stdio: 'pipe'
+  });
+
+  pythonProcess.stdout.on('data', (data) => {
+    console.log('Scraper output:', data.toString());
+  });
+
+  pythonProcess.stderr.on('data', (data) => {
+    console.error('Scraper error:', data.toString());
+  });
+
+  pythonProcess.on('close', (code) => {
+    console.log('Scraper process finished with code:', code);
+  });
+}
+
+// Queue a job for the resident worker; an identical in-flight job is reused
+async function enqueueJob(kind: string, platform: string | null, requestedBy: string) {
+  const dedupeKey = `${kind}:${platform ?? 'all'}`;
+
+  for (let attempt = 0; attempt < 3; attempt++) {
+    const inserted = await prisma.$queryRaw<{ id: string }[]>`
+      INSERT INTO scraper_jobs (id, kind, platform, "dedupeKey", "requestedBy")
+      VALUES (gen_random_uuid()::text, ${kind}, ${platform}, ${dedupeKey}, ${requestedBy})
+      ON CONFLICT ("dedupeKey") WHERE status IN ('queued', 'running') DO NOTHING
+      RETURNING id
+    `;
+
+    if (inserted.length > 0) {
+      await prisma.$queryRaw`SELECT pg_notify('scraper_jobs', ${inserted[0].id})`;
+      return { jobId: inserted[0].id, status: 'queued', deduplicated: false };
+    }
+
+    const existing = await prisma.scraperJob.findFirst({
+      where: { dedupeKey, status: { in: ['queued', 'running'] } },
+      select: { id: true, status: true },
+    });
+    if (existing) {
+      return { jobId: existing.id, status: existing.status, deduplicated: true };
+    }
+  }
+
+  throw new Error(`Could not enqueue ${dedupeKey}`);
+}
 
 export async function POST(request: NextRequest) {
   try {
-    const token = request.headers.get('authorization')?.replace('Bearer ', '');
-    const user = await getCurrentUser(token);
+    const user = await getAdmin(request);
 
-    if (!user || user.role !== 'admin') {
+    if (!user) {
       return NextResponse.json(
         { error: 'Unauthorized' },
         { status: 401 }
       );
     }
 
-    const { platform } = await request.json();
+    const body = await request.json().catch(() => ({}));
+    const platform: string | null = body.platform ? String(body.platform).toLowerCase() : null;
+    const kind: string = body.kind ?? 'scrape';
 
-    console.log('Manual scraping triggered by admin:', user.id, 'Platform:', platform || 'all');
+    if (platform && !PLATFORMS.includes(platform)) {
+      return NextResponse.json({ error: `Unknown platform: ${body.platform}` }, { status: 400 });
+    }
+    if (!JOB_KINDS.includes(kind)) {
+      return NextResponse.json({ error: `Unknown job kind: ${kind}` }, { status: 400 });
+    }
 
-    // Trigger the Python scraper in the background
-    const pythonProcess = spawn('python3', [
-      'scrapers/run_scrapers.py',
-      ...(platform ? ['--platform', platform] : [])
-    ], {
-      cwd: process.cwd(),
-      stdio: 'pipe'
-    });
+    console.log('Manual scraping triggered by admin:', user.id, 'Kind:', kind, 'Platform:', platform || 'all');
 
-    // Set up process handlers
-    pythonProcess.stdout.on('data', (data) => {
-      console.log('Scraper output:', data.toString());
-    });
+    if (process.env.SCRAPER_DISPATCH === 'spawn') {
+      if (kind !== 'scrape') {
+        return NextResponse.json({ error: 'Only scrape jobs can be spawned' }, { status: 400 });
+      }
+      spawnScraper(platform);
+      return NextResponse.json({
+        success: true,
+        message: 'Scraping initiated',
+        platform: platform || 'all platforms'
+      });
+    }
 
-    pythonProcess.stderr.on('data', (data) => {
-      console.error('Scraper error:', data.toString());
-    });
+    const job = await enqueueJob(kind, platform, user.id);
 
-    pythonProcess.on('close', (code) => {
-      console.log('Scraper process finished with code:', code);
-    });
+    return NextResponse.json({
+      success: true,
+      message: job.deduplicated ? 'Identical job already in progress' : 'Scraping queued',
+      platform: platform || 'all platforms',
+      ...job
+    }, { status: 202 });
+  } catch (error) {
+    console.error('Admin ingest API error:', error);
+    return NextResponse.json(
+      { error: 'Internal server error' },
+      { status: 500 }
+    );
+  }
+}
+
+// Poll a queued job: GET /api/admin/ingest?jobId=...
+export async function GET(request: NextRequest) {
+  try {
+    const user = await getAdmin(request);
 
-    return NextResponse.json({ 
-      success: true, 
-      message: 'Scraping initiated',
-      platform: platform || 'all platforms'
+    if (!user) {
+      return NextResponse.json(
+        { error: 'Unauthorized' },
+        { status: 401 }
+      );
+    }
+
+    const jobId = request.nextUrl.searchParams.get('jobId');
+    if (!jobId) {
+      return NextResponse.json({ error: 'jobId is required' }, { status: 400 });
+    }
+
+    const job = await prisma.scraperJob.findUnique({ where: { id: jobId } });
+    if (!job) {
+      return NextResponse.json({ error: 'Job not found' }, { status: 404 });
+    }
+
+    const now = Date.now();
+    const queueWaitMs = (job.startedAt?.getTime() ?? now) - job.createdAt.getTime();
+    const runMs = job.startedAt ? (job.finishedAt?.getTime() ?? now) - job.startedAt.getTime() : null;
+
+    return NextResponse.json({
+      jobId: job.id,
+      kind: job.kind,
+      platform: job.platform,
+      status: job.status,
+      workerId: job.workerId,
+      result: job.result,
+      error: job.error,
+      createdAt: job.createdAt,
+      startedAt: job.startedAt,
+      finishedAt: job.finishedAt,
+      queueWaitMs,
+      runMs
     });
   } catch (error) {
-    console.error('Admin ingest API error:', error);
+    console.error('Admin ingest status API error:', error);
     return NextResponse.json(
       { error: 'Internal server error' },
       { status: 500 }
     );
   }
-}
\ No newline at end of file
+}
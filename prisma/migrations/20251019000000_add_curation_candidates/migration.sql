@@ -0,0 +1,24 @@
+-- Precomputed per-platform / per-author top-k used by the curator
+
+-- CreateTable
+CREATE TABLE "curation_candidates" (
+    "inspirationId" TEXT NOT NULL,
+    "platform" TEXT NOT NULL,
+    "authorName" TEXT,
+    "score" DOUBLE PRECISION NOT NULL,
+    "publishedAt" TIMESTAMP(3) NOT NULL,
+    "platformRank" INTEGER NOT NULL,
+    "authorRank" INTEGER NOT NULL,
+    "updatedAt" TIMESTAMP(3) NOT NULL DEFAULT CURRENT_TIMESTAMP,
+
+    CONSTRAINT "curation_candidates_pkey" PRIMARY KEY ("inspirationId")
+);
+
+-- Curator reads author-limited rows ordered by score
+CREATE INDEX "curation_candidates_authorRank_score_idx" ON "curation_candidates" ("authorRank", "score" DESC);
+
+-- Incremental maintenance replaces one platform partition at a time
+CREATE INDEX "curation_candidates_platform_platformRank_idx" ON "curation_candidates" ("platform", "platformRank");
+
+-- AddForeignKey
+ALTER TABLE "curation_candidates" ADD CONSTRAINT "curation_candidates_inspirationId_fkey" FOREIGN KEY ("inspirationId") REFERENCES "inspirations"("id") ON DELETE CASCADE ON UPDATE CASCADE;
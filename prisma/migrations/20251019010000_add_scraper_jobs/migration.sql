@@ -0,0 +1,25 @@
+-- Job queue consumed by the resident scraper worker (scrapers/worker.py)
+
+-- CreateTable
+CREATE TABLE "scraper_jobs" (
+    "id" TEXT NOT NULL,
+    "kind" TEXT NOT NULL,
+    "platform" TEXT,
+    "dedupeKey" TEXT NOT NULL,
+    "status" TEXT NOT NULL DEFAULT 'queued',
+    "requestedBy" TEXT,
+    "workerId" TEXT,
+    "result" JSONB,
+    "error" TEXT,
+    "createdAt" TIMESTAMP(3) NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    "startedAt" TIMESTAMP(3),
+    "finishedAt" TIMESTAMP(3),
+
+    CONSTRAINT "scraper_jobs_pkey" PRIMARY KEY ("id")
+);
+
+-- Workers claim the oldest queued job
+CREATE INDEX "scraper_jobs_status_createdAt_idx" ON "scraper_jobs" ("status", "createdAt");
+
+-- At most one in-flight job per kind/platform; duplicate requests attach to it
+CREATE UNIQUE INDEX "scraper_jobs_inflight_dedupeKey_key" ON "scraper_jobs" ("dedupeKey") WHERE "status" IN ('queued', 'running');
@@ -0,0 +1,27 @@
+-- Per-page work queue shared by all scraper replicas (scrapers/task_queue.py)
+
+-- CreateTable
+CREATE TABLE "scrape_tasks" (
+    "id" TEXT NOT NULL,
+    "runDate" DATE NOT NULL,
+    "platform" TEXT NOT NULL,
+    "page" INTEGER NOT NULL,
+    "status" TEXT NOT NULL DEFAULT 'pending',
+    "attempts" INTEGER NOT NULL DEFAULT 0,
+    "leaseOwner" TEXT,
+    "leaseExpiresAt" TIMESTAMP(3),
+    "heartbeatAt" TIMESTAMP(3),
+    "pagesFetched" INTEGER NOT NULL DEFAULT 0,
+    "itemsScraped" INTEGER NOT NULL DEFAULT 0,
+    "error" TEXT,
+    "createdAt" TIMESTAMP(3) NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    "finishedAt" TIMESTAMP(3),
+
+    CONSTRAINT "scrape_tasks_pkey" PRIMARY KEY ("id")
+);
+
+-- One task per page per day; seeding from several replicas is idempotent
+CREATE UNIQUE INDEX "scrape_tasks_runDate_platform_page_key" ON "scrape_tasks" ("runDate", "platform", "page");
+
+-- Claiming pending work and finding expired leases
+CREATE INDEX "scrape_tasks_runDate_status_leaseExpiresAt_idx" ON "scrape_tasks" ("runDate", "status", "leaseExpiresAt");
@@ -0,0 +1,18 @@
+-- Checkpoints for resumable daily runs (scrapers/run_checkpoint.py)
+
+-- CreateTable
+CREATE TABLE "scrape_runs" (
+    "id" TEXT NOT NULL,
+    "runDate" DATE NOT NULL,
+    "ownerId" TEXT NOT NULL,
+    "status" TEXT NOT NULL DEFAULT 'running',
+    "checkpoint" JSONB NOT NULL DEFAULT '{}',
+    "startedAt" TIMESTAMP(3) NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    "updatedAt" TIMESTAMP(3) NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    "finishedAt" TIMESTAMP(3),
+
+    CONSTRAINT "scrape_runs_pkey" PRIMARY KEY ("id")
+);
+
+-- Finding a host's unfinished run on startup
+CREATE INDEX "scrape_runs_ownerId_status_runDate_idx" ON "scrape_runs" ("ownerId", "status", "runDate");
@@ -0,0 +1,23 @@
+-- Per-platform results of every scraper run, for trend and regression reports (scrapers/run_history.py)
+
+-- CreateTable
+CREATE TABLE "scraper_run_history" (
+    "id" TEXT NOT NULL,
+    "runId" TEXT,
+    "platform" TEXT NOT NULL,
+    "hostname" TEXT,
+    "success" BOOLEAN NOT NULL,
+    "errorKind" TEXT,
+    "attempts" INTEGER NOT NULL DEFAULT 0,
+    "itemsScraped" INTEGER NOT NULL DEFAULT 0,
+    "durationSeconds" DOUBLE PRECISION NOT NULL DEFAULT 0,
+    "recordedAt" TIMESTAMP(3) NOT NULL DEFAULT CURRENT_TIMESTAMP,
+
+    CONSTRAINT "scraper_run_history_pkey" PRIMARY KEY ("id")
+);
+
+-- Time-window reports per platform
+CREATE INDEX "scraper_run_history_platform_recordedAt_idx" ON "scraper_run_history" ("platform", "recordedAt");
+
+-- Backfills from logs/run_history.jsonl are idempotent
+CREATE UNIQUE INDEX "scraper_run_history_runId_platform_recordedAt_key" ON "scraper_run_history" ("runId", "platform", "recordedAt");
@@ -0,0 +1,4 @@
+-- Items seen per crawl, so crawl intervals can be learned from the share that was new (scrapers/crawl_frequency.py)
+
+-- AlterTable
+ALTER TABLE "scraper_run_history" ADD COLUMN "itemsParsed" INTEGER NOT NULL DEFAULT 0;
@@ -0,0 +1,20 @@
+-- Append-only engagement history for velocity scoring (scrapers/engagement_history.py).
+-- One row per item per hour ('h'), rolled up to one per day ('d') after a week.
+
+-- CreateTable
+CREATE TABLE "engagement_snapshots" (
+    "inspirationId" TEXT NOT NULL,
+    "resolution" CHAR(1) NOT NULL,
+    "bucketAt" TIMESTAMP(3) NOT NULL,
+    "likes" INTEGER NOT NULL DEFAULT 0,
+    "views" INTEGER NOT NULL DEFAULT 0,
+    "comments" INTEGER NOT NULL DEFAULT 0,
+
+    CONSTRAINT "engagement_snapshots_pkey" PRIMARY KEY ("inspirationId", "resolution", "bucketAt")
+);
+
+-- Downsampling and retention scan by bucket time
+CREATE INDEX "engagement_snapshots_resolution_bucketAt_idx" ON "engagement_snapshots" ("resolution", "bucketAt");
+
+-- AddForeignKey
+ALTER TABLE "engagement_snapshots" ADD CONSTRAINT "engagement_snapshots_inspirationId_fkey" FOREIGN KEY ("inspirationId") REFERENCES "inspirations"("id") ON DELETE CASCADE ON UPDATE CASCADE;
@@ -0,0 +1,5 @@
+-- Digest of the scraped content, so re-crawls only rewrite rows that changed (scrapers/database.py).
+-- Existing rows start NULL and are rewritten once, the next time they are seen.
+
+-- AlterTable
+ALTER TABLE "inspirations" ADD COLUMN "contentHash" VARCHAR(32);
@@ -0,0 +1,18 @@
+-- Unweighted score components per item, so weight changes are one UPDATE (scrapers/score_features.py).
+-- Recency is derived from inspirations."publishedAt" when weights are applied.
+
+-- CreateTable
+CREATE TABLE "score_features" (
+    "inspirationId" TEXT NOT NULL,
+    "engagement" REAL NOT NULL,
+    "trending" REAL,
+    "imageQuality" REAL NOT NULL,
+    "tagRelevance" REAL NOT NULL,
+    "platformScore" REAL NOT NULL,
+    "computedAt" TIMESTAMP(3) NOT NULL DEFAULT CURRENT_TIMESTAMP,
+
+    CONSTRAINT "score_features_pkey" PRIMARY KEY ("inspirationId")
+);
+
+-- AddForeignKey
+ALTER TABLE "score_features" ADD CONSTRAINT "score_features_inspirationId_fkey" FOREIGN KEY ("inspirationId") REFERENCES "inspirations"("id") ON DELETE CASCADE ON UPDATE CASCADE;
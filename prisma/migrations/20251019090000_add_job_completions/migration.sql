@@ -0,0 +1,11 @@
+-- Once-per-day jobs finished by the elected leader (scrapers/coordination.py)
+
+-- CreateTable
+CREATE TABLE "job_completions" (
+    "kind" VARCHAR(50) NOT NULL,
+    "day" DATE NOT NULL,
+    "completedAt" TIMESTAMP(3) NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    "holder" TEXT,
+
+    CONSTRAINT "job_completions_pkey" PRIMARY KEY ("kind", "day")
+);
@@ -0,0 +1,4 @@
+-- Retryable failures wait out a backoff before they can be claimed again (scrapers/task_queue.py)
+
+-- AlterTable
+ALTER TABLE "scrape_tasks" ADD COLUMN "availableAt" TIMESTAMP(3);
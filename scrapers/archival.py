@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+Retention job that archives stale inspirations to keep the curation
+working set (archived = false) small.
+"""
+import argparse
+import json
+import logging
+import os
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from curation_candidates import drop_archived
+from database import get_db_connection
+
+logger = logging.getLogger(__name__)
+
+@dataclass
+class RetentionPolicy:
+    """Which active inspirations become eligible for archival"""
+    # Archive anything published more than this many days ago
+    max_age_days: int = 90
+    # Per-platform overrides for max_age_days, e.g. {'Medium': 30}
+    platform_max_age_days: Dict[str, int] = field(default_factory=dict)
+    # Archive items scoring below this percentile of the hot set (0 disables)
+    score_percentile: float = 0.25
+    # ...but only once they are at least this old
+    score_min_age_days: int = 14
+    # Never archive picks from curations in the last N days
+    protect_recent_curations_days: int = 14
+    # Rows per transaction
+    chunk_size: int = 500
+    # Pause between chunks so web traffic gets the table
+    chunk_pause: float = 0.05
+
+@dataclass
+class ArchivalResult:
+    rows_archived: int = 0
+    chunks: int = 0
+    hot_set_size: int = 0
+    score_threshold: Optional[float] = None
+    duration: float = 0.0
+
+def parse_platform_max_age(value: str) -> Dict[str, int]:
+    """Parse 'Medium=30,Core77=60' into {'Medium': 30, 'Core77': 60}"""
+    overrides = {}
+    for pair in filter(None, (p.strip() for p in value.split(','))):
+        platform, _, days = pair.partition('=')
+        try:
+            overrides[platform.strip()] = int(days)
+        except ValueError:
+            logger.warning(f"Ignoring invalid platform retention override: {pair}")
+    return overrides
+
+def load_retention_policy() -> RetentionPolicy:
+    """Build a retention policy from environment variables"""
+    return RetentionPolicy(
+        max_age_days=int(os.environ.get('ARCHIVE_MAX_AGE_DAYS', '90')),
+        platform_max_age_days=parse_platform_max_age(os.environ.get('ARCHIVE_PLATFORM_MAX_AGE_DAYS', '')),
+        score_percentile=float(os.environ.get('ARCHIVE_SCORE_PERCENTILE', '0.25')),
+        score_min_age_days=int(os.environ.get('ARCHIVE_SCORE_MIN_AGE_DAYS', '14')),
+        chunk_size=int(os.environ.get('ARCHIVE_CHUNK_SIZE', '500')),
+    )
+
+class ArchivalJob:
+    """Archives inspirations in small keyset-ordered chunks with short transactions"""
+
+    def __init__(self, policy: Optional[RetentionPolicy] = None):
+        self.policy = policy or RetentionPolicy()
+
+    def _score_threshold(self, cursor) -> Optional[float]:
+        """Score below which old items are archived, computed over the hot set"""
+        if self.policy.score_percentile <= 0:
+            return None
+        cursor.execute("""
+            SELECT percentile_cont(%s) WITHIN GROUP (ORDER BY score)
+            FROM inspirations
+            WHERE archived = false
+        """, (self.policy.score_percentile,))
+        row = cursor.fetchone()
+        return row[0] if row else None
+
+    def _protected_ids(self, cursor) -> List[str]:
+        """Inspirations featured in recent curations"""
+        cursor.execute("""
+            SELECT "awardPickId" AS id FROM daily_curations
+            WHERE date >= CURRENT_DATE - %s AND "awardPickId" IS NOT NULL
+            UNION
+            SELECT unnest("top10Ids") FROM daily_curations
+            WHERE date >= CURRENT_DATE - %s
+        """, (self.policy.protect_recent_curations_days, self.policy.protect_recent_curations_days))
+        return [row[0] for row in cursor.fetchall()]
+
+    def _eligibility_clause(self, score_threshold: Optional[float]) -> Tuple[str, list]:
+        """SQL predicate (and params) selecting rows the policy would archive"""
+        params: list = []
+        max_age = "%s"
+        if self.policy.platform_max_age_days:
+            cases = []
+            for platform, days in self.policy.platform_max_age_days.items():
+                cases.append("WHEN %s THEN %s")
+                params.extend([platform, days])
+            max_age = f"CASE platform {' '.join(cases)} ELSE %s END"
+        params.append(self.policy.max_age_days)
+
+        clause = f'"publishedAt" < NOW() - make_interval(days => {max_age})'
+
+        if score_threshold is not None:
+            clause = (
+                f'({clause} OR (score < %s AND '
+                f'"publishedAt" < NOW() - make_interval(days => %s)))'
+            )
+            params.extend([score_threshold, self.policy.score_min_age_days])
+
+        return clause, params
+
+    def run(self) -> ArchivalResult:
+        """Archive every eligible row, one chunk per transaction"""
+        result = ArchivalResult()
+        start_time = time.time()
+
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        try:
+            result.score_threshold = self._score_threshold(cursor)
+            protected_ids = self._protected_ids(cursor)
+            conn.commit()
+
+            clause, clause_params = self._eligibility_clause(result.score_threshold)
+            last_id = ''
+
+            while True:
+                # Keyset scan for the next chunk of candidates; only an empty scan ends the run,
+                # since rows locked by other writers are skipped below and can shorten a chunk
+                cursor.execute(f"""
+                    SELECT id FROM inspirations
+                    WHERE archived = false
+                      AND id > %s
+                      AND {clause}
+                      AND NOT (id = ANY(%s))
+                    ORDER BY id
+                    LIMIT %s
+                """, [last_id, *clause_params, protected_ids, self.policy.chunk_size])
+                candidate_ids = [row[0] for row in cursor.fetchall()]
+                if not candidate_ids:
+                    conn.commit()
+                    break
+                last_id = candidate_ids[-1]
+
+                cursor.execute("""
+                    WITH batch AS (
+                        SELECT id FROM inspirations
+                        WHERE id = ANY(%s) AND archived = false
+                        FOR UPDATE SKIP LOCKED
+                    )
+                    UPDATE inspirations i
+                    SET archived = true, "updatedAt" = CURRENT_TIMESTAMP
+                    FROM batch
+                    WHERE i.id = batch.id
+                    RETURNING i.id
+                """, (candidate_ids,))
+
+                archived_ids = [row[0] for row in cursor.fetchall()]
+                conn.commit()
+
+                result.rows_archived += len(archived_ids)
+                result.chunks += 1
+
+                if result.chunks % 20 == 0:
+                    logger.info(f"Archived {result.rows_archived} inspirations so far")
+
+                if len(candidate_ids) < self.policy.chunk_size:
+                    break
+                time.sleep(self.policy.chunk_pause)
+
+            refreshed = drop_archived(cursor)
+            if refreshed:
+                logger.info(f"Refreshed curation candidates for: {', '.join(sorted(refreshed))}")
+
+            cursor.execute("SELECT COUNT(*) FROM inspirations WHERE archived = false")
+            result.hot_set_size = cursor.fetchone()[0]
+            conn.commit()
+
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            cursor.close()
+            conn.close()
+
+        result.duration = time.time() - start_time
+        logger.info(
+            f"Archival completed: {result.rows_archived} archived in {result.chunks} chunks, "
+            f"hot set now {result.hot_set_size} rows ({result.duration:.2f}s)"
+        )
+        return result
+
+def archive_stale_content(policy: Optional[RetentionPolicy] = None) -> ArchivalResult:
+    """Run the archival job with the given (or environment) policy"""
+    return ArchivalJob(policy or load_retention_policy()).run()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Archive stale inspirations')
+    parser.add_argument('--max-age-days', type=int, help='Override ARCHIVE_MAX_AGE_DAYS')
+    parser.add_argument('--score-percentile', type=float, help='Override ARCHIVE_SCORE_PERCENTILE')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+    from dotenv import load_dotenv
+    load_dotenv()
+
+    policy = load_retention_policy()
+    if args.max_age_days is not None:
+        policy.max_age_days = args.max_age_days
+    if args.score_percentile is not None:
+        policy.score_percentile = args.score_percentile
+
+    result = archive_stale_content(policy)
+    print(json.dumps(result.__dict__, indent=2))
@@ -1,63 +1,66 @@
-import requests
-import time
+import http_client
 import logging
 import os
-from datetime import datetime, timedelta
-from database import save_inspiration
-from scoring import calculate_score
+from datetime import datetime
+from inspiration import Inspiration
+from pipeline import PlatformSource, run_source
 
 logger = logging.getLogger(__name__)
 
-def scrape_behance():
+PER_PAGE = 50
+PAGES = 1
+
+def fetch_behance_page(page):
+    """Fetch one page of today's most appreciated Behance projects"""
+    api_key = os.environ.get('BEHANCE_API_KEY')
+    url = f"https://api.behance.net/v2/projects?api_key={api_key}&sort=appreciations&time=today&per_page={PER_PAGE}&page={page}"
+    
+    response = http_client.get(url)
+    response.raise_for_status()
+    return response.json()
+
+def behance_record(project):
+    """Normalize one Behance API project"""
+    owner = project.get('owners', [{}])[0]
+    stats = project.get('stats', {})
+    return Inspiration(
+        title=project.get('name', 'Untitled'),
+        description=project.get('description', ''),
+        content_url=project.get('url', ''),
+        thumbnail_url=project.get('covers', {}).get('original', ''),
+        platform='Behance',
+        author_name=owner.get('display_name', ''),
+        author_url=owner.get('url', ''),
+        tags=[field.get('name') for field in project.get('fields', [])],
+        published_at=datetime.fromtimestamp(project['published_on']) if project.get('published_on') else datetime.now(),
+        likes=stats.get('appreciations', 0),
+        views=stats.get('views', 0),
+        comments=stats.get('comments', 0),
+        source_id=project.get('id'),
+    )
+
+def parse_behance_page(data):
+    """Turn a Behance API response into inspiration records"""
+    items = []
+    
+    for project in data.get('projects', []):
+        try:
+            items.append(behance_record(project))
+            
+        except Exception as e:
+            logger.error(f"Error processing Behance project: {e}")
+    
+    return items
+
+BEHANCE_SOURCE = PlatformSource('Behance', fetch_behance_page, parse_behance_page, pages=PAGES)
+
+def scrape_behance(**pipeline_options):
     """Scrape trending projects from Behance"""
-    try:
-        # Use Behance API (requires API key)
-        api_key = os.environ.get('BEHANCE_API_KEY')
-        if not api_key:
-            logger.warning("Behance API key not found, skipping...")
-            return
-        
-        url = f"https://api.behance.net/v2/projects?api_key={api_key}&sort=appreciations&time=today&per_page=50"
-        
-        response = requests.get(url)
-        response.raise_for_status()
-        
-        data = response.json()
-        projects = data.get('projects', [])
-        
-        for project in projects:
-            try:
-                # Extract project data
-                inspiration_data = {
-                    'title': project.get('name', 'Untitled'),
-                    'description': project.get('description', ''),
-                    'contentUrl': project.get('url', ''),
-                    'thumbnailUrl': project.get('covers', {}).get('original', ''),
-                    'platform': 'Behance',
-                    'authorName': project.get('owners', [{}])[0].get('display_name', ''),
-                    'authorUrl': project.get('owners', [{}])[0].get('url', ''),
-                    'tags': [field.get('name') for field in project.get('fields', [])],
-                    'publishedAt': datetime.fromtimestamp(project.get('published_on', 0)) if project.get('published_on') else datetime.now(),
-                    'sourceMeta': {
-                        'likes': project.get('stats', {}).get('appreciations', 0),
-                        'views': project.get('stats', {}).get('views', 0),
-                        'comments': project.get('stats', {}).get('comments', 0),
-                    }
-                }
-                
-                # Calculate score
-                inspiration_data['score'] = calculate_score(inspiration_data)
-                
-                # Save to database
-                save_inspiration(inspiration_data)
-                
-                # Rate limiting
-                time.sleep(0.5)
-                
-            except Exception as e:
-                logger.error(f"Error processing Behance project: {e}")
-        
-        logger.info(f"Scraped {len(projects)} projects from Behance")
-        
-    except Exception as e:
-        logger.error(f"Behance scraping failed: {e}")
\ No newline at end of file
+    # Use Behance API (requires API key)
+    if not os.environ.get('BEHANCE_API_KEY'):
+        logger.warning("Behance API key not found, skipping...")
+        return None
+    
+    result = run_source(BEHANCE_SOURCE, **pipeline_options)
+    logger.info(f"Scraped {result.items_parsed} projects from Behance")
+    return result
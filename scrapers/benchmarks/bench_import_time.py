@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Import-time budget for run_scrapers.py cold start.
+
+Runs each CLI mode's imports in a fresh interpreter under
+`python -X importtime`, reports the cost and the heaviest modules, and
+exits non-zero if the bare CLI pulls in heavy dependencies or exceeds
+its budget. The budget is relative to a stdlib reference import measured
+alongside it (best of --repeat runs each), so a slow or busy machine
+scales both instead of failing at random.
+
+Usage: python benchmarks/bench_import_time.py [--budget-ratio 1.5] [--budget-ms N] [--repeat 7]
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+SCRAPERS_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+MODES = {
+    'cli (--help)': "import run_scrapers",
+    '--curation-only': "import run_scrapers, curation_optimized",
+    '--platform medium': "import run_scrapers, registry; registry.load_scraper('medium')",
+    '--platform behance': "import run_scrapers, registry; registry.load_scraper('behance')",
+    'all scrapers': (
+        "import run_scrapers, registry, curation_optimized\n"
+        "for key in registry.platform_keys(): registry.load_scraper(key)"
+    ),
+}
+
+# Stdlib modules of about the CLI's size; the budget is a multiple of their cost
+REFERENCE = "import argparse, json, logging, dataclasses, typing, datetime, threading, subprocess"
+
+# Must never be imported just to parse arguments
+HEAVY_MODULES = {'requests', 'bs4', 'psycopg2', 'dotenv', 'numpy', 'schedule'}
+
+def measure(code: str, baseline=frozenset()):
+    """
+    Return (total_ms, {top-level module: cumulative_ms}, module names) for
+    the imports `code` adds on top of interpreter startup (`baseline`).
+    """
+    proc = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', code],
+        cwd=SCRAPERS_DIR, capture_output=True, text=True
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1])
+
+    top_level = {}
+    modules = set()
+    for line in proc.stderr.splitlines():
+        if not line.startswith('import time:') or 'imported package' in line:
+            continue
+        _self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        stripped = name.strip()
+        if stripped in baseline:
+            continue
+        modules.add(stripped.split('.')[0])
+        if len(name) - len(name.lstrip()) == 1:  # Depth 0 entries carry a single leading space
+            top_level[stripped] = int(cumulative_us) / 1000
+    return sum(top_level.values()), top_level, modules
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure run_scrapers.py import cost per mode')
+    parser.add_argument('--budget-ratio', type=float, default=1.5,
+                        help='Budget for the bare CLI imports as a multiple of the reference imports')
+    parser.add_argument('--budget-ms', type=float,
+                        help='Absolute budget in ms instead of --budget-ratio')
+    parser.add_argument('--repeat', type=int, default=7)
+    args = parser.parse_args()
+
+    _, startup, _ = measure("pass")
+    baseline = frozenset(startup)
+
+    failures = []
+    for mode, code in MODES.items():
+        runs, reference_ms = [], []
+        for _ in range(args.repeat):  # Interleaved, so load spikes hit both
+            runs.append(measure(code, baseline))
+            if mode.startswith('cli'):
+                reference_ms.append(measure(REFERENCE, baseline)[0])
+        total, top_level, modules = min(runs, key=lambda run: run[0])
+        heaviest = sorted(top_level.items(), key=lambda kv: kv[1], reverse=True)[:4]
+        heavy_loaded = sorted(HEAVY_MODULES & modules)
+
+        print(f"{mode:20s} {total:8.1f} ms  heavy={heavy_loaded or '-'}")
+        print("    " + ", ".join(f"{name} {ms:.1f}ms" for name, ms in heaviest))
+
+        if mode.startswith('cli'):
+            budget = args.budget_ms or args.budget_ratio * min(reference_ms)
+            print(f"    budget {budget:.1f} ms (reference imports {min(reference_ms):.1f} ms)")
+            if heavy_loaded:
+                failures.append(f"CLI imports heavy modules: {heavy_loaded}")
+            if total > budget:
+                failures.append(f"CLI imports took {total:.1f} ms (budget {budget:.1f} ms)")
+
+    if failures:
+        for failure in failures:
+            print(f"FAIL: {failure}")
+        sys.exit(1)
+    print("OK: CLI cold start within budget")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Benchmark MMR selection of the daily top 11 from a synthetic candidate pool.
+
+Usage: python benchmarks/bench_mmr.py [--pool 5000] [--runs 200]
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from diversity import TagVocabulary, mmr_select, popcounts  # noqa: E402
+
+TAGS = [
+    'UI Design', 'UX Design', 'Web Design', 'Mobile Design', 'Branding', 'Typography',
+    'Illustration', 'Product Design', 'Graphic Design', 'Logo', 'Interface', 'Motion',
+    '3D', 'Packaging', 'Industrial Design', 'Dashboard', 'Landing Page', 'Icons',
+]
+PLATFORMS = ['Behance', 'Dribbble', 'Awwwards', 'Core77', 'Medium']
+
+def synthetic_pool(size: int, seed: int = 42):
+    rng = random.Random(seed)
+    weights = [1 / (rank + 1) for rank in range(len(TAGS))]  # Zipf-like tag popularity
+    pool = []
+    for _ in range(size):
+        tags = set(rng.choices(TAGS, weights=weights, k=rng.randint(2, 5)))
+        pool.append((rng.uniform(60, 100), rng.choice(PLATFORMS), sorted(tags)))
+    return pool
+
+def naive_mmr(relevance, tag_sets, k, lam=0.7):
+    """Reference implementation: full rescan with Python set Jaccard"""
+    picked = []
+    remaining = set(range(len(relevance)))
+    while remaining and len(picked) < k:
+        def mmr(i):
+            sim = max(
+                (len(tag_sets[i] & tag_sets[j]) / len(tag_sets[i] | tag_sets[j]) for j in picked),
+                default=0.0
+            )
+            return lam * relevance[i] - (1 - lam) * sim
+        best = max(remaining, key=mmr)
+        picked.append(best)
+        remaining.discard(best)
+    return picked
+
+def timed(fn, runs):
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return statistics.median(samples), samples[int(len(samples) * 0.95) - 1]
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark MMR diversity selection')
+    parser.add_argument('--pool', type=int, default=5000)
+    parser.add_argument('--runs', type=int, default=200)
+    parser.add_argument('--k', type=int, default=11)
+    args = parser.parse_args()
+
+    pool = synthetic_pool(args.pool)
+    vocabulary = TagVocabulary()
+
+    start = time.perf_counter()
+    relevance = [score / 100 for score, _, _ in pool]
+    tag_lists = [tags for _, _, tags in pool]
+    platforms = [platform for _, platform, _ in pool]
+    bitsets = vocabulary.fit(tag_lists, platforms).encode_all(tag_lists, platforms)
+    counts = popcounts(bitsets)
+    precompute_ms = (time.perf_counter() - start) * 1000
+
+    tag_sets = [{t.lower() for t in tags} | {f"platform:{platform.lower()}"} for _, platform, tags in pool]
+
+    p50, p95 = timed(lambda: mmr_select(relevance, bitsets, args.k, counts=counts), args.runs)
+    naive_runs = max(3, args.runs // 50)
+    naive_p50, _ = timed(lambda: naive_mmr(relevance, tag_sets, args.k), naive_runs)
+
+    assert mmr_select(relevance, bitsets, args.k, counts=counts) == naive_mmr(relevance, tag_sets, args.k)
+
+    print(f"pool={args.pool} k={args.k} vocabulary={len(vocabulary)} tags")
+    print(f"bitset precompute:      {precompute_ms:8.3f} ms (once per candidate pool)")
+    print(f"mmr_select (bitset):    {p50:8.3f} ms p50, {p95:.3f} ms p95")
+    print(f"naive MMR (set rescan): {naive_p50:8.3f} ms p50")
+
+if __name__ == "__main__":
+    main()
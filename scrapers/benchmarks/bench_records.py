@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Benchmark Inspiration records against scraper-shaped dicts on a synthetic corpus.
+
+Both corpora share the same field values (strings, tag lists, datetimes),
+so the memory figures are the per-item container cost: a dict with a
+nested sourceMeta dict versus one slotted record.
+
+Usage: python benchmarks/bench_records.py [--items 1000000] [--score-items 100000]
+"""
+import argparse
+import gc
+import os
+import random
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from inspiration import Inspiration  # noqa: E402
+from scoring_optimized import OptimizedScoring  # noqa: E402
+
+TAGS = [['UI Design', 'Branding'], ['Web Design'], ['Illustration', 'Typography', 'Logo'], ['Product Design']]
+PLATFORMS = ['Behance', 'Dribbble', 'Awwwards', 'Core77', 'Medium']
+
+def synthetic_values(count: int, seed: int = 42):
+    rng = random.Random(seed)
+    now = datetime.now()
+    return [(
+        f"Project {i}", f"https://example.test/{i}", rng.choice(PLATFORMS), f"Author {i % 5000}",
+        rng.choice(TAGS), now - timedelta(hours=i % 5000),
+        rng.randint(0, 5000), rng.randint(0, 100000), rng.randint(0, 300), i,
+    ) for i in range(count)]
+
+def build_dicts(values):
+    return [{
+        'title': title, 'description': '', 'contentUrl': url, 'thumbnailUrl': '', 'platform': platform,
+        'authorName': author, 'authorUrl': '', 'tags': tags, 'publishedAt': published,
+        'sourceMeta': {'id': source_id, 'likes': likes, 'views': views, 'comments': comments},
+    } for title, url, platform, author, tags, published, likes, views, comments, source_id in values]
+
+def build_records(values):
+    return [Inspiration(
+        title=title, description='', content_url=url, thumbnail_url='', platform=platform,
+        author_name=author, author_url='', tags=tags, published_at=published,
+        likes=likes, views=views, comments=comments, source_id=source_id,
+    ) for title, url, platform, author, tags, published, likes, views, comments, source_id in values]
+
+def measured(build, values):
+    """(items, bytes allocated, seconds) for building the containers"""
+    gc.collect()
+    tracemalloc.start()
+    started = time.perf_counter()
+    items = build(values)
+    seconds = time.perf_counter() - started
+    allocated, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return items, allocated, seconds
+
+def read_dicts(items):
+    """The lookups scoring makes, as it did on dicts"""
+    total = 0
+    for item in items:
+        meta = item.get('sourceMeta', {})
+        total += meta.get('likes', 0) + meta.get('views', 0) + meta.get('comments', 0) + meta.get('saves', 0)
+        total += len(item.get('tags', [])) + len(item.get('platform', '')) + bool(item.get('thumbnailUrl'))
+        total += item.get('publishedAt') is not None
+    return total
+
+def read_records(items):
+    total = 0
+    for item in items:
+        total += item.likes + item.views + item.comments + item.saves
+        total += len(item.tags) + len(item.platform) + bool(item.thumbnail_url)
+        total += item.published_at is not None
+    return total
+
+def timed(fn, *args):
+    started = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - started
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark Inspiration records vs dicts')
+    parser.add_argument('--items', type=int, default=1_000_000)
+    parser.add_argument('--score-items', type=int, default=100_000, help='Items scored end to end')
+    args = parser.parse_args()
+
+    values = synthetic_values(args.items)
+    dicts, dict_bytes, dict_build = measured(build_dicts, values)
+    records, record_bytes, record_build = measured(build_records, values)
+
+    dict_total, dict_read = timed(read_dicts, dicts)
+    record_total, record_read = timed(read_records, records)
+    assert dict_total == record_total
+
+    scorer = OptimizedScoring()
+    sample = min(args.score_items, args.items)
+    dict_scores, dict_score = timed(lambda: [scorer.calculate_score_optimized(d) for d in dicts[:sample]])
+    record_scores, record_score = timed(lambda: [scorer.calculate_score_optimized(r) for r in records[:sample]])
+    assert dict_scores == record_scores
+
+    n = args.items
+    print(f"items={n} scored={sample}")
+    print(f"{'':24}{'dict':>12}{'record':>12}")
+    print(f"{'bytes per item':24}{dict_bytes / n:12.0f}{record_bytes / n:12.0f}")
+    print(f"{'build (us/item)':24}{dict_build / n * 1e6:12.3f}{record_build / n * 1e6:12.3f}")
+    print(f"{'field reads (ns/item)':24}{dict_read / n * 1e9:12.0f}{record_read / n * 1e9:12.0f}")
+    print(f"{'scoring (us/item)':24}{dict_score / sample * 1e6:12.3f}{record_score / sample * 1e6:12.3f}")
+
+if __name__ == "__main__":
+    main()
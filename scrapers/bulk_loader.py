@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+"""
+Bulk loader for large imports and backfills.
+
+Streams NDJSON/CSV records through COPY into a temporary staging table and
+merges them into inspirations with a single INSERT ... ON CONFLICT statement.
+Inserted rows get the same contentHash, score_features row and first
+engagement snapshot as rows saved by the scrapers, in the same transaction.
+"""
+import argparse
+import csv
+import io
+import json
+import logging
+import sys
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional, TextIO
+
+from curation_candidates import refresh_platforms
+from database import content_hash, get_db_connection
+from engagement_history import hour_bucket
+from inspiration import Inspiration
+from scoring_optimized import OptimizedScoring
+
+logger = logging.getLogger(__name__)
+
+STAGING_COLUMNS = [
+    'title', 'description', '"thumbnailUrl"', '"contentUrl"', 'platform',
+    '"authorName"', '"authorUrl"', 'tags', 'score', '"publishedAt"', '"sourceMeta"', '"contentHash"'
+]
+# Staged alongside each row for its score_features and engagement_snapshots rows
+FEATURE_COLUMNS = ['engagement', 'trending', '"imageQuality"', '"tagRelevance"', '"platformScore"']
+SNAPSHOT_COLUMNS = ['likes', 'views', 'comments']
+
+@dataclass
+class BulkLoadResult:
+    rows_read: int = 0
+    rows_skipped: int = 0
+    rows_staged: int = 0
+    rows_inserted: int = 0
+    duration: float = 0.0
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows_staged / self.duration if self.duration > 0 else 0.0
+
+def read_ndjson(stream: TextIO) -> Iterator[Dict[str, Any]]:
+    """Yield one record per non-empty line"""
+    for line_no, line in enumerate(stream, 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield json.loads(line)
+        except json.JSONDecodeError as e:
+            logger.warning(f"Skipping malformed NDJSON line {line_no}: {e}")
+
+def read_csv(stream: TextIO) -> Iterator[Dict[str, Any]]:
+    """Yield records from a CSV file with a header row.
+
+    `tags` is a `|`-separated list and `sourceMeta` is a JSON object.
+    """
+    for row in csv.DictReader(stream):
+        record: Dict[str, Any] = {k: v for k, v in row.items() if v not in (None, '')}
+        if 'tags' in record:
+            record['tags'] = [t.strip() for t in record['tags'].split('|') if t.strip()]
+        if 'sourceMeta' in record:
+            try:
+                record['sourceMeta'] = json.loads(record['sourceMeta'])
+            except json.JSONDecodeError:
+                record['sourceMeta'] = {}
+        yield record
+
+def normalize_record(record: Dict[str, Any]) -> Optional[Inspiration]:
+    """Coerce a raw record into an Inspiration like the scrapers produce"""
+    if not record.get('contentUrl') or not record.get('platform'):
+        return None
+
+    published_at = record.get('publishedAt')
+    if isinstance(published_at, str):
+        try:
+            published_at = datetime.fromisoformat(published_at.replace('Z', '+00:00'))
+        except ValueError:
+            published_at = None
+
+    # from_dict coerces the engagement counts to ints
+    item = Inspiration.from_dict(record)
+    item.title = (item.title or 'Untitled')[:500]
+    item.thumbnail_url = item.thumbnail_url or ''
+    tags = item.tags
+    item.tags = [str(t) for t in tags] if isinstance(tags, (list, tuple)) else [str(tags)]
+    item.published_at = published_at or datetime.now()
+    return item
+
+def _pg_array(values: List[str]) -> str:
+    """Render a text[] literal for COPY"""
+    escaped = [v.replace('\\', '\\\\').replace('"', '\\"') for v in values]
+    return '{' + ','.join(f'"{v}"' for v in escaped) + '}'
+
+def _to_copy_buffer(items: List[Inspiration], components: List[Dict[str, Optional[float]]]) -> io.StringIO:
+    """Serialize a scored chunk and its score components as CSV for COPY ... FROM STDIN"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for item, c in zip(items, components):
+        writer.writerow([
+            item.title,
+            item.description,
+            item.thumbnail_url,
+            item.content_url,
+            item.platform,
+            item.author_name,
+            item.author_url,
+            _pg_array(item.tags),
+            item.score,
+            item.published_at.isoformat(),
+            json.dumps(item.source_meta),
+            content_hash(item),
+            c['engagement'],
+            c['trending'],
+            c['image_quality'],
+            c['tag_relevance'],
+            c['platform'],
+            item.likes,
+            item.views,
+            item.comments,
+        ])
+    buffer.seek(0)
+    return buffer
+
+def _chunks(records: Iterable[Dict[str, Any]], size: int) -> Iterator[List[Dict[str, Any]]]:
+    chunk = []
+    for record in records:
+        chunk.append(record)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+def bulk_load(records: Iterable[Dict[str, Any]], chunk_size: int = 5000) -> BulkLoadResult:
+    """
+    Score records in batches, COPY them into a staging table and merge
+    into inspirations in one statement, with score features and a first
+    engagement snapshot for each inserted row. Existing contentUrls are skipped.
+    """
+    result = BulkLoadResult()
+    scorer = OptimizedScoring()
+    start_time = time.time()
+
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    try:
+        cursor.execute("""
+            CREATE TEMP TABLE inspirations_staging (
+                title TEXT NOT NULL,
+                description TEXT,
+                "thumbnailUrl" TEXT,
+                "contentUrl" TEXT NOT NULL,
+                platform TEXT NOT NULL,
+                "authorName" TEXT,
+                "authorUrl" TEXT,
+                tags TEXT[],
+                score DOUBLE PRECISION NOT NULL,
+                "publishedAt" TIMESTAMP(3) NOT NULL,
+                "sourceMeta" JSONB,
+                "contentHash" TEXT,
+                engagement REAL,
+                trending REAL,
+                "imageQuality" REAL,
+                "tagRelevance" REAL,
+                "platformScore" REAL,
+                likes INTEGER,
+                views INTEGER,
+                comments INTEGER
+            ) ON COMMIT DROP
+        """)
+
+        copy_sql = (
+            f"COPY inspirations_staging ({', '.join(STAGING_COLUMNS + FEATURE_COLUMNS + SNAPSHOT_COLUMNS)}) "
+            "FROM STDIN WITH (FORMAT csv)"
+        )
+
+        for raw_chunk in _chunks(records, chunk_size):
+            result.rows_read += len(raw_chunk)
+            items = [item for item in map(normalize_record, raw_chunk) if item]
+            result.rows_skipped += len(raw_chunk) - len(items)
+            if not items:
+                continue
+
+            # Scored as the scrapers' save path does: stored components, ScoreWeights
+            components = [scorer.score_components(item) for item in items]
+            for item, c in zip(items, components):
+                item.score = scorer.weights.combine(c)
+            cursor.copy_expert(copy_sql, _to_copy_buffer(items, components))
+            result.rows_staged += len(items)
+
+            elapsed = time.time() - start_time
+            logger.info(
+                f"Staged {result.rows_staged} rows "
+                f"({result.rows_staged / elapsed if elapsed else 0:.0f} rows/sec)"
+            )
+
+        cursor.execute(f"""
+            WITH chosen AS (
+                SELECT DISTINCT ON ("contentUrl") *
+                FROM inspirations_staging
+                ORDER BY "contentUrl", score DESC
+            ),
+            inserted AS (
+                INSERT INTO inspirations (
+                    id, {', '.join(STAGING_COLUMNS)}, "scrapedAt", "createdAt", "updatedAt"
+                )
+                SELECT gen_random_uuid()::text, {', '.join(STAGING_COLUMNS)},
+                       CURRENT_TIMESTAMP, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP
+                FROM chosen
+                ON CONFLICT ("contentUrl") DO NOTHING
+                RETURNING id, "contentUrl"
+            ),
+            features AS (
+                INSERT INTO score_features (
+                    "inspirationId", {', '.join(FEATURE_COLUMNS)}, "computedAt"
+                )
+                SELECT inserted.id, {', '.join(f'chosen.{c}' for c in FEATURE_COLUMNS)}, CURRENT_TIMESTAMP
+                FROM inserted JOIN chosen USING ("contentUrl")
+            )
+            INSERT INTO engagement_snapshots ("inspirationId", resolution, "bucketAt", likes, views, comments)
+            SELECT inserted.id, 'h', %s, chosen.likes, chosen.views, chosen.comments
+            FROM inserted JOIN chosen USING ("contentUrl")
+        """, (hour_bucket(),))
+        result.rows_inserted = cursor.rowcount
+
+        if result.rows_inserted:
+            cursor.execute("SELECT DISTINCT platform FROM inspirations_staging")
+            refresh_platforms(cursor, [row[0] for row in cursor.fetchall()])
+
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cursor.close()
+        conn.close()
+
+    result.duration = time.time() - start_time
+    logger.info(
+        f"Bulk load completed: {result.rows_inserted} inserted, "
+        f"{result.rows_staged - result.rows_inserted} already existed, "
+        f"{result.rows_skipped} skipped in {result.duration:.2f}s "
+        f"({result.rows_per_second:.0f} rows/sec)"
+    )
+    return result
+
+def main():
+    parser = argparse.ArgumentParser(description='Bulk load inspirations from NDJSON or CSV')
+    parser.add_argument('path', help="Input file, or '-' for stdin")
+    parser.add_argument('--format', choices=['ndjson', 'csv'],
+                        help='Input format (defaults to the file extension)')
+    parser.add_argument('--chunk-size', type=int, default=5000,
+                        help='Records scored and copied per batch')
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+
+    from dotenv import load_dotenv
+    load_dotenv()
+
+    fmt = args.format or ('csv' if args.path.endswith('.csv') else 'ndjson')
+    stream = sys.stdin if args.path == '-' else open(args.path, newline='', encoding='utf-8')
+    reader = read_csv if fmt == 'csv' else read_ndjson
+
+    try:
+        result = bulk_load(reader(stream), chunk_size=args.chunk_size)
+    except Exception as e:
+        logger.error(f"Bulk load failed: {e}")
+        sys.exit(1)
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+
+    print(json.dumps({
+        'rows_read': result.rows_read,
+        'rows_skipped': result.rows_skipped,
+        'rows_staged': result.rows_staged,
+        'rows_inserted': result.rows_inserted,
+        'duration': round(result.duration, 2),
+        'rows_per_second': round(result.rows_per_second, 1),
+    }, indent=2))
+
+if __name__ == "__main__":
+    main()
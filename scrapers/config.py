@@ -27,6 +27,11 @@ class ScrapingConfig:
     log_level: str = "INFO"
     log_retention_days: int = 7
     
+    # Retention / archival
+    enable_archival: bool = True
+    archive_max_age_days: int = 90
+    archive_score_percentile: float = 0.25
+    
     # Environment
     environment: str = "production"
 
@@ -43,6 +48,9 @@ def load_config() -> ScrapingConfig:
         dribbble_access_token=os.getenv('DRIBBBLE_ACCESS_TOKEN'),
         log_level=os.getenv('LOG_LEVEL', 'INFO'),
         log_retention_days=int(os.getenv('LOG_RETENTION_DAYS', '7')),
+        enable_archival=os.getenv('ENABLE_ARCHIVAL', 'true').lower() == 'true',
+        archive_max_age_days=int(os.getenv('ARCHIVE_MAX_AGE_DAYS', '90')),
+        archive_score_percentile=float(os.getenv('ARCHIVE_SCORE_PERCENTILE', '0.25')),
         environment=os.getenv('NODE_ENV', 'production')
     )
 
@@ -59,14 +67,16 @@ def validate_config(config: ScrapingConfig) -> Dict[str, str]:
     if config.retry_delay < 0:
         errors['retry_delay'] = 'RETRY_DELAY must be >= 0'
     
-    # Validate schedule time format (HH:MM)
+    if not 0 <= config.archive_score_percentile < 1:
+        errors['archive_score_percentile'] = 'ARCHIVE_SCORE_PERCENTILE must be in [0, 1)'
+    
+    # Validate schedule format: HH:MM times (24-hour) and/or intervals like 6h
     try:
-        hour, minute = config.schedule_time.split(':')
-        hour, minute = int(hour), int(minute)
-        if not (0 <= hour <= 23 and 0 <= minute <= 59):
-            raise ValueError()
-    except:
-        errors['schedule_time'] = 'SCHEDULE_TIME must be in HH:MM format (24-hour)'
+        from job_scheduler import parse_cadence
+        for spec in config.schedule_time.split(','):
+            parse_cadence(spec)
+    except ValueError:
+        errors['schedule_time'] = 'SCHEDULE_TIME must be comma-separated HH:MM times (24-hour) or intervals like 6h'
     
     return errors
 
@@ -0,0 +1,185 @@
+"""
+Leader election across scraper replicas using Postgres advisory locks.
+
+Jobs that must not run concurrently on several hosts (curation, rescoring)
+take a session-level pg_try_advisory_lock keyed on (job kind, day). The
+replica that gets it runs the job; replicas arriving while it holds the
+lock skip instead of queueing up behind it. The lock alone is mutual
+exclusion: it is released when the job finishes. Jobs that must run once
+per day (curation) also record their completion in job_completions, and
+later elections for that (kind, day) skip. Lock waits and hold times are
+kept for the run history.
+"""
+import functools
+import logging
+import os
+import socket
+import threading
+import time
+import zlib
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import date
+from typing import Any, Deque, Dict, Iterator, List, Optional, Tuple
+
+import psycopg2
+
+logger = logging.getLogger(__name__)
+
+@dataclass
+class Leadership:
+    """Outcome of one leader election"""
+    kind: str
+    day: str
+    acquired: bool = False
+    wait_seconds: float = 0.0
+    hold_seconds: float = 0.0
+    holder: Optional[str] = None  # Who holds the lock when we did not get it
+    already_done: bool = False  # Skipped because a once-per-day job already completed
+    completed: bool = True  # Cleared by the caller when the job failed and may be retried
+
+# Elections since the last drain_leadership_events(), for run history
+_events: Deque[Leadership] = deque(maxlen=100)
+_events_lock = threading.Lock()
+
+def lock_key(kind: str, day: date) -> Tuple[int, int]:
+    """Advisory lock key pair: (stable 32-bit hash of the kind, day ordinal)"""
+    kind_hash = zlib.crc32(kind.encode('utf-8'))
+    if kind_hash >= 2 ** 31:
+        kind_hash -= 2 ** 32  # int4 range
+    return kind_hash, day.toordinal()
+
+def _describe_holder(cursor, key: Tuple[int, int]) -> Optional[str]:
+    cursor.execute("""
+        SELECT a.pid, a.application_name, a.client_addr::text
+        FROM pg_locks l
+        JOIN pg_stat_activity a ON a.pid = l.pid
+        WHERE l.locktype = 'advisory' AND l.granted
+          AND l.classid::bigint = (%s::bigint & 4294967295)
+          AND l.objid::bigint = %s
+          AND l.objsubid = 2
+        LIMIT 1
+    """, key)
+    row = cursor.fetchone()
+    if not row:
+        return None
+    pid, application, client = row
+    return f"pid {pid}" + (f" ({application or client})" if application or client else "")
+
+def _completed(cursor, kind: str, day: date) -> bool:
+    cursor.execute('SELECT 1 FROM job_completions WHERE kind = %s AND day = %s', (kind, day))
+    return cursor.fetchone() is not None
+
+def _record_completion(cursor, kind: str, day: date):
+    cursor.execute("""
+        INSERT INTO job_completions (kind, day, "completedAt", holder)
+        VALUES (%s, %s, CURRENT_TIMESTAMP, %s)
+        ON CONFLICT (kind, day) DO NOTHING
+    """, (kind, day, socket.gethostname()))
+
+@contextmanager
+def leader_lock(kind: str, day: Optional[date] = None, wait_timeout: float = 0.0,
+                once: bool = False) -> Iterator[Leadership]:
+    """
+    Try to become leader for `kind` on `day`. Yields a Leadership whose
+    `acquired` says whether the caller should run the job. With a
+    wait_timeout the lock is retried until it frees up or time runs out.
+
+    Without `once` this is mutual exclusion only: the next election after
+    the block exits can win again the same day. With `once`, a block that
+    exits cleanly (and leaves `completed` set) records (kind, day) as done,
+    and later elections for it are not acquired.
+
+    The lock lives on a dedicated connection (never a pooled one) so it is
+    released when the block exits, or when the process dies.
+    """
+    day = day or date.today()
+    key = lock_key(kind, day)
+    leadership = Leadership(kind=kind, day=day.isoformat())
+
+    started = time.monotonic()
+    conn = psycopg2.connect(os.environ['DATABASE_URL'])
+    conn.autocommit = True
+    cursor = conn.cursor()
+    try:
+        while True:
+            cursor.execute("SELECT pg_try_advisory_lock(%s, %s)", key)
+            leadership.acquired = cursor.fetchone()[0]
+            if leadership.acquired or time.monotonic() - started >= wait_timeout:
+                break
+            time.sleep(min(1.0, wait_timeout))
+        leadership.wait_seconds = time.monotonic() - started
+
+        if not leadership.acquired:
+            leadership.holder = _describe_holder(cursor, key)
+            logger.info(f"Skipping {kind} for {leadership.day}: another replica is leader"
+                        + (f" ({leadership.holder})" if leadership.holder else ""))
+            yield leadership
+            return
+
+        # Checked under the lock, so a leader that just finished is always seen
+        if once and _completed(cursor, kind, day):
+            cursor.execute("SELECT pg_advisory_unlock(%s, %s)", key)
+            leadership.acquired = False
+            leadership.already_done = True
+            logger.info(f"Skipping {kind} for {leadership.day}: already completed today")
+            yield leadership
+            return
+
+        logger.info(f"Acquired {kind} leadership for {leadership.day} "
+                    f"after {leadership.wait_seconds:.3f}s")
+        held_at = time.monotonic()
+        try:
+            yield leadership
+            if once and leadership.completed:
+                _record_completion(cursor, kind, day)
+        finally:
+            leadership.hold_seconds = time.monotonic() - held_at
+            try:
+                cursor.execute("SELECT pg_advisory_unlock(%s, %s)", key)
+            except psycopg2.Error as e:
+                logger.warning(f"Could not release {kind} lock (closing connection instead): {e}")
+            logger.info(f"Released {kind} leadership after {leadership.hold_seconds:.2f}s")
+    finally:
+        cursor.close()
+        conn.close()
+        with _events_lock:
+            _events.append(leadership)
+
+def leader_only(kind: str, skipped: Any = None, once: bool = False):
+    """
+    Decorator: run the function only on the replica that wins today's
+    election for `kind`; everyone else gets `skipped` back. With `once`
+    it runs at most once per day across replicas; a False return or an
+    exception leaves the day open for a retry.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with leader_lock(kind, once=once) as leadership:
+                if not leadership.acquired:
+                    return skipped
+                result = func(*args, **kwargs)
+                leadership.completed = result is not False
+                return result
+        return wrapper
+    return decorator
+
+def drain_leadership_events() -> List[Dict[str, Any]]:
+    """Elections since the last call, as dicts for run history"""
+    with _events_lock:
+        events = [
+            {
+                'kind': e.kind,
+                'day': e.day,
+                'acquired': e.acquired,
+                'wait_seconds': round(e.wait_seconds, 3),
+                'hold_seconds': round(e.hold_seconds, 3),
+                'holder': e.holder,
+                'already_done': e.already_done,
+            }
+            for e in _events
+        ]
+        _events.clear()
+    return events
@@ -0,0 +1,136 @@
+"""
+Learn a crawl interval per platform from the yield of recent runs.
+
+A crawl only sees the first few pages of a feed, so it can pick up about
+`items_parsed` items. From scraper_run_history we estimate how fast new
+items appear (new items / hours since the previous crawl, smoothed with
+an EWMA) and pick the interval at which a crawl should find
+`target_fill` of its capacity new. Fast-churning feeds get polled more
+often, stale ones less, and a crawl that came back almost all new (so it
+probably missed items) halves the interval. Intervals stay within
+[min_interval, max_interval] and change by at most `max_step`x at a time.
+
+Usage:
+    python crawl_frequency.py   # Print the learned interval per platform
+"""
+import logging
+import statistics
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from database import get_db_connection
+
+logger = logging.getLogger(__name__)
+
+@dataclass
+class CrawlPolicy:
+    min_interval: float = 3600.0  # 1 hour
+    max_interval: float = 3 * 86400.0  # 3 days
+    default_interval: float = 86400.0  # Until there is enough history
+    target_fill: float = 0.5  # Share of a crawl's items we want to be new
+    saturation: float = 0.9  # Above this share new, the crawl probably missed items
+    smoothing: float = 0.5  # EWMA weight of the newest observation
+    max_step: float = 2.0
+    history_runs: int = 10
+
+@dataclass
+class CrawlEstimate:
+    platform: str
+    interval_seconds: float
+    new_per_hour: Optional[float]
+    capacity: Optional[float]  # Median items seen per crawl
+    runs_used: int
+    reason: str
+
+# (recordedAt, itemsScraped, itemsParsed), oldest first
+Run = Tuple[datetime, int, int]
+
+def _clamp(value: float, low: float, high: float) -> float:
+    return max(low, min(high, value))
+
+def estimate_interval(platform: str, runs: Sequence[Run],
+                      policy: Optional[CrawlPolicy] = None) -> CrawlEstimate:
+    """Pure estimator over a platform's recent successful runs"""
+    policy = policy or CrawlPolicy()
+    if len(runs) < 2:
+        return CrawlEstimate(platform, policy.default_interval, None, None, len(runs),
+                             'not enough history')
+
+    rate = None
+    for (previous_at, _, _), (recorded_at, new_items, _) in zip(runs, runs[1:]):
+        hours = (recorded_at - previous_at).total_seconds() / 3600
+        if hours <= 0:
+            continue
+        observed = new_items / hours
+        rate = observed if rate is None else policy.smoothing * observed + (1 - policy.smoothing) * rate
+
+    # The current interval is the latest gap between crawls
+    current = _clamp((runs[-1][0] - runs[-2][0]).total_seconds(),
+                     policy.min_interval, policy.max_interval)
+    capacities = [parsed for _, _, parsed in runs if parsed > 0]
+    capacity = statistics.median(capacities) if capacities else None
+    latest_new, latest_parsed = runs[-1][1], runs[-1][2]
+
+    if rate is None:
+        return CrawlEstimate(platform, current, None, capacity, len(runs), 'no usable gaps')
+    if latest_parsed and latest_new / latest_parsed >= policy.saturation:
+        interval, reason = current / policy.max_step, 'last crawl saturated'
+    elif rate <= 0:
+        interval, reason = current * policy.max_step, 'no new items'
+    elif capacity is None:
+        interval, reason = current, 'unknown capacity'
+    else:
+        interval = policy.target_fill * capacity / rate * 3600
+        reason = f'target {policy.target_fill:.0%} of {capacity:g} items new'
+
+    interval = _clamp(interval, current / policy.max_step, current * policy.max_step)
+    interval = _clamp(interval, policy.min_interval, policy.max_interval)
+    return CrawlEstimate(platform, interval, rate, capacity, len(runs), reason)
+
+def recent_runs(platforms: Optional[Iterable[str]] = None,
+                limit: int = 10) -> Dict[str, List[Run]]:
+    """Last `limit` successful runs per platform from scraper_run_history"""
+    names = list(platforms) if platforms is not None else None
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    try:
+        cursor.execute("""
+            SELECT platform, "recordedAt", "itemsScraped", "itemsParsed"
+            FROM (
+                SELECT *, ROW_NUMBER() OVER (PARTITION BY platform ORDER BY "recordedAt" DESC) AS rn
+                FROM scraper_run_history
+                WHERE success AND (%s::text[] IS NULL OR platform = ANY(%s::text[]))
+            ) ranked
+            WHERE rn <= %s
+            ORDER BY platform, "recordedAt"
+        """, (names, names, limit))
+        runs: Dict[str, List[Run]] = {}
+        for platform, recorded_at, new_items, parsed in cursor.fetchall():
+            runs.setdefault(platform, []).append((recorded_at, new_items, parsed))
+        return runs
+    finally:
+        cursor.close()
+        conn.close()
+
+def learn_intervals(platforms: Iterable[str],
+                    policy: Optional[CrawlPolicy] = None) -> Dict[str, CrawlEstimate]:
+    policy = policy or CrawlPolicy()
+    platforms = list(platforms)
+    history = recent_runs(platforms, policy.history_runs)
+    return {p: estimate_interval(p, history.get(p, []), policy) for p in platforms}
+
+def main():
+    import json
+    from registry import SCRAPERS
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+    from dotenv import load_dotenv
+    load_dotenv()
+
+    for estimate in learn_intervals(spec.name for spec in SCRAPERS.values()).values():
+        print(json.dumps(asdict(estimate)))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Incremental maintenance of the curation_candidates table.
+
+The table holds the current top-k active inspirations per platform, with
+each row's rank within its platform and within its author. The curator
+reads a few dozen pre-ranked rows from it instead of re-ranking the
+inspirations table on every run.
+"""
+import argparse
+import logging
+from typing import Dict, Iterable, Set, Tuple
+
+from database import get_db_connection
+
+logger = logging.getLogger(__name__)
+
+PLATFORM_TOP_K = 5  # Top 5 per platform
+AUTHOR_TOP_K = 2  # Max 2 per author
+MIN_CANDIDATE_SCORE = 60  # Only consider high-quality content
+
+def refresh_platforms(cursor, platforms: Iterable[str]) -> int:
+    """
+    Replace the candidate rows for the given platforms and re-rank authors.
+    Each platform reads at most PLATFORM_TOP_K rows via the
+    (platform, archived, score DESC) index. Returns candidate rows written.
+    """
+    platforms = sorted(set(p for p in platforms if p))
+    if not platforms:
+        return 0
+
+    # Concurrent refreshes (ingest, rescore, refresh jobs) would race on the
+    # DELETE and then collide on the INSERT's primary key. The author re-rank
+    # touches every row anyway, so refreshes take turns until commit.
+    cursor.execute("SELECT pg_advisory_xact_lock(hashtext('curation_candidates'))")
+    cursor.execute(
+        'DELETE FROM curation_candidates WHERE platform = ANY(%s)',
+        (platforms,)
+    )
+
+    written = 0
+    for platform in platforms:
+        cursor.execute("""
+            INSERT INTO curation_candidates (
+                "inspirationId", platform, "authorName", score, "publishedAt",
+                "platformRank", "authorRank", "updatedAt"
+            )
+            SELECT id, platform, "authorName", score, "publishedAt",
+                   ROW_NUMBER() OVER (ORDER BY score DESC), 0, CURRENT_TIMESTAMP
+            FROM (
+                SELECT id, platform, "authorName", score, "publishedAt"
+                FROM inspirations
+                WHERE platform = %s
+                  AND archived = false
+                  AND score >= %s
+                ORDER BY score DESC
+                LIMIT %s
+            ) top_k
+        """, (platform, MIN_CANDIDATE_SCORE, PLATFORM_TOP_K))
+        written += cursor.rowcount
+
+    _rerank_authors(cursor)
+    return written
+
+def _rerank_authors(cursor):
+    """Recompute author ranks across the (small) candidate table"""
+    cursor.execute("""
+        UPDATE curation_candidates c
+        SET "authorRank" = ranked.rn
+        FROM (
+            SELECT "inspirationId",
+                   ROW_NUMBER() OVER (PARTITION BY "authorName" ORDER BY score DESC) AS rn
+            FROM curation_candidates
+            WHERE "authorName" IS NOT NULL
+        ) ranked
+        WHERE c."inspirationId" = ranked."inspirationId"
+          AND c."authorRank" IS DISTINCT FROM ranked.rn
+    """)
+
+def note_score_changes(cursor, changes: Iterable[Tuple[str, str, float]]) -> Set[str]:
+    """
+    Refresh only the platforms whose top-k could be affected by the given
+    (inspiration_id, platform, new_score) changes. Returns refreshed platforms.
+    """
+    changes = list(changes)
+    if not changes:
+        return set()
+
+    cursor.execute("""
+        SELECT platform, COUNT(*), MIN(score), array_agg("inspirationId")
+        FROM curation_candidates
+        WHERE platform = ANY(%s)
+        GROUP BY platform
+    """, (list({platform for _, platform, _ in changes}),))
+
+    state: Dict[str, Tuple[int, float, Set[str]]] = {
+        platform: (count, min_score, set(ids))
+        for platform, count, min_score, ids in cursor.fetchall()
+    }
+
+    stale = set()
+    for inspiration_id, platform, score in changes:
+        count, min_score, ids = state.get(platform, (0, None, set()))
+        if inspiration_id in ids:
+            stale.add(platform)  # A current candidate moved
+        elif score is not None and score >= MIN_CANDIDATE_SCORE and (
+            count < PLATFORM_TOP_K or score > min_score
+        ):
+            stale.add(platform)  # Would enter the top-k
+
+    refresh_platforms(cursor, stale)
+    return stale
+
+def fill_missing_platforms(cursor) -> Set[str]:
+    """
+    Refresh platforms that have eligible active inspirations but no candidate
+    rows (the table starts empty and saves only refresh their own platform).
+    Returns refreshed platforms.
+    """
+    cursor.execute("""
+        SELECT DISTINCT i.platform FROM inspirations i
+        WHERE i.archived = false
+          AND i.score >= %s
+          AND NOT EXISTS (SELECT 1 FROM curation_candidates c WHERE c.platform = i.platform)
+    """, (MIN_CANDIDATE_SCORE,))
+    platforms = {row[0] for row in cursor.fetchall()}
+    refresh_platforms(cursor, platforms)
+    return platforms
+
+def drop_archived(cursor) -> Set[str]:
+    """Remove candidates that have since been archived and refill their platforms"""
+    cursor.execute("""
+        DELETE FROM curation_candidates c
+        USING inspirations i
+        WHERE i.id = c."inspirationId" AND i.archived = true
+        RETURNING c.platform
+    """)
+    platforms = {row[0] for row in cursor.fetchall()}
+    refresh_platforms(cursor, platforms)
+    return platforms
+
+def rebuild_candidates() -> int:
+    """Rebuild the whole table from inspirations"""
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    try:
+        cursor.execute("SELECT DISTINCT platform FROM inspirations WHERE archived = false")
+        platforms = [row[0] for row in cursor.fetchall()]
+        cursor.execute("DELETE FROM curation_candidates")
+        written = refresh_platforms(cursor, platforms)
+        conn.commit()
+        logger.info(f"Rebuilt curation candidates: {written} rows across {len(platforms)} platforms")
+        return written
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cursor.close()
+        conn.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Maintain the curation_candidates table')
+    parser.add_argument('--rebuild', action='store_true', help='Rebuild all platforms from scratch')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+    from dotenv import load_dotenv
+    load_dotenv()
+
+    if args.rebuild:
+        rebuild_candidates()
+    else:
+        parser.print_help()
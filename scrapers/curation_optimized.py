@@ -1,29 +1,36 @@
-import psycopg2
-import os
+from database import get_db_connection
 import logging
 from datetime import datetime, date, timedelta
-from typing import List, Tuple, Dict, Optional
+from typing import List, Tuple, Dict, Optional, Union
 import json
+import tracing
+from coordination import leader_lock
+from curation_candidates import AUTHOR_TOP_K, fill_missing_platforms
+from diversity import DEFAULT_LAMBDA, TagVocabulary, mmr_select
+from inspiration import Inspiration
 
 logger = logging.getLogger(__name__)
 
 class OptimizedCurator:
     """Optimized curation system for better performance with large datasets"""
     
-    def __init__(self):
+    def __init__(self, mmr_lambda: float = DEFAULT_LAMBDA):
         self.conn = None
         self.cursor = None
+        self.mmr_lambda = mmr_lambda
         
     def get_connection(self):
         """Get database connection with connection pooling support"""
         if not self.conn or self.conn.closed:
-            self.conn = psycopg2.connect(os.environ['DATABASE_URL'])
+            self.conn = get_db_connection()
         return self.conn
     
+    @tracing.traced('curate_daily_content', 'curation')
     def curate_daily_content_optimized(self, target_date: Optional[date] = None) -> bool:
         """
         Optimized daily curation algorithm that scales with large datasets.
         Uses indexes effectively and implements efficient diversity constraints.
+        Runs without leader election; production goes through curate_daily_content().
         """
         target_date = target_date or date.today()
         
@@ -62,7 +69,33 @@ class OptimizedCurator:
             if self.conn:
                 self.conn.close()
     
+    @tracing.traced('curation candidates query', 'db')
     def _get_diverse_high_scoring_content(self) -> List[Tuple]:
+        """
+        Read pre-ranked candidates maintained incrementally in curation_candidates,
+        first filling in platforms that have no candidate rows yet. Falls back to
+        ranking the inspirations table when candidates are empty.
+        """
+        filled = fill_missing_platforms(self.cursor)
+        if filled:
+            logger.info(f"Filled curation candidates for: {', '.join(sorted(filled))}")
+        self.cursor.execute("""
+            SELECT c."inspirationId", c.score, c.platform, c."authorName", c."publishedAt", i.tags
+            FROM curation_candidates c
+            JOIN inspirations i ON i.id = c."inspirationId" AND i.archived = false
+            WHERE c."authorName" IS NULL OR c."authorRank" <= %s
+            ORDER BY c.score DESC
+            LIMIT 50
+        """, (AUTHOR_TOP_K,))
+        candidates = self.cursor.fetchall()
+        
+        if not candidates:
+            logger.info("Curation candidates empty, ranking inspirations directly")
+            candidates = self._rank_diverse_high_scoring_content()
+        
+        return candidates
+    
+    def _rank_diverse_high_scoring_content(self) -> List[Tuple]:
         """
         Get diverse high-scoring content using optimized query with proper indexes.
         This replaces the expensive window function approach.
@@ -81,13 +114,13 @@ class OptimizedCurator:
             platform_ranked AS (
                 -- Get top content per platform efficiently
                 SELECT DISTINCT ON (platform) 
-                    id, score, platform, "authorName", "publishedAt"
+                    id, score, platform, "authorName", "publishedAt", tags
                 FROM high_quality_base
                 ORDER BY platform, score DESC
             ),
             platform_diverse AS (
                 -- Get additional content from each platform for diversity
-                SELECT h.id, h.score, h.platform, h."authorName", h."publishedAt"
+                SELECT h.id, h.score, h.platform, h."authorName", h."publishedAt", h.tags
                 FROM high_quality_base h
                 WHERE h.id IN (
                     SELECT id FROM (
@@ -98,7 +131,7 @@ class OptimizedCurator:
             ),
             author_diverse AS (
                 -- Ensure author diversity (max 2 per author)
-                SELECT id, score, platform, "authorName", "publishedAt"
+                SELECT id, score, platform, "authorName", "publishedAt", tags
                 FROM platform_diverse
                 WHERE "authorName" IS NULL 
                    OR id IN (
@@ -109,7 +142,7 @@ class OptimizedCurator:
                     ) ranked WHERE rn <= 2
                 )
             )
-            SELECT id, score, platform, "authorName", "publishedAt"
+            SELECT id, score, platform, "authorName", "publishedAt", tags
             FROM author_diverse
             ORDER BY score DESC
             LIMIT 50;  -- Working set for final selection
@@ -118,48 +151,45 @@ class OptimizedCurator:
         self.cursor.execute(query)
         return self.cursor.fetchall()
     
-    def _select_final_curation(self, candidates: List[Tuple]) -> Tuple[str, List[str]]:
+    @tracing.traced('curation select', 'curation')
+    def _select_final_curation(self, candidates: List[Union[Tuple, Inspiration]],
+                               as_of: Optional[datetime] = None) -> Tuple[str, List[str]]:
         """
         Apply final scoring adjustments and select award pick + top 10.
-        Considers recency, platform balance, and quality.
+        Relevance (score plus recency boost) is traded against tag/platform
+        similarity to already-picked items via MMR re-ranking. Candidates are
+        query rows or Inspiration records.
         """
         if not candidates:
             raise ValueError("No candidates provided for final selection")
+        candidates = [c.as_candidate() if isinstance(c, Inspiration) else c for c in candidates]
         
-        # Score adjustments for final selection
-        scored_candidates = []
-        platform_counts = {}
+        relevance = []
+        tag_lists = []
+        platforms = []
         
-        for idx, (content_id, base_score, platform, author_name, published_at) in enumerate(candidates):
+        for content_id, base_score, platform, author_name, published_at, tags in candidates:
             # Apply recency boost
-            recency_boost = self._calculate_recency_boost(published_at)
-            
-            # Apply platform diversity penalty if too many from same platform
-            platform_count = platform_counts.get(platform, 0)
-            platform_penalty = min(platform_count * 5, 20)  # Max 20 point penalty
-            
-            # Apply position penalty for lower ranked items
-            position_penalty = idx * 0.5  # Small penalty for lower positions
-            
-            final_score = base_score + recency_boost - platform_penalty - position_penalty
-            
-            scored_candidates.append((content_id, final_score, platform))
-            platform_counts[platform] = platform_count + 1
+            final_score = base_score + self._calculate_recency_boost(published_at, as_of)
+            relevance.append(min(max(final_score, 0), 105) / 105)  # Normalize to [0, 1]
+            tag_lists.append(tags or [])
+            platforms.append(platform)
         
-        # Sort by final score and select winners
-        scored_candidates.sort(key=lambda x: x[1], reverse=True)
+        # Tag-ID bitsets make similarity a popcount instead of a set comparison
+        bitsets = TagVocabulary().fit(tag_lists, platforms).encode_all(tag_lists, platforms)
+        picked = mmr_select(relevance, bitsets, k=11, lam=self.mmr_lambda)
         
-        award_pick_id = scored_candidates[0][0]
-        top_10_ids = [item[0] for item in scored_candidates[1:11]]
+        award_pick_id = candidates[picked[0]][0]
+        top_10_ids = [candidates[idx][0] for idx in picked[1:11]]
         
         return award_pick_id, top_10_ids
     
-    def _calculate_recency_boost(self, published_at) -> float:
-        """Calculate recency boost for final scoring"""
+    def _calculate_recency_boost(self, published_at, as_of: Optional[datetime] = None) -> float:
+        """Calculate recency boost for final scoring (relative to `as_of` when replaying)"""
         if not published_at:
             return 0
         
-        now = datetime.now()
+        now = as_of or datetime.now()
         if published_at.tzinfo:
             now = now.replace(tzinfo=published_at.tzinfo)
         
@@ -174,6 +204,7 @@ class OptimizedCurator:
         else:
             return 0
     
+    @tracing.traced('curation save', 'db')
     def _save_curation_results(self, target_date: date, award_pick_id: str, top_10_ids: List[str]):
         """Save curation results with optimized upsert"""
         self.cursor.execute("""
@@ -237,16 +268,23 @@ class OptimizedCurator:
             if self.conn:
                 self.conn.close()
 
-# Convenience functions for backward compatibility
-def curate_daily_content():
-    """Backward compatible function using optimized curator"""
-    curator = OptimizedCurator()
-    return curator.curate_daily_content_optimized()
+def curate_daily_content(once: bool = True) -> Optional[bool]:
+    """
+    Curate today on the replica that wins the 'curation' election. Returns
+    True when curated, False on failure (today stays open for a retry) and
+    None when skipped because another replica is curating or, with `once`,
+    today is already curated. Explicit requests pass once=False to re-curate.
+    """
+    with leader_lock('curation', once=once) as leadership:
+        if not leadership.acquired:
+            return None
+        curated = OptimizedCurator().curate_daily_content_optimized()
+        leadership.completed = curated
+        return curated
 
-def curate_daily_content_optimized():
-    """Direct access to optimized curation"""
-    curator = OptimizedCurator()
-    return curator.curate_daily_content_optimized()
+def curate_daily_content_optimized(once: bool = True) -> Optional[bool]:
+    """Alias of curate_daily_content"""
+    return curate_daily_content(once)
 
 if __name__ == "__main__":
     # For testing
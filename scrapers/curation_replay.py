@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+"""
+Offline what-if replay of daily curations.
+
+Loads stored score features (score_features.py) and daily_curations once,
+then re-runs curation for every day in a range under alternative weights
+and diversity settings, reporting how often the replayed picks match the
+real ones and how picks spread over platforms and authors.
+
+Items are kept sorted by publishedAt, so each day's pool (published
+within the archival window and scraped by that day) is a slice, and the
+recency component is a few constant offsets over sub-slices. Scoring a
+config is one dot product over all items; each day then only slices,
+takes the per-platform top-k with argpartition and runs the production
+MMR selection on the few dozen survivors.
+
+Caveats: features reflect current engagement, not engagement on the
+replayed day, and archival is approximated by ARCHIVE_MAX_AGE_DAYS.
+
+Usage:
+    python curation_replay.py --days 60 \\
+        --weights '' --weights engagement=0.55,platform=0.1 \\
+        --mmr-lambda 0.5,0.7 --author-top-k 1,2
+"""
+import argparse
+import itertools
+import json
+import logging
+import os
+import time
+from collections import Counter
+from dataclasses import asdict, dataclass, field
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from curation_candidates import AUTHOR_TOP_K, MIN_CANDIDATE_SCORE, PLATFORM_TOP_K
+from curation_optimized import OptimizedCurator
+from database import get_db_connection
+from diversity import DEFAULT_LAMBDA
+from score_features import FeatureMatrix, epoch, weight_vector
+from scoring_optimized import RECENCY_FLOOR, RECENCY_STEPS, ScoreWeights
+
+logger = logging.getLogger(__name__)
+
+CANDIDATE_LIMIT = 50  # Candidates handed to MMR, as in OptimizedCurator
+
+@dataclass(frozen=True)
+class ReplayConfig:
+    weights: ScoreWeights = field(default_factory=ScoreWeights)
+    weights_spec: str = ''  # As given on the command line, for reports
+    mmr_lambda: float = DEFAULT_LAMBDA
+    platform_top_k: int = PLATFORM_TOP_K
+    author_top_k: int = AUTHOR_TOP_K
+    min_score: float = MIN_CANDIDATE_SCORE
+
+    def label(self) -> str:
+        return (f"weights[{self.weights_spec or 'default'}] lambda={self.mmr_lambda:g} "
+                f"platform_k={self.platform_top_k} author_k={self.author_top_k} min={self.min_score:g}")
+
+@dataclass
+class ReplayReport:
+    config: str
+    days: int = 0
+    empty_days: int = 0
+    award_match_rate: float = 0.0  # Days whose replayed award pick is the real one
+    mean_overlap: float = 0.0  # Share of the real picks that the replay also picked
+    distinct_authors: int = 0
+    max_author_picks: int = 0
+    platform_share: Dict[str, float] = field(default_factory=dict)
+    seconds: float = 0.0
+
+Curation = Tuple[date, Optional[str], List[str]]
+
+class CurationReplay:
+    def __init__(self, matrix: FeatureMatrix, curations: Sequence[Curation], max_age_days: int = 90):
+        known = ~np.isnan(matrix.published_epoch)
+        order = np.flatnonzero(known)[np.argsort(matrix.published_epoch[known], kind='stable')]
+
+        self.ids = [matrix.ids[i] for i in order]
+        self.tags = [matrix.tags[i] for i in order] if matrix.tags is not None else [[] for _ in order]
+        self.published = matrix.published_epoch[order]
+        self.scraped = matrix.scraped_epoch[order]
+        self.platform_names, self.platform_codes = np.unique(matrix.platforms[order].astype(str),
+                                                             return_inverse=True)
+        self.authors = matrix.authors[order]
+        # Everything except recency, which depends on the replayed day
+        self.static_features = matrix.features[order][:, [0, 1, 2, 4, 5]]
+        self.curations = list(curations)
+        self.max_age = max_age_days * 86400
+        self.curator = OptimizedCurator()
+
+    @classmethod
+    def load(cls, start: date, end: date, max_age_days: int = 90) -> 'CurationReplay':
+        started = time.time()
+        matrix = FeatureMatrix.load(include_archived=True, with_tags=True)
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        try:
+            cursor.execute("""
+                SELECT date, "awardPickId", "top10Ids"
+                FROM daily_curations
+                WHERE date BETWEEN %s AND %s
+                ORDER BY date
+            """, (start, end))
+            curations = [(row[0], row[1], row[2] or []) for row in cursor.fetchall()]
+        finally:
+            cursor.close()
+            conn.close()
+        logger.info(f"Loaded {len(matrix)} items and {len(curations)} curations "
+                    f"in {time.time() - started:.1f}s")
+        return cls(matrix, curations, max_age_days)
+
+    def _day_scores(self, static: np.ndarray, recency_weight: float,
+                    as_of: float) -> Tuple[int, np.ndarray]:
+        """Scores of the day's pool (a slice of the published-sorted items) and its offset"""
+        lo = int(np.searchsorted(self.published, as_of - self.max_age, 'left'))
+        hi = int(np.searchsorted(self.published, as_of, 'right'))
+        scores = static[lo:hi] + recency_weight * RECENCY_FLOOR
+        # Newer items sit at the end of the slice: add each recency step's bonus over its range
+        upper = hi
+        for max_hours, step_score in RECENCY_STEPS:
+            lower = max(int(np.searchsorted(self.published, as_of - max_hours * 3600, 'left')), lo)
+            scores[lower - lo:upper - lo] += recency_weight * (step_score - RECENCY_FLOOR)
+            upper = lower
+        return lo, np.clip(scores, 0, 100, out=scores)
+
+    def _candidates(self, config: ReplayConfig, lo: int, scores: np.ndarray,
+                    as_of: float) -> List[int]:
+        """Per-platform top-k, then the per-author cap, best CANDIDATE_LIMIT first"""
+        hi = lo + len(scores)
+        eligible = (self.scraped[lo:hi] <= as_of) & (scores >= config.min_score)
+        codes = self.platform_codes[lo:hi]
+        picked: List[int] = []
+        for code in range(len(self.platform_names)):
+            pool = np.flatnonzero(eligible & (codes == code))
+            if len(pool) > config.platform_top_k:
+                pool = pool[np.argpartition(-scores[pool], config.platform_top_k - 1)[:config.platform_top_k]]
+            picked.extend(pool.tolist())
+        picked.sort(key=lambda i: -scores[i])
+
+        per_author: Counter = Counter()
+        capped = []
+        for i in picked:
+            author = self.authors[lo + i]
+            if author is not None:
+                per_author[author] += 1
+                if per_author[author] > config.author_top_k:
+                    continue
+            capped.append(i)
+        return capped[:CANDIDATE_LIMIT]
+
+    def run(self, config: ReplayConfig) -> ReplayReport:
+        started = time.time()
+        report = ReplayReport(config=config.label())
+        vector = weight_vector(config.weights)
+        static = self.static_features @ vector[[0, 1, 2, 4, 5]]
+        self.curator.mmr_lambda = config.mmr_lambda
+
+        overlaps, awards = [], 0
+        platforms: Counter = Counter()
+        authors: Counter = Counter()
+        for day, actual_award, actual_top10 in self.curations:
+            as_of_time = datetime.combine(day, datetime.max.time())
+            as_of = epoch(as_of_time)
+            lo, scores = self._day_scores(static, vector[3], as_of)
+            chosen = self._candidates(config, lo, scores, as_of)
+            report.days += 1
+            if not chosen:
+                report.empty_days += 1
+                overlaps.append(0.0)
+                continue
+
+            candidates = [(
+                self.ids[lo + i], float(scores[i]), self.platform_names[self.platform_codes[lo + i]],
+                self.authors[lo + i], datetime.utcfromtimestamp(self.published[lo + i]), self.tags[lo + i]
+            ) for i in chosen]
+            award, top10 = self.curator._select_final_curation(candidates, as_of=as_of_time)
+
+            replayed = [award] + top10
+            actual = set(filter(None, [actual_award] + list(actual_top10)))
+            overlaps.append(len(actual.intersection(replayed)) / len(actual) if actual else 0.0)
+            awards += award == actual_award
+            by_id = {c[0]: c for c in candidates}
+            platforms.update(by_id[i][2] for i in replayed)
+            authors.update(by_id[i][3] for i in replayed if by_id[i][3] is not None)
+
+        total_picks = sum(platforms.values())
+        report.award_match_rate = awards / report.days if report.days else 0.0
+        report.mean_overlap = float(np.mean(overlaps)) if overlaps else 0.0
+        report.distinct_authors = len(authors)
+        report.max_author_picks = max(authors.values(), default=0)
+        report.platform_share = {p: round(n / total_picks, 3) for p, n in platforms.most_common()}
+        report.seconds = time.time() - started
+        return report
+
+def config_grid(weight_specs: Sequence[str], lambdas: Sequence[float], platform_ks: Sequence[int],
+                author_ks: Sequence[int], min_scores: Sequence[float]) -> List[ReplayConfig]:
+    return [
+        ReplayConfig(ScoreWeights.parse(spec), spec, lam, platform_k, author_k, min_score)
+        for spec, lam, platform_k, author_k, min_score
+        in itertools.product(weight_specs, lambdas, platform_ks, author_ks, min_scores)
+    ]
+
+def _floats(value: str) -> List[float]:
+    return [float(v) for v in value.split(',') if v.strip()]
+
+def _ints(value: str) -> List[int]:
+    return [int(v) for v in value.split(',') if v.strip()]
+
+def main():
+    parser = argparse.ArgumentParser(description='Replay past curations under alternative settings')
+    parser.add_argument('--start', type=date.fromisoformat, help='First day (default: --days ago)')
+    parser.add_argument('--end', type=date.fromisoformat, default=date.today())
+    parser.add_argument('--days', type=int, default=30)
+    parser.add_argument('--weights', action='append',
+                        help="Weight overrides, e.g. 'engagement=0.55,platform=0.1'; repeatable")
+    parser.add_argument('--mmr-lambda', type=_floats, default=[DEFAULT_LAMBDA])
+    parser.add_argument('--platform-top-k', type=_ints, default=[PLATFORM_TOP_K])
+    parser.add_argument('--author-top-k', type=_ints, default=[AUTHOR_TOP_K])
+    parser.add_argument('--min-score', type=_floats, default=[MIN_CANDIDATE_SCORE])
+    parser.add_argument('--json', action='store_true', help='Print JSON instead of a table')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+    from dotenv import load_dotenv
+    load_dotenv()
+
+    start = args.start or args.end - timedelta(days=args.days)
+    replay = CurationReplay.load(start, args.end, int(os.environ.get('ARCHIVE_MAX_AGE_DAYS', '90')))
+    configs = config_grid(args.weights or [''], args.mmr_lambda, args.platform_top_k,
+                          args.author_top_k, args.min_score)
+
+    started = time.time()
+    reports = sorted((replay.run(config) for config in configs),
+                     key=lambda r: (r.mean_overlap, r.award_match_rate), reverse=True)
+    logger.info(f"Replayed {len(replay.curations)} days under {len(configs)} configs "
+                f"in {time.time() - started:.1f}s")
+
+    if args.json:
+        print(json.dumps([asdict(r) for r in reports], indent=2))
+        return
+    print(f"{'overlap':>7} {'award':>6} {'authors':>7} {'max/au':>6}  config / platform share")
+    for r in reports:
+        shares = ', '.join(f"{p} {s:.0%}" for p, s in r.platform_share.items())
+        print(f"{r.mean_overlap:>7.0%} {r.award_match_rate:>6.0%} {r.distinct_authors:>7} "
+              f"{r.max_author_picks:>6}  {r.config}\n{'':>31}{shares}")
+
+if __name__ == "__main__":
+    main()
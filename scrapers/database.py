@@ -1,13 +1,76 @@
 import psycopg2
+from psycopg2 import pool as pg_pool
+from psycopg2.extensions import connection as pg_connection, TRANSACTION_STATUS_IDLE
+from psycopg2.extras import execute_values
+import hashlib
 import os
+import threading
+from dataclasses import asdict, dataclass
 from datetime import datetime
 import json
 import logging
 
+import tracing
+from inspiration import as_record
+from log_setup import ItemLogSummary
+
 logger = logging.getLogger(__name__)
 
+# save_inspiration() is called per item; log outcomes in batches
+_save_summary = ItemLogSummary(logger, 'save_inspiration')
+
+_connection_pool = None
+_connection_pool_lock = threading.Lock()
+
+class PooledConnection(pg_connection):
+    """Connection whose close() hands it back to the pool it came from"""
+    _owner_pool = None
+    
+    def close(self):
+        owner, self._owner_pool = self._owner_pool, None
+        if owner is None:
+            return super().close()
+        
+        broken = bool(self.closed)
+        if not broken and self.get_transaction_status() != TRANSACTION_STATUS_IDLE:
+            try:
+                self.rollback()
+            except psycopg2.Error:
+                broken = True
+        owner.putconn(self, close=broken)
+
+def enable_connection_pool(minconn: int = 1, maxconn: int = 10):
+    """
+    Make get_db_connection() hand out warm pooled connections.
+    Used by long-running processes (the worker); one-shot CLIs keep
+    plain connections.
+    """
+    global _connection_pool
+    with _connection_pool_lock:
+        if _connection_pool is None:
+            _connection_pool = pg_pool.ThreadedConnectionPool(
+                minconn, maxconn, os.environ['DATABASE_URL'],
+                connection_factory=PooledConnection
+            )
+            logger.info(f"Database connection pool enabled (max {maxconn} connections)")
+        return _connection_pool
+
+def get_pool_stats():
+    """In-use and idle connection counts, or None when pooling is off"""
+    if _connection_pool is None:
+        return None
+    return {
+        'in_use': len(_connection_pool._used),
+        'idle': len(_connection_pool._pool),
+        'max': _connection_pool.maxconn,
+    }
+
 def get_db_connection():
-    """Get database connection"""
+    """Get database connection (pooled when enable_connection_pool() was called)"""
+    if _connection_pool is not None:
+        conn = _connection_pool.getconn()
+        conn._owner_pool = _connection_pool
+        return conn
     return psycopg2.connect(os.environ['DATABASE_URL'])
 
 def setup_database():
@@ -36,62 +99,217 @@ def setup_database():
     except Exception as e:
         logger.error(f"Database setup error: {e}")
 
-def save_inspiration(inspiration_data):
-    """Save inspiration to database"""
+def _record_snapshots(conn, cursor, records, written):
+    """
+    Engagement snapshot for every crawled item, written or unchanged, so
+    velocity starts from the first crawl and flattens when an item stalls
+    """
+    if not records:
+        return
+    try:
+        from engagement_history import record_snapshots, snapshot_row
+        ids = {row[5]: row[0] for row in written}
+        unchanged = [record.content_url for record in records if record.content_url not in ids]
+        if unchanged:
+            cursor.execute('SELECT "contentUrl", id FROM inspirations WHERE "contentUrl" = ANY(%s)',
+                           (unchanged,))
+            ids.update(cursor.fetchall())
+        record_snapshots(cursor, (snapshot_row(ids[record.content_url], record.source_meta)
+                                  for record in records if record.content_url in ids))
+        conn.commit()
+    except Exception as e:
+        conn.rollback()
+        logger.warning(f"Failed to record engagement snapshots: {e}")
+
+@dataclass
+class SaveCounts:
+    inserted: int = 0
+    updated: int = 0  # Existing URL whose content hash changed
+    unchanged: int = 0  # Existing URL with identical content; no row written
+
+# Scraped fields that make up the content hash. publishedAt and score are
+# left out: some scrapers stamp publishedAt with the crawl time, and the
+# score drifts with recency, so both would change the hash on every run.
+HASHED_FIELDS = ('title', 'description', 'thumbnail_url', 'author_name', 'author_url', 'tags', 'source_meta')
+
+def content_hash(record):
+    """Stable digest of an Inspiration record's scraped content"""
+    payload = json.dumps([getattr(record, name) for name in HASHED_FIELDS], sort_keys=True, default=str)
+    return hashlib.blake2b(payload.encode('utf-8'), digest_size=16).hexdigest()
+
+_INSERT_SQL = """
+    INSERT INTO inspirations (
+        id, title, description, "thumbnailUrl", "contentUrl",
+        platform, "authorName", "authorUrl", tags, score,
+        "publishedAt", "scrapedAt", "sourceMeta", "contentHash", "createdAt", "updatedAt"
+    ) VALUES %s
+"""
+
+# Existing rows are rewritten only when their content hash differs, so a
+# nightly re-crawl of unchanged items costs no heap, index or WAL writes.
+# sourceMeta is merged to keep keys added after ingest (refreshedAt, ...).
+# score is left alone here; _after_write rescores written rows with velocity.
+_ON_CONFLICT_UPDATE = """
+    ON CONFLICT ("contentUrl") DO UPDATE SET
+        title = EXCLUDED.title,
+        description = EXCLUDED.description,
+        "thumbnailUrl" = EXCLUDED."thumbnailUrl",
+        "authorName" = EXCLUDED."authorName",
+        "authorUrl" = EXCLUDED."authorUrl",
+        tags = EXCLUDED.tags,
+        "sourceMeta" = COALESCE(inspirations."sourceMeta", '{}'::jsonb) || EXCLUDED."sourceMeta",
+        "contentHash" = EXCLUDED."contentHash",
+        "updatedAt" = EXCLUDED."updatedAt"
+    WHERE inspirations."contentHash" IS DISTINCT FROM EXCLUDED."contentHash"
+"""
+
+_ON_CONFLICT_SKIP = """
+    ON CONFLICT ("contentUrl") DO NOTHING
+"""
+
+def _upsert(cursor, items, update_existing=True):
+    """
+    Insert new items (Inspiration records or scraper dicts) and optionally
+    update changed ones in one statement. Returns the records, one per URL,
+    and (id, platform, score, sourceMeta, inserted, contentUrl) per row written.
+    """
+    now = datetime.now()
+    # ON CONFLICT DO UPDATE can't touch one row twice; keep the last copy of each URL
+    unique = {record.content_url: record for record in map(as_record, items) if record.content_url}
+    rows = [(
+        record.title,
+        record.description,
+        record.thumbnail_url,
+        record.content_url,
+        record.platform,
+        record.author_name,
+        record.author_url,
+        record.tags,
+        record.score,
+        record.published_at or now,
+        now,
+        json.dumps(record.source_meta),
+        content_hash(record),
+        now,
+        now
+    ) for record in unique.values()]
+    if not rows:
+        return [], []
+
+    written = execute_values(
+        cursor,
+        _INSERT_SQL + (_ON_CONFLICT_UPDATE if update_existing else _ON_CONFLICT_SKIP) +
+        'RETURNING id, platform, score, "sourceMeta", (xmax = 0) AS inserted, "contentUrl"',
+        rows,
+        template="(gen_random_uuid(), %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)",
+        fetch=True
+    )
+    return list(unique.values()), written
+
+def _score_written(cursor, records):
+    """
+    Rescore written rows as rescoring does (with velocity, ScoreWeights) and
+    store their features. Returns (id, platform, score) per record.
+    """
+    from score_features import store_features
+    from scoring_optimized import OptimizedScoring
+
+    scorer = OptimizedScoring()
+    scorer.attach_velocities(cursor, records)
+    features = [(record.id, scorer.score_components(record)) for record in records]
+    for record, (_, components) in zip(records, features):
+        record.score = scorer.weights.combine(components)
+    scores = [(record.id, record.score) for record in records]
+    execute_values(cursor, """
+        UPDATE inspirations AS i
+        SET score = v.score
+        FROM (VALUES %s) AS v(id, score)
+        WHERE i.id = v.id AND i.score IS DISTINCT FROM v.score
+    """, scores, page_size=len(scores))
+    store_features(cursor, features)
+    return [(record.id, record.platform, record.score) for record in records]
+
+def _after_write(conn, cursor, records, written):
+    """Snapshot every crawled item, then score written rows and update curation candidates"""
+    # Snapshots first, so the rescoring below sees this crawl's reading
+    _record_snapshots(conn, cursor, records, written)
+    if not written:
+        return
+    by_url = {record.content_url: record for record in records}
+    written_records = []
+    for row in written:
+        record = by_url[row[5]]
+        record.id = row[0]
+        written_records.append(record)
+
+    changes = [row[:3] for row in written]
     try:
+        changes = _score_written(cursor, written_records)
+        conn.commit()
+    except Exception as e:
+        conn.rollback()
+        logger.warning(f"Failed to rescore written inspirations: {e}")
+    try:
+        from curation_candidates import note_score_changes
+        note_score_changes(cursor, changes)
+        conn.commit()
+    except Exception as e:
+        conn.rollback()
+        logger.warning(f"Failed to update curation candidates: {e}")
+
+@tracing.traced('save_inspiration', 'item', sampled=True)
+def save_inspiration(inspiration_data, update_existing=True):
+    """Save an inspiration (record or scraper dict) to database.
+    Returns its id when inserted or updated, None when unchanged or on failure."""
+    try:
+        inspiration_data = as_record(inspiration_data)
         conn = get_db_connection()
         cursor = conn.cursor()
-        
-        # Check if already exists
-        cursor.execute(
-            "SELECT id FROM inspirations WHERE \"contentUrl\" = %s",
-            (inspiration_data['contentUrl'],)
-        )
-        
-        existing = cursor.fetchone()
-        if existing:
-            logger.info(f"Inspiration already exists: {inspiration_data['title']}")
+        try:
+            records, written = _upsert(cursor, [inspiration_data], update_existing)
+            conn.commit()
+            _after_write(conn, cursor, records, written)
+        finally:
             cursor.close()
             conn.close()
+        
+        if not written:
+            logger.debug(f"Inspiration unchanged: {inspiration_data.title}")
+            _save_summary.add('unchanged')
             return None
         
-        # Insert new inspiration
-        cursor.execute("""
-            INSERT INTO inspirations (
-                id, title, description, "thumbnailUrl", "contentUrl", 
-                platform, "authorName", "authorUrl", tags, score, 
-                "publishedAt", "scrapedAt", "sourceMeta", "createdAt", "updatedAt"
-            ) VALUES (
-                gen_random_uuid(), %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s
-            ) RETURNING id
-        """, (
-            inspiration_data['title'],
-            inspiration_data.get('description'),
-            inspiration_data.get('thumbnailUrl'),
-            inspiration_data['contentUrl'],
-            inspiration_data['platform'],
-            inspiration_data.get('authorName'),
-            inspiration_data.get('authorUrl'),
-            inspiration_data.get('tags', []),
-            inspiration_data.get('score', 50),
-            inspiration_data.get('publishedAt', datetime.now()),
-            datetime.now(),
-            json.dumps(inspiration_data.get('sourceMeta', {})),
-            datetime.now(),
-            datetime.now()
-        ))
+        outcome = 'saved' if written[0][4] else 'updated'
+        logger.debug(f"Inspiration {outcome}: {inspiration_data.title}")
+        _save_summary.add(outcome)
+        return written[0][0]
         
-        result = cursor.fetchone()
-        if not result:
-            raise Exception("Failed to insert inspiration - no ID returned")
-        inspiration_id = result[0]
+    except Exception as e:
+        logger.error(f"Failed to save inspiration: {e}")
+        _save_summary.add('failed')
+        return None
+
+def save_inspirations_batch(items, update_existing=True):
+    """Upsert a batch of Inspiration records in one statement. Existing URLs are
+    updated only if their content changed (or skipped when update_existing
+    is False). Returns SaveCounts."""
+    if not items:
+        return SaveCounts()
+    
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    try:
+        records, written = _upsert(cursor, items, update_existing)
         conn.commit()
+        _after_write(conn, cursor, records, written)
+        
+        inserted = sum(1 for row in written if row[4])
+        counts = SaveCounts(inserted, len(written) - inserted, len(records) - len(written))
+        logger.info(f"Saved batch: {counts.inserted} new, {counts.updated} updated, {counts.unchanged} unchanged",
+                    extra=asdict(counts))
+        return counts
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
         cursor.close()
         conn.close()
-        
-        logger.info(f"Saved inspiration: {inspiration_data['title']}")
-        return inspiration_id
-        
-    except Exception as e:
-        logger.error(f"Failed to save inspiration: {e}")
-        return None
\ No newline at end of file
@@ -0,0 +1,136 @@
+"""
+Tag-aware maximal-marginal-relevance (MMR) re-ranking for daily curation.
+
+Each candidate's tags are packed once into a fixed-width tag-ID bitset
+(uint64 words), so similarity to a picked item is a vectorized
+AND + popcount over the whole pool instead of per-pair set comparisons.
+"""
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+DEFAULT_LAMBDA = 0.7  # Weight on relevance vs. novelty
+BITSET_WORDS = 2  # 128-bit tag bitsets
+
+class TagVocabulary:
+    """
+    Maps tags to bit positions. The most frequent tags get dedicated bits;
+    once those run out, rarer tags share the remaining quarter of the bits.
+    """
+
+    def __init__(self, words: int = BITSET_WORDS):
+        self.words = words
+        self.bits = words * 64
+        self.dedicated = self.bits * 3 // 4
+        self._ids: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    @staticmethod
+    def _keys(tags: Iterable[str], platform: Optional[str]) -> List[str]:
+        keys = [tag.strip().lower() for tag in tags if tag]
+        if platform:
+            keys.append(f"platform:{platform.lower()}")  # Same-platform items are similar too
+        return keys
+
+    def fit(self, tag_lists: Sequence[Iterable[str]],
+            platforms: Optional[Sequence[str]] = None) -> 'TagVocabulary':
+        """Assign ids by descending frequency so common tags never share a bit"""
+        platforms = platforms if platforms is not None else [None] * len(tag_lists)
+        counts = Counter()
+        for tags, platform in zip(tag_lists, platforms):
+            counts.update(set(self._keys(tags or [], platform)))
+        for key, _ in counts.most_common():
+            self._ids.setdefault(key, len(self._ids))
+        return self
+
+    def _bit(self, key: str) -> int:
+        tag_id = self._ids.get(key)
+        if tag_id is None:
+            tag_id = self._ids[key] = len(self._ids)
+        if tag_id < self.dedicated:
+            return tag_id
+        return self.dedicated + (tag_id - self.dedicated) % (self.bits - self.dedicated)
+
+    def _words(self, tags: Iterable[str], platform: Optional[str]) -> List[int]:
+        words = [0] * self.words
+        for key in self._keys(tags, platform):
+            bit = self._bit(key)
+            words[bit >> 6] |= 1 << (bit & 63)
+        return words
+
+    def encode(self, tags: Iterable[str], platform: Optional[str] = None) -> np.ndarray:
+        """Bitset for one candidate as uint64 words"""
+        return np.array(self._words(tags, platform), dtype=np.uint64)
+
+    def encode_all(self, tag_lists: Sequence[Iterable[str]],
+                   platforms: Optional[Sequence[str]] = None) -> np.ndarray:
+        """
+        Bitsets for a candidate pool, stored word-major with shape
+        (words, n) so each per-step operation runs over contiguous memory.
+        """
+        platforms = platforms if platforms is not None else [None] * len(tag_lists)
+        rows = [self._words(tags or [], platform) for tags, platform in zip(tag_lists, platforms)]
+        if not rows:
+            return np.zeros((self.words, 0), dtype=np.uint64)
+        return np.ascontiguousarray(np.array(rows, dtype=np.uint64).T)
+
+def popcounts(bitsets: np.ndarray) -> np.ndarray:
+    """Number of tags set in each candidate's bitset"""
+    return np.bitwise_count(bitsets).sum(axis=0, dtype=np.int64)
+
+def mmr_select(relevance: Sequence[float], bitsets: np.ndarray, k: int,
+               lam: float = DEFAULT_LAMBDA, counts: Optional[np.ndarray] = None) -> List[int]:
+    """
+    Greedy MMR selection of k indices.
+
+    Each step picks argmax(lam * relevance - (1 - lam) * max_sim), where
+    max_sim is the highest Jaccard similarity to anything already picked.
+    `relevance` must be normalized to [0, 1] and `bitsets` come from
+    TagVocabulary.encode_all. Only the similarity to the newest pick is
+    computed per step: popcount(candidate & pick) word by word, with the
+    union derived from the precomputed per-candidate popcounts.
+    """
+    n = len(relevance)
+    if n == 0 or k <= 0:
+        return []
+
+    base = (lam * np.asarray(relevance, dtype=np.float64)).astype(np.float32)
+    counts = (popcounts(bitsets) if counts is None else counts).astype(np.int16)
+    novelty = np.float32(1.0 - lam)
+    value = base.copy()
+    penalty = np.zeros(n, dtype=np.float32)  # novelty * max_sim
+
+    # Scratch buffers reused every step
+    word_and = np.empty(n, dtype=np.uint64)
+    word_count = np.empty(n, dtype=np.uint8)
+    inter = np.empty(n, dtype=np.uint8)
+    union = np.empty(n, dtype=np.int16)
+    sim = np.empty(n, dtype=np.float32)
+    picked: List[int] = []
+
+    for _ in range(min(k, n)):
+        idx = int(np.argmax(value))
+        picked.append(idx)
+
+        for w, word in enumerate(bitsets):
+            np.bitwise_and(word, word[idx], out=word_and)
+            if w == 0:
+                np.bitwise_count(word_and, out=inter)
+            else:
+                np.bitwise_count(word_and, out=word_count)
+                inter += word_count
+
+        # Jaccard = |a & b| / (|a| + |b| - |a & b|)
+        np.subtract(counts, inter, out=union)
+        union += max(counts[idx], 1)  # An empty pick has inter == 0, so this only avoids 0/0
+        np.divide(inter, union, out=sim)
+        sim *= novelty
+        np.maximum(penalty, sim, out=penalty)
+
+        np.subtract(base, penalty, out=value)
+        value[picked] = -np.inf
+
+    return picked
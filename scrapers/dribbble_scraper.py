@@ -1,56 +1,64 @@
-import requests
-import time
+import http_client
 import logging
 import os
 from datetime import datetime
-from database import save_inspiration
-from scoring import calculate_score
+from inspiration import Inspiration
+from pipeline import PlatformSource, run_source
 
 logger = logging.getLogger(__name__)
 
-def scrape_dribbble():
+PER_PAGE = 50
+PAGES = 1
+
+def fetch_dribbble_page(page):
+    """Fetch one page of today's popular Dribbble shots"""
+    access_token = os.environ.get('DRIBBBLE_ACCESS_TOKEN')
+    url = f"https://api.dribbble.com/v2/shots?access_token={access_token}&sort=popular&timeframe=day&per_page={PER_PAGE}&page={page}"
+    
+    response = http_client.get(url)
+    response.raise_for_status()
+    return response.json()
+
+def dribbble_record(shot):
+    """Normalize one Dribbble API shot"""
+    user = shot.get('user', {})
+    return Inspiration(
+        title=shot.get('title', 'Untitled'),
+        description=shot.get('description', ''),
+        content_url=shot.get('html_url', ''),
+        thumbnail_url=shot.get('images', {}).get('normal', ''),
+        platform='Dribbble',
+        author_name=user.get('name', ''),
+        author_url=user.get('html_url', ''),
+        tags=shot.get('tags', []),
+        published_at=datetime.fromisoformat(shot['published_at'].replace('Z', '+00:00')) if shot.get('published_at') else datetime.now(),
+        likes=shot.get('likes_count', 0),
+        views=shot.get('views_count', 0),
+        comments=shot.get('comments_count', 0),
+        source_id=shot.get('id'),
+    )
+
+def parse_dribbble_page(shots):
+    """Turn a Dribbble API response into inspiration records"""
+    items = []
+    
+    for shot in shots:
+        try:
+            items.append(dribbble_record(shot))
+            
+        except Exception as e:
+            logger.error(f"Error processing Dribbble shot: {e}")
+    
+    return items
+
+DRIBBBLE_SOURCE = PlatformSource('Dribbble', fetch_dribbble_page, parse_dribbble_page, pages=PAGES)
+
+def scrape_dribbble(**pipeline_options):
     """Scrape popular shots from Dribbble"""
-    try:
-        access_token = os.environ.get('DRIBBBLE_ACCESS_TOKEN')
-        if not access_token:
-            logger.warning("Dribbble access token not found, skipping...")
-            return
-        
-        url = f"https://api.dribbble.com/v2/shots?access_token={access_token}&sort=popular&timeframe=day&per_page=50"
-        
-        response = requests.get(url)
-        response.raise_for_status()
-        
-        shots = response.json()
-        
-        for shot in shots:
-            try:
-                inspiration_data = {
-                    'title': shot.get('title', 'Untitled'),
-                    'description': shot.get('description', ''),
-                    'contentUrl': shot.get('html_url', ''),
-                    'thumbnailUrl': shot.get('images', {}).get('normal', ''),
-                    'platform': 'Dribbble',
-                    'authorName': shot.get('user', {}).get('name', ''),
-                    'authorUrl': shot.get('user', {}).get('html_url', ''),
-                    'tags': shot.get('tags', []),
-                    'publishedAt': datetime.fromisoformat(shot.get('published_at', '').replace('Z', '+00:00')) if shot.get('published_at') else datetime.now(),
-                    'sourceMeta': {
-                        'likes': shot.get('likes_count', 0),
-                        'views': shot.get('views_count', 0),
-                        'comments': shot.get('comments_count', 0),
-                    }
-                }
-                
-                inspiration_data['score'] = calculate_score(inspiration_data)
-                save_inspiration(inspiration_data)
-                
-                time.sleep(0.5)
-                
-            except Exception as e:
-                logger.error(f"Error processing Dribbble shot: {e}")
-        
-        logger.info(f"Scraped {len(shots)} shots from Dribbble")
-        
-    except Exception as e:
-        logger.error(f"Dribbble scraping failed: {e}")
\ No newline at end of file
+    if not os.environ.get('DRIBBBLE_ACCESS_TOKEN'):
+        logger.warning("Dribbble access token not found, skipping...")
+        return None
+    
+    result = run_source(DRIBBBLE_SOURCE, **pipeline_options)
+    logger.info(f"Scraped {result.items_parsed} shots from Dribbble")
+    return result
@@ -0,0 +1,269 @@
+"""
+Engagement snapshot time series and velocity for trending scores.
+
+sourceMeta only holds the latest likes/views/comments, so 500 likes in two
+hours look the same as 500 likes in a year. Ingest and the engagement
+refresh append a snapshot per item to engagement_snapshots, one row per
+item per hour. Hourly rows older than `hourly_days` are rolled up to one
+row per day (the day's last reading), and daily rows expire after
+`retention_days`, so the table stays bounded at a few dozen rows per item.
+
+Velocity is the least-squares slope of each counter over the last
+`velocity_window_hours`, computed for a whole batch of items at once with
+numpy. scoring_optimized turns it into the trending component.
+
+Usage:
+    python engagement_history.py compact   # Roll up and expire snapshots
+    python engagement_history.py stats     # Row counts per resolution
+"""
+import argparse
+import logging
+import os
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+from psycopg2.extras import execute_values
+
+from database import get_db_connection
+
+logger = logging.getLogger(__name__)
+
+METRICS = ('likes', 'views', 'comments')
+_MAX_COUNT = 2 ** 31 - 1  # INTEGER columns
+
+# Counts gained per hour -> one weighted rate for the trending score
+TREND_WEIGHTS = {'likes': 1.0, 'views': 0.05, 'comments': 3.0}
+TREND_SCALE = 40  # 1/h -> 12, 10/h -> 42, 100/h -> 80, ~300/h -> 100
+
+@dataclass
+class SnapshotPolicy:
+    hourly_days: int = 7  # Hourly rows older than this are rolled up to daily
+    retention_days: int = 90  # Daily rows older than this are deleted
+    velocity_window_hours: float = 72.0
+    chunk_size: int = 10000  # Rows per retention DELETE
+
+    @classmethod
+    def from_env(cls) -> 'SnapshotPolicy':
+        return cls(
+            hourly_days=int(os.environ.get('SNAPSHOT_HOURLY_DAYS', '7')),
+            retention_days=int(os.environ.get('SNAPSHOT_RETENTION_DAYS', '90')),
+            velocity_window_hours=float(os.environ.get('VELOCITY_WINDOW_HOURS', '72'))
+        )
+
+@dataclass
+class CompactionResult:
+    days_rolled_up: int = 0
+    hourly_rows_removed: int = 0
+    daily_rows_written: int = 0
+    daily_rows_expired: int = 0
+    duration: float = 0.0
+
+def _count(value: Any) -> int:
+    try:
+        return max(0, min(int(value or 0), _MAX_COUNT))
+    except (TypeError, ValueError):
+        return 0
+
+def snapshot_row(inspiration_id: str, source_meta: Optional[Dict[str, Any]]) -> Tuple:
+    """(inspirationId, likes, views, comments) from an item's sourceMeta"""
+    meta = source_meta or {}
+    return (inspiration_id, *(_count(meta.get(name)) for name in METRICS))
+
+def hour_bucket(observed_at: Optional[datetime] = None) -> datetime:
+    """Start of the hourly snapshot bucket holding `observed_at` (default now)"""
+    return (observed_at or datetime.now()).replace(minute=0, second=0, microsecond=0)
+
+def record_snapshots(cursor, rows: Iterable[Tuple], observed_at: Optional[datetime] = None) -> int:
+    """
+    Append (inspirationId, likes, views, comments) readings to the current
+    hourly bucket; a second reading in the same hour replaces the first.
+    The caller commits.
+    """
+    rows = list(rows)
+    if not rows:
+        return 0
+    bucket = hour_bucket(observed_at)
+    execute_values(cursor, """
+        INSERT INTO engagement_snapshots ("inspirationId", resolution, "bucketAt", likes, views, comments)
+        VALUES %s
+        ON CONFLICT ("inspirationId", resolution, "bucketAt") DO UPDATE
+        SET likes = EXCLUDED.likes, views = EXCLUDED.views, comments = EXCLUDED.comments
+    """, [(row[0], bucket, *row[1:]) for row in rows], template="(%s, 'h', %s, %s, %s, %s)")
+    return len(rows)
+
+def velocities(groups: np.ndarray, hours: np.ndarray, counts: np.ndarray,
+               n_groups: int) -> np.ndarray:
+    """
+    Least-squares slope (counts per hour) of each counter per group.
+    `groups` maps each reading to its item, `hours` is its time and
+    `counts` its (n, len(METRICS)) values. Rows for items with fewer than
+    two distinct times are NaN.
+    """
+    n = np.bincount(groups, minlength=n_groups).astype(np.float64)
+    sum_t = np.bincount(groups, hours, n_groups)
+    sum_tt = np.bincount(groups, hours * hours, n_groups)
+    denominator = n * sum_tt - sum_t * sum_t
+    usable = denominator > 1e-9
+
+    slopes = np.full((n_groups, counts.shape[1]), np.nan)
+    for column in range(counts.shape[1]):
+        sum_x = np.bincount(groups, counts[:, column], n_groups)
+        sum_tx = np.bincount(groups, hours * counts[:, column], n_groups)
+        slopes[usable, column] = (n * sum_tx - sum_t * sum_x)[usable] / denominator[usable]
+    return slopes
+
+def trending_scores(rates: np.ndarray) -> np.ndarray:
+    """Vectorized 0-100 trending score from an (n, len(METRICS)) matrix of per-hour rates"""
+    weights = np.array([TREND_WEIGHTS[name] for name in METRICS])
+    weighted = np.clip(np.nan_to_num(rates), 0, None) @ weights
+    return np.minimum(np.log10(weighted + 1) * TREND_SCALE, 100)
+
+def load_velocities(cursor, inspiration_ids: Sequence[str],
+                    window_hours: float = 72.0,
+                    now: Optional[datetime] = None) -> Dict[str, Dict[str, float]]:
+    """Per-hour gains of each counter over the window, for items with enough readings"""
+    ids = list(dict.fromkeys(inspiration_ids))
+    if not ids:
+        return {}
+    now = now or datetime.now()
+    cursor.execute("""
+        SELECT "inspirationId", EXTRACT(EPOCH FROM ("bucketAt" - %(now)s)) / 3600,
+               likes, views, comments
+        FROM engagement_snapshots
+        WHERE "inspirationId" = ANY(%(ids)s)
+          AND "bucketAt" >= %(since)s
+    """, {'ids': ids, 'now': now, 'since': now - timedelta(hours=window_hours)})
+    rows = cursor.fetchall()
+    if not rows:
+        return {}
+
+    index = {inspiration_id: i for i, inspiration_id in enumerate(ids)}
+    groups = np.fromiter((index[row[0]] for row in rows), dtype=np.int64, count=len(rows))
+    data = np.array([row[1:] for row in rows], dtype=np.float64)
+    slopes = velocities(groups, data[:, 0], data[:, 1:], len(ids))
+
+    usable = ~np.isnan(slopes[:, 0])
+    return {
+        ids[i]: dict(zip(METRICS, slopes[i].tolist()))
+        for i in np.flatnonzero(usable)
+    }
+
+def _roll_up_day(cursor, day: datetime) -> Tuple[int, int]:
+    """Replace one day's hourly rows with the day's last reading per item"""
+    cursor.execute("""
+        WITH removed AS (
+            DELETE FROM engagement_snapshots
+            WHERE resolution = 'h' AND "bucketAt" >= %(day)s AND "bucketAt" < %(next_day)s
+            RETURNING *
+        ), latest AS (
+            SELECT DISTINCT ON ("inspirationId") "inspirationId", likes, views, comments
+            FROM removed
+            ORDER BY "inspirationId", "bucketAt" DESC
+        ), written AS (
+            INSERT INTO engagement_snapshots ("inspirationId", resolution, "bucketAt", likes, views, comments)
+            SELECT "inspirationId", 'd', %(day)s, likes, views, comments FROM latest
+            ON CONFLICT ("inspirationId", resolution, "bucketAt") DO UPDATE
+            SET likes = EXCLUDED.likes, views = EXCLUDED.views, comments = EXCLUDED.comments
+            RETURNING 1
+        )
+        SELECT (SELECT COUNT(*) FROM removed), (SELECT COUNT(*) FROM written)
+    """, {'day': day, 'next_day': day + timedelta(days=1)})
+    return cursor.fetchone()
+
+def compact_snapshots(policy: Optional[SnapshotPolicy] = None) -> CompactionResult:
+    """Roll up old hourly rows day by day, then expire old daily rows in chunks"""
+    policy = policy or SnapshotPolicy.from_env()
+    started = time.time()
+    result = CompactionResult()
+    today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    hourly_cutoff = today - timedelta(days=policy.hourly_days)
+    daily_cutoff = today - timedelta(days=policy.retention_days)
+
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    try:
+        cursor.execute("""
+            SELECT DISTINCT date_trunc('day', "bucketAt")
+            FROM engagement_snapshots
+            WHERE resolution = 'h' AND "bucketAt" < %s
+            ORDER BY 1
+        """, (hourly_cutoff,))
+        days = [row[0] for row in cursor.fetchall()]
+        conn.commit()
+
+        # One transaction per day keeps locks and WAL bursts short
+        for day in days:
+            removed, written = _roll_up_day(cursor, day)
+            conn.commit()
+            result.days_rolled_up += 1
+            result.hourly_rows_removed += removed
+            result.daily_rows_written += written
+
+        while True:
+            cursor.execute("""
+                DELETE FROM engagement_snapshots
+                WHERE ctid IN (
+                    SELECT ctid FROM engagement_snapshots
+                    WHERE resolution = 'd' AND "bucketAt" < %s
+                    LIMIT %s
+                )
+            """, (daily_cutoff, policy.chunk_size))
+            deleted = cursor.rowcount
+            conn.commit()
+            result.daily_rows_expired += deleted
+            if deleted < policy.chunk_size:
+                break
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cursor.close()
+        conn.close()
+
+    result.duration = time.time() - started
+    logger.info(f"Snapshot compaction: {result.hourly_rows_removed} hourly rows rolled up into "
+                f"{result.daily_rows_written} daily over {result.days_rolled_up} days, "
+                f"{result.daily_rows_expired} expired in {result.duration:.1f}s")
+    return result
+
+def snapshot_stats() -> List[Dict[str, Any]]:
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    try:
+        cursor.execute("""
+            SELECT resolution, COUNT(*), COUNT(DISTINCT "inspirationId"), MIN("bucketAt"), MAX("bucketAt")
+            FROM engagement_snapshots
+            GROUP BY resolution
+            ORDER BY resolution
+        """)
+        return [
+            {'resolution': row[0], 'rows': row[1], 'items': row[2],
+             'oldest': str(row[3]), 'newest': str(row[4])}
+            for row in cursor.fetchall()
+        ]
+    finally:
+        cursor.close()
+        conn.close()
+
+def main():
+    import json
+
+    parser = argparse.ArgumentParser(description='Engagement snapshot maintenance')
+    parser.add_argument('command', choices=['compact', 'stats'])
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+    from dotenv import load_dotenv
+    load_dotenv()
+
+    if args.command == 'compact':
+        print(json.dumps(asdict(compact_snapshots()), indent=2))
+    else:
+        print(json.dumps(snapshot_stats(), indent=2))
+
+if __name__ == "__main__":
+    main()
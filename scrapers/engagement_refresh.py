@@ -0,0 +1,316 @@
+"""
+Re-poll engagement stats for recent, high-potential inspirations.
+
+sourceMeta likes/views/comments are captured at insert time; this job
+keeps them moving for items young enough to still be gaining traction. Every refresh also
+appends an engagement snapshot, so rescoring can weigh how fast an item
+is gaining engagement (see engagement_history.py).
+Candidates are ranked per platform by score decayed with age, and each
+item is due again after `min_interval_hours * (1 + age in days)`, so new
+items refresh several times a day and week-old ones every couple of days.
+Items older than `max_age_days` drop out. Each platform gets a request
+budget per run, calls are spaced to its rate limit, and refreshed stats
+and scores are written back in bulk.
+
+Usage:
+    python engagement_refresh.py [--max-items 200] [--dry-run]
+"""
+import argparse
+import json
+import logging
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+from psycopg2.extras import execute_values
+
+import http_client
+from database import get_db_connection
+from engagement_history import SnapshotPolicy, record_snapshots, snapshot_row
+from inspiration import Inspiration
+from score_features import store_features
+from scoring_optimized import OptimizedScoring
+
+logger = logging.getLogger(__name__)
+
+@dataclass
+class RefreshSource:
+    """How to re-fetch one platform's stats"""
+    platform: str
+    credential_env: str
+    url_template: str  # Formatted with the item ID and credential
+    id_pattern: str  # Pulls the item ID out of contentUrl
+    stats: Callable[[Dict[str, Any]], Dict[str, int]]  # API response -> likes/views/comments
+
+    def configured(self) -> bool:
+        return bool(os.environ.get(self.credential_env))
+
+    def url(self, item_id: str) -> str:
+        return self.url_template.format(id=item_id, credential=os.environ[self.credential_env])
+
+def _behance_stats(data: Dict[str, Any]) -> Dict[str, int]:
+    stats = data.get('project', {}).get('stats', {})
+    return {'likes': stats.get('appreciations', 0), 'views': stats.get('views', 0),
+            'comments': stats.get('comments', 0)}
+
+def _dribbble_stats(shot: Dict[str, Any]) -> Dict[str, int]:
+    return {'likes': shot.get('likes_count', 0), 'views': shot.get('views_count', 0),
+            'comments': shot.get('comments_count', 0)}
+
+SOURCES: Dict[str, RefreshSource] = {
+    'Behance': RefreshSource('Behance', 'BEHANCE_API_KEY',
+                             'https://api.behance.net/v2/projects/{id}?api_key={credential}',
+                             r'/gallery/(\d+)', _behance_stats),
+    'Dribbble': RefreshSource('Dribbble', 'DRIBBBLE_ACCESS_TOKEN',
+                              'https://api.dribbble.com/v2/shots/{id}?access_token={credential}',
+                              r'/shots/(\d+)', _dribbble_stats),
+}
+
+@dataclass
+class RefreshConfig:
+    max_age_days: int = 14
+    min_interval_hours: float = 6.0
+    age_decay: float = 1.5  # priority = score / (1 + age_days) ** age_decay
+    max_items_per_platform: int = 200  # Request budget per run
+    requests_per_minute: float = 60.0  # Per platform
+    batch_size: int = 50  # Rows per bulk UPDATE
+
+    @classmethod
+    def from_env(cls) -> 'RefreshConfig':
+        return cls(
+            max_age_days=int(os.environ.get('REFRESH_MAX_AGE_DAYS', '14')),
+            min_interval_hours=float(os.environ.get('REFRESH_MIN_INTERVAL_HOURS', '6')),
+            max_items_per_platform=int(os.environ.get('REFRESH_MAX_ITEMS', '200')),
+            requests_per_minute=float(os.environ.get('REFRESH_REQUESTS_PER_MINUTE', '60'))
+        )
+
+@dataclass
+class RefreshResult:
+    candidates: int = 0
+    refreshed: int = 0
+    skipped: int = 0  # Gone upstream or no ID in the URL
+    failed: int = 0
+    score_changes: int = 0
+    duration: float = 0.0
+    per_platform: Dict[str, int] = field(default_factory=dict)
+
+class RateLimiter:
+    """Spaces calls at least 60/requests_per_minute seconds apart"""
+
+    def __init__(self, requests_per_minute: float):
+        self.interval = 60.0 / requests_per_minute
+        self._next = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self):
+        with self._lock:
+            now = time.monotonic()
+            delay = self._next - now
+            self._next = max(now, self._next) + self.interval
+        if delay > 0:
+            time.sleep(delay)
+
+def select_candidates(cursor, platforms: List[str], config: RefreshConfig) -> List[Dict[str, Any]]:
+    """Due items per platform, highest priority first, within each platform's budget"""
+    cursor.execute("""
+        SELECT id, platform, "contentUrl", "thumbnailUrl", "publishedAt", tags, "sourceMeta", score
+        FROM (
+            SELECT *, ROW_NUMBER() OVER (PARTITION BY platform ORDER BY priority DESC) AS rank
+            FROM (
+                SELECT i.*, age_days,
+                       i.score / power(1 + age_days, %(decay)s) AS priority
+                FROM inspirations i,
+                     LATERAL (SELECT GREATEST(EXTRACT(EPOCH FROM (NOW() - i."publishedAt")) / 86400, 0)
+                              AS age_days) age
+                WHERE i.archived = false
+                  AND i.platform = ANY(%(platforms)s)
+                  AND i."publishedAt" >= NOW() - make_interval(days => %(max_age)s)
+            ) scored
+            WHERE ("sourceMeta"->>'refreshedAt') IS NULL
+               OR ("sourceMeta"->>'refreshedAt')::timestamptz
+                  <= NOW() - make_interval(secs => %(interval)s * (1 + age_days))
+        ) ranked
+        WHERE rank <= %(budget)s
+        ORDER BY platform, rank
+    """, {
+        'decay': config.age_decay, 'platforms': platforms, 'max_age': config.max_age_days,
+        'interval': config.min_interval_hours * 3600, 'budget': config.max_items_per_platform,
+    })
+    columns = [c[0] for c in cursor.description]
+    return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+def _item_id(source: RefreshSource, item: Dict[str, Any]) -> Optional[str]:
+    known = (item.get('sourceMeta') or {}).get('id')
+    if known:
+        return str(known)
+    match = re.search(source.id_pattern, item['contentUrl'] or '')
+    return match.group(1) if match else None
+
+def _fetch(source: RefreshSource, item: Dict[str, Any], limiter: RateLimiter) -> Dict[str, Any]:
+    """New sourceMeta fields for an item; raises if the request failed"""
+    refreshed_at = datetime.now(timezone.utc).isoformat()
+    item_id = _item_id(source, item)
+    if item_id is None:
+        return {'refreshedAt': refreshed_at, 'refreshError': 'no_id'}
+
+    limiter.wait()
+    response = http_client.get(source.url(item_id))
+    if response.status_code == 404:
+        return {'refreshedAt': refreshed_at, 'refreshError': 'not_found'}
+    response.raise_for_status()
+    return {**source.stats(response.json()), 'id': item_id, 'refreshedAt': refreshed_at,
+            'refreshError': None}
+
+def _write_batch(cursor, updates: List[Dict[str, Any]], window_hours: float) -> int:
+    """
+    Snapshot refreshed stats, rescore with the resulting velocity, and merge
+    the stats and scores back; returns the number of score changes
+    """
+    refreshed = [u for u in updates if not u['meta'].get('refreshError')]
+    record_snapshots(cursor, (snapshot_row(u['item']['id'], u['item']['sourceMeta']) for u in refreshed))
+
+    scorer = OptimizedScoring()
+    records = [Inspiration.from_dict(u['item']) for u in refreshed]
+    scorer.attach_velocities(cursor, records, window_hours)
+    features = []
+    for u, record in zip(refreshed, records):
+        components = scorer.score_components(record)
+        features.append((record.id, components))
+        u['score'] = scorer.weights.combine(components)
+
+    execute_values(cursor, """
+        UPDATE inspirations AS i
+        SET "sourceMeta" = COALESCE(i."sourceMeta", '{}'::jsonb) || v.meta::jsonb,
+            score = v.score,
+            "updatedAt" = CURRENT_TIMESTAMP
+        FROM (VALUES %s) AS v(id, meta, score)
+        WHERE i.id = v.id
+    """, [(u['item']['id'], json.dumps(u['meta']), u['score']) for u in updates])
+    store_features(cursor, features)
+
+    changed = [(u['item']['id'], u['item']['platform'], u['score'])
+               for u in updates if u['score'] != u['old_score']]
+    if changed:
+        from curation_candidates import note_score_changes
+        note_score_changes(cursor, changed)
+    return len(changed)
+
+def _refresh_platform(source: RefreshSource, items: List[Dict[str, Any]],
+                      config: RefreshConfig, dry_run: bool, result: RefreshResult,
+                      result_lock: threading.Lock):
+    limiter = RateLimiter(config.requests_per_minute)
+    window_hours = SnapshotPolicy.from_env().velocity_window_hours
+    conn = None if dry_run else get_db_connection()
+    pending: List[Dict[str, Any]] = []
+
+    def flush():
+        if not pending or conn is None:
+            pending.clear()
+            return
+        cursor = conn.cursor()
+        try:
+            changes = _write_batch(cursor, pending, window_hours)
+            conn.commit()
+            with result_lock:
+                result.score_changes += changes
+        except Exception as e:
+            conn.rollback()
+            logger.error(f"{source.platform} refresh batch of {len(pending)} failed: {e}")
+        finally:
+            cursor.close()
+            pending.clear()
+
+    try:
+        for item in items:
+            try:
+                meta = _fetch(source, item, limiter)
+            except Exception as e:
+                logger.debug(f"{source.platform} refresh failed for {item['id']}: {e}")
+                with result_lock:
+                    result.failed += 1
+                # Stamp the attempt so the item backs off for the usual interval
+                meta = {'refreshedAt': datetime.now(timezone.utc).isoformat(),
+                        'refreshError': 'fetch_failed'}
+            else:
+                with result_lock:
+                    if meta.get('refreshError'):
+                        result.skipped += 1
+                    else:
+                        result.refreshed += 1
+                        result.per_platform[source.platform] = result.per_platform.get(source.platform, 0) + 1
+
+            merged = {**item, 'sourceMeta': {**(item['sourceMeta'] or {}), **meta}}
+            pending.append({'item': merged, 'meta': meta, 'score': item['score'],
+                            'old_score': item['score']})
+            if len(pending) >= config.batch_size:
+                flush()
+        flush()
+    finally:
+        if conn is not None:
+            conn.close()
+
+def refresh_engagement(config: Optional[RefreshConfig] = None, dry_run: bool = False) -> RefreshResult:
+    """Refresh stats for due items on every configured platform"""
+    config = config or RefreshConfig.from_env()
+    started = time.time()
+    result = RefreshResult()
+    platforms = [name for name, source in SOURCES.items() if source.configured()]
+    if not platforms:
+        logger.info("No platform credentials configured, skipping engagement refresh")
+        return result
+
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    try:
+        candidates = select_candidates(cursor, platforms, config)
+        conn.commit()
+    finally:
+        cursor.close()
+        conn.close()
+    result.candidates = len(candidates)
+
+    by_platform: Dict[str, List[Dict[str, Any]]] = {}
+    for item in candidates:
+        by_platform.setdefault(item['platform'], []).append(item)
+
+    # Platforms have separate rate limits, so they refresh in parallel
+    result_lock = threading.Lock()
+    with ThreadPoolExecutor(max_workers=max(len(by_platform), 1)) as executor:
+        futures = {
+            platform: executor.submit(_refresh_platform, SOURCES[platform], items, config,
+                                      dry_run, result, result_lock)
+            for platform, items in by_platform.items()
+        }
+    for platform, future in futures.items():
+        if future.exception() is not None:
+            logger.error(f"{platform} engagement refresh failed: {future.exception()}")
+
+    result.duration = time.time() - started
+    logger.info(f"Engagement refresh: {result.refreshed}/{result.candidates} refreshed, "
+                f"{result.score_changes} score changes, {result.failed} failed, "
+                f"{result.skipped} skipped in {result.duration:.1f}s")
+    return result
+
+def main():
+    parser = argparse.ArgumentParser(description='Refresh engagement stats for recent items')
+    parser.add_argument('--max-items', type=int, help='Per-platform request budget')
+    parser.add_argument('--dry-run', action='store_true', help='Fetch stats without writing')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+    from dotenv import load_dotenv
+    load_dotenv()
+
+    config = RefreshConfig.from_env()
+    if args.max_items:
+        config.max_items_per_platform = args.max_items
+    print(json.dumps(asdict(refresh_engagement(config, dry_run=args.dry_run)), indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Shared HTTP session for the platform scrapers.
+
+Every scraper goes through get() so connections (and TLS handshakes) are
+reused across pages, platforms and, in the worker, across jobs. Requests
+that fail with a network error, 429 or 5xx are retried with backoff, and
+a per-host circuit breaker stops calls to a host that keeps failing.
+Every attempt is recorded in http_metrics.
+"""
+import threading
+import time
+from typing import Optional
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+import http_metrics
+from retry import RetryPolicy, call_with_retry, get_breaker
+
+DEFAULT_TIMEOUT = 10  # seconds
+DEFAULT_RETRY_POLICY = RetryPolicy(max_attempts=3, base_delay=1.0, max_delay=30.0)
+
+_session = None
+_session_lock = threading.Lock()
+
+def get_session() -> requests.Session:
+    """Process-wide session with a connection pool per host"""
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=10, pool_maxsize=10)
+            _session.mount('https://', adapter)
+            _session.mount('http://', adapter)
+        return _session
+
+def get(url: str, retry_policy: Optional[RetryPolicy] = None, **kwargs) -> requests.Response:
+    """
+    GET through the shared session with a default timeout. 429 and 5xx
+    responses raise HTTPError once retries are exhausted; other statuses
+    are returned for the caller to check.
+    """
+    kwargs.setdefault('timeout', DEFAULT_TIMEOUT)
+    host = urlsplit(url).hostname or url
+
+    def attempt() -> requests.Response:
+        started = time.perf_counter()
+        try:
+            response = get_session().get(url, **kwargs)
+        except Exception as e:
+            http_metrics.record_error(host, (time.perf_counter() - started) * 1000, e)
+            raise
+        # Body is already read (no streaming), so len(content) is free
+        http_metrics.record_response(host, (time.perf_counter() - started) * 1000,
+                                     response.status_code, len(response.content))
+        if response.status_code == 429 or response.status_code >= 500:
+            response.raise_for_status()
+        return response
+
+    return call_with_retry(attempt, retry_policy or DEFAULT_RETRY_POLICY,
+                           breaker=get_breaker(host), description=f"GET {host}",
+                           on_retry=lambda *_: http_metrics.record_retry(host))
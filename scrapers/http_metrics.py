@@ -0,0 +1,110 @@
+"""
+Per-host HTTP metrics for the shared scraper session.
+
+Latencies go into fixed log-spaced histogram buckets, so recording a
+request is a bisect and a few integer increments and memory does not grow
+with traffic. Percentiles are estimated from the buckets. Every request is
+recorded twice: into totals kept since process start (snapshot(), for
+/metrics) and into a per-run table that drain() hands to run history and
+resets.
+"""
+import bisect
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+# Bucket upper bounds in milliseconds: 1ms .. ~2min, ~19% apart
+BUCKET_BOUNDS_MS: List[float] = [round(1.19 ** i, 2) for i in range(0, 68)]
+
+class LatencyHistogram:
+    def __init__(self):
+        self.counts = [0] * (len(BUCKET_BOUNDS_MS) + 1)  # Last bucket is overflow
+        self.total = 0
+        self.sum_ms = 0.0
+        self.max_ms = 0.0
+
+    def record(self, latency_ms: float):
+        self.counts[bisect.bisect_left(BUCKET_BOUNDS_MS, latency_ms)] += 1
+        self.total += 1
+        self.sum_ms += latency_ms
+        self.max_ms = max(self.max_ms, latency_ms)
+
+    def percentile(self, q: float) -> Optional[float]:
+        """Upper bound of the bucket holding the q-th percentile (capped at max)"""
+        if not self.total:
+            return None
+        rank = q * self.total
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank and count:
+                bound = BUCKET_BOUNDS_MS[index] if index < len(BUCKET_BOUNDS_MS) else self.max_ms
+                return min(bound, self.max_ms)
+        return self.max_ms
+
+class HostMetrics:
+    def __init__(self):
+        self.latency = LatencyHistogram()
+        self.status_counts: Dict[str, int] = {}
+        self.errors: Dict[str, int] = {}  # Exceptions without a response, by type
+        self.retries = 0
+        self.bytes_received = 0
+
+    def snapshot(self) -> Dict[str, Any]:
+        latency = self.latency
+        return {
+            'requests': latency.total,
+            'p50_ms': latency.percentile(0.50),
+            'p95_ms': latency.percentile(0.95),
+            'p99_ms': latency.percentile(0.99),
+            'max_ms': round(latency.max_ms, 1),
+            'mean_ms': round(latency.sum_ms / latency.total, 1) if latency.total else None,
+            'status_counts': dict(self.status_counts),
+            'errors': dict(self.errors),
+            'retries': self.retries,
+            'bytes_received': self.bytes_received,
+        }
+
+_totals: Dict[str, HostMetrics] = {}  # Since process start; never reset
+_hosts: Dict[str, HostMetrics] = {}  # Since the last drain()
+_lock = threading.Lock()
+
+def _host(host: str) -> Tuple[HostMetrics, HostMetrics]:
+    metrics = _hosts.get(host)
+    if metrics is None:
+        metrics = _hosts[host] = HostMetrics()
+    total = _totals.get(host)
+    if total is None:
+        total = _totals[host] = HostMetrics()
+    return metrics, total
+
+def record_response(host: str, latency_ms: float, status: int, size: int):
+    key = str(status)
+    with _lock:
+        for metrics in _host(host):
+            metrics.latency.record(latency_ms)
+            metrics.status_counts[key] = metrics.status_counts.get(key, 0) + 1
+            metrics.bytes_received += size
+
+def record_error(host: str, latency_ms: float, error: BaseException):
+    key = type(error).__name__
+    with _lock:
+        for metrics in _host(host):
+            metrics.latency.record(latency_ms)
+            metrics.errors[key] = metrics.errors.get(key, 0) + 1
+
+def record_retry(host: str):
+    with _lock:
+        for metrics in _host(host):
+            metrics.retries += 1
+
+def snapshot() -> Dict[str, Dict[str, Any]]:
+    """Metrics per host since process start (monotonic counters)"""
+    with _lock:
+        return {host: metrics.snapshot() for host, metrics in _totals.items()}
+
+def drain() -> Dict[str, Dict[str, Any]]:
+    """Metrics per host since the last drain, then start over (one run's worth); totals are kept"""
+    with _lock:
+        data = {host: metrics.snapshot() for host, metrics in _hosts.items()}
+        _hosts.clear()
+    return data
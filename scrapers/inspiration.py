@@ -0,0 +1,106 @@
+"""
+Typed inspiration record passed from the parsers through scoring and saving.
+
+Inspiration is a slotted dataclass: attributes live in fixed slots rather
+than a per-item __dict__, and the engagement counts that scoring reads are
+plain int attributes instead of lookups in a nested sourceMeta dict. Each
+platform parser builds records in one place; dicts in the scraper shape
+(camelCase keys, bulk imports, older callers) go through from_dict().
+"""
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+# sourceMeta keys held as attributes (id as source_id); anything else stays in extra_meta
+ENGAGEMENT_FIELDS = ('likes', 'views', 'comments', 'saves')
+_SLOTTED_META = ENGAGEMENT_FIELDS + ('id',)
+
+def _count(value: Any) -> int:
+    try:
+        return int(value or 0)
+    except (TypeError, ValueError):
+        return 0
+
+@dataclass(slots=True)
+class Inspiration:
+    title: str
+    content_url: str
+    platform: str
+    description: Optional[str] = None
+    thumbnail_url: Optional[str] = None
+    author_name: Optional[str] = None
+    author_url: Optional[str] = None
+    tags: List[str] = field(default_factory=list)
+    published_at: Optional[datetime] = None
+    likes: int = 0
+    views: int = 0
+    comments: int = 0
+    saves: int = 0
+    source_id: Any = None  # The platform's own id, used by the engagement refresh
+    extra_meta: Optional[Dict[str, Any]] = None  # Other sourceMeta keys (refreshedAt, refreshError, ...)
+    score: float = 50.0
+    id: Optional[str] = None  # Set once the row exists
+    velocity: Optional[Dict[str, float]] = None  # Engagement per hour (attach_velocities)
+
+    @property
+    def source_meta(self) -> Dict[str, Any]:
+        """The sourceMeta JSON; saves only when known, as most platforms lack it"""
+        meta = dict(self.extra_meta) if self.extra_meta else {}
+        if self.source_id is not None:
+            meta['id'] = self.source_id
+        meta['likes'] = self.likes
+        meta['views'] = self.views
+        meta['comments'] = self.comments
+        if self.saves:
+            meta['saves'] = self.saves
+        return meta
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'Inspiration':
+        """Record from a dict with the inspirations column names"""
+        meta = data.get('sourceMeta') or {}
+        extra = {k: v for k, v in meta.items() if k not in _SLOTTED_META}
+        return cls(
+            title=data.get('title'),
+            content_url=data.get('contentUrl'),
+            platform=data.get('platform') or '',
+            description=data.get('description'),
+            thumbnail_url=data.get('thumbnailUrl'),
+            author_name=data.get('authorName'),
+            author_url=data.get('authorUrl'),
+            tags=data.get('tags') or [],
+            published_at=data.get('publishedAt'),
+            likes=_count(meta.get('likes')),
+            views=_count(meta.get('views')),
+            comments=_count(meta.get('comments')),
+            saves=_count(meta.get('saves')),
+            source_id=meta.get('id'),
+            extra_meta=extra or None,
+            score=data.get('score', 50.0),
+            id=data.get('id'),
+            velocity=data.get('velocity'),
+        )
+
+    @classmethod
+    def from_row(cls, row: Tuple) -> 'Inspiration':
+        """
+        Record from (id, title, description, thumbnailUrl, contentUrl, platform,
+        authorName, authorUrl, tags, publishedAt, sourceMeta), as the rescoring
+        queries select it
+        """
+        meta = row[10] or {}
+        extra = {k: v for k, v in meta.items() if k not in _SLOTTED_META}
+        return cls(
+            id=row[0], title=row[1], description=row[2], thumbnail_url=row[3], content_url=row[4],
+            platform=row[5], author_name=row[6], author_url=row[7], tags=row[8] or [],
+            published_at=row[9], likes=_count(meta.get('likes')), views=_count(meta.get('views')),
+            comments=_count(meta.get('comments')), saves=_count(meta.get('saves')),
+            source_id=meta.get('id'), extra_meta=extra or None,
+        )
+
+    def as_candidate(self) -> Tuple:
+        """(id, score, platform, authorName, publishedAt, tags), the curator's candidate shape"""
+        return (self.id, self.score, self.platform, self.author_name, self.published_at, self.tags)
+
+def as_record(item: Union[Inspiration, Dict[str, Any]]) -> Inspiration:
+    return item if isinstance(item, Inspiration) else Inspiration.from_dict(item)
@@ -0,0 +1,210 @@
+"""
+Event-driven job scheduler for the scheduler and worker loops.
+
+Jobs sit in a heap ordered by their next due time. The loop sleeps on an
+Event until exactly the next due job, and wake() (e.g. from a signal
+handler) interrupts the sleep at once. Jobs run inline on the loop's
+thread unless given a `lane`, in which case they run on that lane's own
+single-thread executor, so a health check never waits behind a scrape.
+A job whose previous run is still going is skipped rather than stacked.
+"""
+import heapq
+import itertools
+import logging
+import re
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+# Upper bound on one sleep, so wall-clock jumps (NTP, suspend) are noticed
+MAX_WAIT_SECONDS = 300.0
+
+class Every:
+    """Run every `seconds`, first after one interval (or immediately)"""
+
+    def __init__(self, seconds: float, immediately: bool = False):
+        if seconds <= 0:
+            raise ValueError("interval must be positive")
+        self.seconds = seconds
+        self.immediately = immediately
+
+    def first_run(self, now: float) -> float:
+        return now if self.immediately else now + self.seconds
+
+    def next_run(self, last_due: float, now: float) -> float:
+        # Keep the cadence steady, but don't replay runs missed while busy
+        due = last_due + self.seconds
+        return due if due > now else now + self.seconds
+
+    def __repr__(self):
+        return f"every {self.seconds:g}s"
+
+class DailyAt:
+    """Run at HH:MM local time every day"""
+
+    def __init__(self, at: str):
+        hour, minute = (int(part) for part in at.split(':'))
+        if not (0 <= hour <= 23 and 0 <= minute <= 59):
+            raise ValueError(f"invalid time of day: {at}")
+        self.hour, self.minute = hour, minute
+
+    def first_run(self, now: float) -> float:
+        return self.next_run(now, now)
+
+    def next_run(self, last_due: float, now: float) -> float:
+        current = datetime.fromtimestamp(now)
+        due = current.replace(hour=self.hour, minute=self.minute, second=0, microsecond=0)
+        if due <= current:
+            due += timedelta(days=1)
+        return due.timestamp()
+
+    def __repr__(self):
+        return f"daily at {self.hour:02d}:{self.minute:02d}"
+
+Cadence = Union[Every, DailyAt]
+
+_DURATION = re.compile(r'^(\d+(?:\.\d+)?)\s*([smhd])$')
+_UNIT_SECONDS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+
+def parse_duration(spec: str) -> float:
+    """'6h' / '30m' / '90s' / '1d' -> seconds"""
+    match = _DURATION.match(spec.strip().lower())
+    if not match:
+        raise ValueError(f"invalid duration: {spec!r} (use e.g. 6h, 30m)")
+    return float(match.group(1)) * _UNIT_SECONDS[match.group(2)]
+
+def parse_cadence(spec: str) -> Cadence:
+    """'03:00' -> DailyAt, '6h' / '30m' / '90s' / '1d' -> Every"""
+    spec = spec.strip().lower()
+    if ':' in spec:
+        return DailyAt(spec)
+    return Every(parse_duration(spec))
+
+@dataclass
+class ScheduledJob:
+    name: str
+    func: Callable[[], object]
+    cadence: Cadence
+    lane: Optional[str] = None  # None runs inline on the loop thread
+    next_due: float = 0.0
+    last_run: Optional[float] = None
+    runs: int = 0
+    skipped: int = 0
+    _future: Optional[Future] = field(default=None, repr=False)
+
+@dataclass(order=True)
+class _Entry:
+    due: float
+    seq: int
+    job: ScheduledJob = field(compare=False)
+
+class JobScheduler:
+    def __init__(self):
+        self._heap: List[_Entry] = []
+        self._seq = itertools.count()
+        self._jobs: Dict[str, ScheduledJob] = {}
+        self._lanes: Dict[str, ThreadPoolExecutor] = {}
+        self._wakeup = threading.Event()
+        self._lock = threading.Lock()
+
+    def add(self, name: str, func: Callable[[], object], cadence: Cadence,
+            lane: Optional[str] = None) -> ScheduledJob:
+        """Register a job; a job with the same name is replaced"""
+        job = ScheduledJob(name, func, cadence, lane)
+        job.next_due = cadence.first_run(time.time())
+        with self._lock:
+            if name in self._jobs:
+                self._heap = [e for e in self._heap if e.job.name != name]
+                heapq.heapify(self._heap)
+            self._jobs[name] = job
+            heapq.heappush(self._heap, _Entry(job.next_due, next(self._seq), job))
+        self.wake()  # The new job may be due before the current sleep ends
+        return job
+
+    def remove(self, name: str):
+        with self._lock:
+            self._jobs.pop(name, None)
+            self._heap = [e for e in self._heap if e.job.name != name]
+            heapq.heapify(self._heap)
+
+    def jobs(self) -> List[ScheduledJob]:
+        with self._lock:
+            return sorted(self._jobs.values(), key=lambda job: job.next_due)
+
+    def seconds_until_next(self) -> Optional[float]:
+        with self._lock:
+            if not self._heap:
+                return None
+            return max(0.0, self._heap[0].due - time.time())
+
+    def next_run(self) -> Optional[datetime]:
+        with self._lock:
+            return datetime.fromtimestamp(self._heap[0].due) if self._heap else None
+
+    def run_pending(self) -> int:
+        """Start every job that is due; returns how many were started"""
+        started = 0
+        while True:
+            now = time.time()
+            with self._lock:
+                if not self._heap or self._heap[0].due > now:
+                    return started
+                entry = heapq.heappop(self._heap)
+                job = entry.job
+                if self._jobs.get(job.name) is not job:
+                    continue  # Removed or replaced
+                job.next_due = job.cadence.next_run(entry.due, now)
+                heapq.heappush(self._heap, _Entry(job.next_due, next(self._seq), job))
+            if self._dispatch(job):
+                started += 1
+
+    def _dispatch(self, job: ScheduledJob) -> bool:
+        if job._future is not None and not job._future.done():
+            job.skipped += 1
+            logger.warning(f"Skipping {job.name}: previous run still in progress")
+            return False
+        job.last_run = time.time()
+        job.runs += 1
+        if job.lane is None:
+            self._run(job)
+        else:
+            lane = self._lanes.get(job.lane)
+            if lane is None:
+                lane = self._lanes[job.lane] = ThreadPoolExecutor(
+                    max_workers=1, thread_name_prefix=f"jobs-{job.lane}")
+            job._future = lane.submit(self._run, job)
+        return True
+
+    def _run(self, job: ScheduledJob):
+        try:
+            job.func()
+        except Exception as e:
+            logger.error(f"Scheduled job {job.name} failed: {e}")
+
+    def wait(self, max_wait: Optional[float] = None) -> bool:
+        """
+        Sleep until the next job is due, wake() is called or `max_wait`
+        passes. Returns True if woken early.
+        """
+        timeout = self.seconds_until_next()
+        if timeout is None:
+            timeout = MAX_WAIT_SECONDS
+        timeout = min(timeout, max_wait if max_wait is not None else MAX_WAIT_SECONDS)
+        woken = self._wakeup.wait(timeout)
+        self._wakeup.clear()
+        return woken
+
+    def wake(self):
+        """Interrupt wait(), e.g. on shutdown or when new work arrives"""
+        self._wakeup.set()
+
+    def shutdown(self, wait: bool = True):
+        """Stop lane executors, dropping queued runs"""
+        for lane in self._lanes.values():
+            lane.shutdown(wait=wait, cancel_futures=True)
+        self._lanes.clear()
@@ -0,0 +1,178 @@
+"""
+Non-blocking logging for the scheduler, worker and CLI runs.
+
+Records go through a QueueHandler so scraper threads never wait on disk
+or stdout; a QueueListener thread writes them out. The log file holds
+one JSON object per line and rotates at midnight, keeping
+`retention_days` old files. Hot loops use ItemLogSummary to log one
+summary per batch instead of a line per item. Worker processes send
+their records back over a multiprocessing queue (process_log_queue and
+init_process_logging) to the same handlers.
+"""
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+import threading
+import time
+import weakref
+from collections import Counter
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Optional
+
+TEXT_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+# Attributes every LogRecord has; anything else was passed via `extra=`
+_STANDARD_ATTRS = set(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime'}
+
+_listener: Optional[logging.handlers.QueueListener] = None
+_handlers: list = []  # Output handlers shared by both listeners
+_process_queue: Optional[Any] = None
+_process_listener: Optional[logging.handlers.QueueListener] = None
+_setup_lock = threading.Lock()
+_summaries: 'weakref.WeakSet[ItemLogSummary]' = weakref.WeakSet()
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per record, including `extra=` fields"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'ts': datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+            'thread': record.threadName,
+        }
+        for key, value in vars(record).items():
+            if key not in _STANDARD_ATTRS and not key.startswith('_'):
+                entry[key] = value
+        if record.exc_info:
+            entry['exc_info'] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+def setup_logging(log_file: Optional[str] = None, retention_days: int = 7,
+                  level: Optional[str] = None) -> Optional[logging.handlers.QueueListener]:
+    """
+    Route the root logger through a queue to stdout and, if given, a
+    JSON log file rotated daily. LOG_LEVEL sets the level and
+    LOG_FORMAT=json switches stdout to JSON too. Safe to call twice.
+    """
+    global _listener
+    with _setup_lock:
+        if _listener is not None:
+            return _listener
+
+        console = logging.StreamHandler(sys.stdout)
+        console.setFormatter(JsonFormatter() if os.environ.get('LOG_FORMAT') == 'json'
+                             else logging.Formatter(TEXT_FORMAT))
+        handlers = [console]
+
+        if log_file:
+            Path(log_file).parent.mkdir(parents=True, exist_ok=True)
+            file_handler = logging.handlers.TimedRotatingFileHandler(
+                log_file, when='midnight', backupCount=max(retention_days, 1),
+                encoding='utf-8', utc=True
+            )
+            file_handler.setFormatter(JsonFormatter())
+            handlers.append(file_handler)
+
+        _handlers[:] = handlers
+        log_queue: queue.Queue = queue.Queue(-1)
+        root = logging.getLogger()
+        for handler in list(root.handlers):
+            root.removeHandler(handler)
+        root.addHandler(logging.handlers.QueueHandler(log_queue))
+        root.setLevel((level or os.environ.get('LOG_LEVEL', 'INFO')).upper())
+
+        _listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+        _listener.start()
+        atexit.register(stop_logging)
+        return _listener
+
+def process_log_queue(context) -> Optional[Any]:
+    """
+    Queue (from the multiprocessing `context`) for worker processes'
+    records, written out by setup_logging's handlers. None without
+    setup_logging; workers then log to stderr.
+    """
+    global _process_queue, _process_listener
+    with _setup_lock:
+        if _listener is None:
+            return None
+        if _process_queue is None:
+            _process_queue = context.Queue(-1)
+            _process_listener = logging.handlers.QueueListener(
+                _process_queue, *_handlers, respect_handler_level=True)
+            _process_listener.start()
+        return _process_queue
+
+def init_process_logging(log_queue: Optional[Any], level: int):
+    """Pool initializer: route a worker process's records to the parent, or to stderr"""
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    if log_queue is not None:
+        root.addHandler(logging.handlers.QueueHandler(log_queue))
+    else:
+        handler = logging.StreamHandler(sys.stderr)
+        handler.setFormatter(logging.Formatter(TEXT_FORMAT))
+        root.addHandler(handler)
+    root.setLevel(level)
+
+def stop_logging():
+    """Flush pending summaries and queued records, then stop the listener threads"""
+    global _listener, _process_queue, _process_listener
+    for summary in list(_summaries):
+        summary.flush()
+    with _setup_lock:
+        if _process_listener is not None:
+            _process_listener.stop()
+            _process_listener = None
+            _process_queue = None
+        if _listener is not None:
+            _listener.stop()
+            _listener = None
+
+class ItemLogSummary:
+    """
+    Counts per-item outcomes and logs them as one line every `every` items
+    or `interval` seconds, e.g. "save_inspiration: 48 saved, 2 existing".
+    """
+
+    def __init__(self, logger: logging.Logger, label: str, every: int = 100,
+                 interval: float = 30.0, level: int = logging.INFO):
+        self.logger = logger
+        self.label = label
+        self.every = every
+        self.interval = interval
+        self.level = level
+        self._counts: Counter = Counter()
+        self._pending = 0
+        self._last_flush = time.monotonic()
+        self._lock = threading.Lock()
+        _summaries.add(self)
+
+    def add(self, outcome: str, count: int = 1):
+        with self._lock:
+            self._counts[outcome] += count
+            self._pending += count
+            due = (self._pending >= self.every
+                   or time.monotonic() - self._last_flush >= self.interval)
+        if due:
+            self.flush()
+
+    def flush(self):
+        with self._lock:
+            if not self._pending:
+                return
+            counts = dict(self._counts)
+            self._counts.clear()
+            self._pending = 0
+            self._last_flush = time.monotonic()
+        summary = ', '.join(f"{count} {outcome}" for outcome, count in counts.items())
+        self.logger.log(self.level, f"{self.label}: {summary}",
+                        extra={'summary': self.label, 'counts': counts})
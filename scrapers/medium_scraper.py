@@ -1,66 +1,65 @@
-import requests
+import http_client
 from bs4 import BeautifulSoup
 import logging
 from datetime import datetime
-from database import save_inspiration
-from scoring import calculate_score
+from inspiration import Inspiration
+from pipeline import PlatformSource, run_source
 
 logger = logging.getLogger(__name__)
 
-def scrape_medium():
-    """Scrape design articles from Medium"""
-    try:
-        # Medium's design tag RSS feed
-        url = "https://medium.com/feed/tag/design"
-        
-        response = requests.get(url, timeout=10)
-        response.raise_for_status()
-        
-        soup = BeautifulSoup(response.content, 'xml')
-        items = soup.find_all('item')[:20]  # Get latest 20 articles
-        
-        for item in items:
+# Medium's design tag RSS feed
+FEED_URL = "https://medium.com/feed/tag/design"
+
+def fetch_medium_page(page):
+    """Fetch the Medium design feed (RSS has a single page)"""
+    response = http_client.get(FEED_URL)
+    response.raise_for_status()
+    return response.content
+
+def parse_medium_page(content):
+    """Parse the RSS feed into inspiration records (runs in the parse process pool)"""
+    soup = BeautifulSoup(content, 'xml')
+    items = []
+    
+    for item in soup.find_all('item')[:20]:  # Get latest 20 articles
+        try:
+            title = item.find('title').text if item.find('title') else 'Untitled'
+            description = item.find('description').text if item.find('description') else ''
+            link = item.find('link').text if item.find('link') else ''
+            pub_date = item.find('pubDate').text if item.find('pubDate') else ''
+            
+            # Parse publication date
             try:
-                title = item.find('title').text if item.find('title') else 'Untitled'
-                description = item.find('description').text if item.find('description') else ''
-                link = item.find('link').text if item.find('link') else ''
-                pub_date = item.find('pubDate').text if item.find('pubDate') else ''
-                
-                # Parse publication date
+                pub_datetime = datetime.strptime(pub_date, '%a, %d %b %Y %H:%M:%S %Z') if pub_date else datetime.now()
+            except ValueError:
+                # Fallback for different date formats
                 try:
-                    pub_datetime = datetime.strptime(pub_date, '%a, %d %b %Y %H:%M:%S %Z') if pub_date else datetime.now()
+                    pub_datetime = datetime.strptime(pub_date, '%a, %d %b %Y %H:%M:%S GMT') if pub_date else datetime.now()
                 except ValueError:
-                    # Fallback for different date formats
-                    try:
-                        pub_datetime = datetime.strptime(pub_date, '%a, %d %b %Y %H:%M:%S GMT') if pub_date else datetime.now()
-                    except ValueError:
-                        pub_datetime = datetime.now()
-                
-                # Extract author from description or use default
-                author = "Medium Author"  # Could be extracted from description HTML
-                
-                inspiration_data = {
-                    'title': title,
-                    'description': description[:500] + '...' if len(description) > 500 else description,
-                    'contentUrl': link,
-                    'platform': 'Medium',
-                    'authorName': author,
-                    'tags': ['Design', 'Article'],
-                    'publishedAt': pub_datetime,
-                    'sourceMeta': {
-                        'likes': 0,  # Not available via RSS
-                        'views': 0,
-                        'comments': 0,
-                    }
-                }
-                
-                inspiration_data['score'] = calculate_score(inspiration_data)
-                save_inspiration(inspiration_data)
-                
-            except Exception as e:
-                logger.error(f"Error processing Medium article: {e}")
-        
-        logger.info(f"Scraped {len(items)} articles from Medium")
-        
-    except Exception as e:
-        logger.error(f"Medium scraping failed: {e}")
\ No newline at end of file
+                    pub_datetime = datetime.now()
+            
+            # Extract author from description or use default
+            author = "Medium Author"  # Could be extracted from description HTML
+            
+            items.append(Inspiration(
+                title=title,
+                description=description[:500] + '...' if len(description) > 500 else description,
+                content_url=link,
+                platform='Medium',
+                author_name=author,
+                tags=['Design', 'Article'],
+                published_at=pub_datetime,  # No engagement stats via RSS
+            ))
+            
+        except Exception as e:
+            logger.error(f"Error processing Medium article: {e}")
+    
+    return items
+
+MEDIUM_SOURCE = PlatformSource('Medium', fetch_medium_page, parse_medium_page, cpu_bound=True)
+
+def scrape_medium(**pipeline_options):
+    """Scrape design articles from Medium"""
+    result = run_source(MEDIUM_SOURCE, **pipeline_options)
+    logger.info(f"Scraped {result.items_parsed} articles from Medium")
+    return result
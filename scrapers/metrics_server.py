@@ -0,0 +1,254 @@
+"""
+Prometheus /metrics and JSON /healthz endpoint for the scheduler and worker.
+
+Stdlib only: a ThreadingHTTPServer on a daemon thread. Counters are kept
+in-process since start (Prometheus handles resets); gauges such as pool
+usage, pipeline queue depths and circuit breakers are read at scrape time.
+Database queue depths are cached briefly so scrapes stay cheap.
+"""
+import json
+import logging
+import threading
+import time
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import http_metrics
+from database import get_db_connection, get_pool_stats
+from pipeline import ACTIVE_PIPELINES
+from retry import breaker_states
+
+logger = logging.getLogger(__name__)
+
+PREFIX = 'lyinspire_'
+QUEUE_CACHE_SECONDS = 30
+BREAKER_STATES = ('closed', 'half_open', 'open')
+
+_lock = threading.Lock()
+_started_at = time.time()
+_items_ingested: Dict[str, int] = {}
+_scraper_runs: Dict[Tuple[str, str], int] = {}  # (platform, success|failure)
+_scraper_seconds: Dict[str, float] = {}
+_runs: Dict[str, int] = {}
+_last_run_seconds: Optional[float] = None
+_last_run_finished_at: Optional[float] = None
+_last_curation_at: Optional[float] = None
+
+_queue_cache: Tuple[float, List[Tuple[str, str, int]]] = (0.0, [])
+
+def record_scraper_results(results: Iterable[Any]):
+    """Count items and durations from ScraperResults"""
+    with _lock:
+        for r in results:
+            _items_ingested[r.platform] = _items_ingested.get(r.platform, 0) + r.items_scraped
+            key = (r.platform, 'success' if r.success else 'failure')
+            _scraper_runs[key] = _scraper_runs.get(key, 0) + 1
+            _scraper_seconds[r.platform] = _scraper_seconds.get(r.platform, 0.0) + r.duration
+
+def record_run(duration: float, success: bool):
+    global _last_run_seconds, _last_run_finished_at
+    with _lock:
+        status = 'success' if success else 'failure'
+        _runs[status] = _runs.get(status, 0) + 1
+        _last_run_seconds = duration
+        _last_run_finished_at = time.time()
+
+def record_curation(success: bool):
+    global _last_curation_at
+    if success:
+        with _lock:
+            _last_curation_at = time.time()
+
+def _load_last_curation():
+    """Seed the curation timestamp from the database after a restart"""
+    global _last_curation_at
+    try:
+        conn = get_db_connection()
+        try:
+            cursor = conn.cursor()
+            cursor.execute('SELECT EXTRACT(EPOCH FROM MAX("updatedAt")) FROM daily_curations')
+            row = cursor.fetchone()
+            cursor.close()
+        finally:
+            conn.close()
+    except Exception as e:
+        logger.warning(f"Could not load last curation time: {e}")
+        return
+    if row and row[0] is not None:
+        with _lock:
+            _last_curation_at = max(_last_curation_at or 0.0, float(row[0]))
+
+def _queue_depths() -> List[Tuple[str, str, int]]:
+    """(queue, status, count) for the job and task queues, cached"""
+    global _queue_cache
+    cached_at, rows = _queue_cache
+    if time.monotonic() - cached_at < QUEUE_CACHE_SECONDS:
+        return rows
+    try:
+        conn = get_db_connection()
+        try:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT 'scraper_jobs', status, COUNT(*) FROM scraper_jobs
+                WHERE status IN ('queued', 'running') GROUP BY status
+                UNION ALL
+                SELECT 'scrape_tasks', status, COUNT(*) FROM scrape_tasks
+                WHERE "runDate" = CURRENT_DATE AND status IN ('pending', 'leased') GROUP BY status
+            """)
+            rows = cursor.fetchall()
+            conn.commit()
+            cursor.close()
+        finally:
+            conn.close()
+    except Exception as e:
+        logger.debug(f"Queue depth query failed: {e}")
+        rows = []
+    _queue_cache = (time.monotonic(), rows)
+    return rows
+
+def _escape(value: Any) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def _labels(**labels) -> str:
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{key}="{_escape(value)}"' for key, value in labels.items()) + '}'
+
+class _Exposition:
+    """Builds Prometheus text format, one HELP/TYPE header per family"""
+
+    def __init__(self):
+        self.lines: List[str] = []
+
+    def family(self, name: str, kind: str, help_text: str,
+               samples: Iterable[Tuple[Dict[str, Any], Optional[float]]]):
+        samples = [(labels, value) for labels, value in samples if value is not None]
+        if not samples:
+            return
+        self.lines.append(f"# HELP {PREFIX}{name} {help_text}")
+        self.lines.append(f"# TYPE {PREFIX}{name} {kind}")
+        for labels, value in samples:
+            self.lines.append(f"{PREFIX}{name}{_labels(**labels)} {value if isinstance(value, int) else repr(float(value))}")
+
+    def render(self) -> str:
+        return '\n'.join(self.lines) + '\n'
+
+def render_metrics(scheduler=None) -> str:
+    now = time.time()
+    out = _Exposition()
+    with _lock:
+        items = dict(_items_ingested)
+        scraper_runs = dict(_scraper_runs)
+        scraper_seconds = dict(_scraper_seconds)
+        runs = dict(_runs)
+        last_run_seconds, last_run_finished_at = _last_run_seconds, _last_run_finished_at
+        last_curation_at = _last_curation_at
+
+    out.family('uptime_seconds', 'gauge', 'Seconds since the process started',
+               [({}, now - _started_at)])
+    out.family('items_ingested_total', 'counter', 'New inspirations inserted, by platform',
+               [({'platform': p}, v) for p, v in sorted(items.items())])
+    out.family('scraper_runs_total', 'counter', 'Scraper runs by platform and outcome',
+               [({'platform': p, 'status': s}, v) for (p, s), v in sorted(scraper_runs.items())])
+    out.family('scraper_duration_seconds_total', 'counter', 'Time spent scraping, by platform',
+               [({'platform': p}, v) for p, v in sorted(scraper_seconds.items())])
+    out.family('daily_runs_total', 'counter', 'Daily runs by outcome',
+               [({'status': s}, v) for s, v in sorted(runs.items())])
+    out.family('last_run_duration_seconds', 'gauge', 'Duration of the last daily run',
+               [({}, last_run_seconds)])
+    out.family('last_run_timestamp_seconds', 'gauge', 'When the last daily run finished',
+               [({}, last_run_finished_at)])
+    out.family('seconds_since_last_curation', 'gauge', 'Seconds since curation last succeeded',
+               [({}, now - last_curation_at if last_curation_at else None)])
+    if scheduler is not None and scheduler.last_successful_run:
+        out.family('seconds_since_last_successful_run', 'gauge',
+                   'Seconds since a run where scraping and curation both succeeded',
+                   [({}, (datetime.now() - scheduler.last_successful_run).total_seconds())])
+
+    pool = get_pool_stats()
+    if pool:
+        out.family('db_pool_connections', 'gauge', 'Database pool connections by state',
+                   [({'state': state}, pool[state]) for state in ('in_use', 'idle', 'max')])
+
+    pipeline_depths = []
+    for platform, pipeline in list(ACTIVE_PIPELINES.items()):
+        for stage, q in pipeline.queues.items():
+            pipeline_depths.append(({'platform': platform, 'stage': stage}, q.qsize()))
+    out.family('pipeline_queue_depth', 'gauge', 'Items waiting in running pipeline stage queues',
+               pipeline_depths)
+    out.family('queue_depth', 'gauge', 'Rows in the job and task queues by status',
+               [({'queue': q, 'status': s}, count) for q, s, count in _queue_depths()])
+
+    hosts = http_metrics.snapshot()
+    out.family('http_requests_total', 'counter', 'HTTP requests by host',
+               [({'host': h}, m['requests']) for h, m in sorted(hosts.items())])
+    out.family('http_retries_total', 'counter', 'HTTP retries by host',
+               [({'host': h}, m['retries']) for h, m in sorted(hosts.items())])
+    out.family('http_latency_ms', 'gauge', 'Estimated HTTP latency percentiles by host',
+               [({'host': h, 'quantile': q}, m[f'p{int(q * 100)}_ms'])
+                for h, m in sorted(hosts.items()) for q in (0.5, 0.95, 0.99)])
+    out.family('circuit_breaker_state', 'gauge', '1 for the current state of each circuit breaker',
+               [({'name': name, 'state': s}, 1 if state == s else 0)
+                for name, state in sorted(breaker_states().items()) for s in BREAKER_STATES])
+
+    if scheduler is not None:
+        out.family('health_check', 'gauge', 'Last health check result per component (1 = ok)',
+                   [({'component': c}, 1 if ok else 0) for c, ok in sorted(scheduler.health_status.items())])
+    return out.render()
+
+def health(scheduler=None) -> Tuple[int, Dict[str, Any]]:
+    """Status code and body for /healthz; unhealthy when the last DB check failed"""
+    checks = dict(scheduler.health_status) if scheduler is not None else {}
+    with _lock:
+        last_curation_at = _last_curation_at
+    body = {
+        'status': 'ok' if checks.get('database', True) else 'unhealthy',
+        'uptime_seconds': round(time.time() - _started_at, 1),
+        'checks': checks,
+        'last_successful_run': (scheduler.last_successful_run.isoformat()
+                                if scheduler is not None and scheduler.last_successful_run else None),
+        'last_curation_at': (datetime.fromtimestamp(last_curation_at).isoformat()
+                             if last_curation_at else None),
+        'db_pool': get_pool_stats(),
+        'open_circuits': [name for name, state in breaker_states().items() if state != 'closed'],
+    }
+    return (200 if body['status'] == 'ok' else 503), body
+
+class _Handler(BaseHTTPRequestHandler):
+    scheduler = None
+
+    def do_GET(self):
+        path = self.path.split('?', 1)[0]
+        try:
+            if path == '/metrics':
+                self._send(200, render_metrics(self.scheduler), 'text/plain; version=0.0.4; charset=utf-8')
+            elif path == '/healthz':
+                status, body = health(self.scheduler)
+                self._send(status, json.dumps(body), 'application/json')
+            else:
+                self._send(404, 'not found\n', 'text/plain')
+        except Exception as e:
+            logger.error(f"Metrics endpoint error on {path}: {e}")
+            self._send(500, 'internal error\n', 'text/plain')
+
+    def _send(self, status: int, body: str, content_type: str):
+        payload = body.encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        logger.debug(format % args)
+
+def start_metrics_server(scheduler=None, port: int = 9108, host: str = '0.0.0.0') -> ThreadingHTTPServer:
+    """Serve /metrics and /healthz from a daemon thread"""
+    handler = type('MetricsHandler', (_Handler,), {'scheduler': scheduler})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name='metrics-server', daemon=True).start()
+    threading.Thread(target=_load_last_curation, name='metrics-seed', daemon=True).start()
+    logger.info(f"Metrics endpoint listening on {host}:{port} (/metrics, /healthz)")
+    return server
@@ -0,0 +1,358 @@
+"""
+Staged fetch -> parse -> score -> write pipeline for the platform scrapers.
+
+Each stage runs on its own thread and hands work to the next through a
+bounded queue, so a slow stage applies backpressure upstream instead of
+stalling the whole scrape. CPU-bound parsers run in a shared process pool
+and writes are batched.
+"""
+import logging
+import multiprocessing
+import queue
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import tracing
+from log_setup import ItemLogSummary, init_process_logging, process_log_queue
+from database import save_inspirations_batch
+from inspiration import Inspiration
+
+logger = logging.getLogger(__name__)
+
+_DONE = object()  # End-of-stream marker passed down the queues
+
+_parse_executor: Optional[ProcessPoolExecutor] = None
+_parse_executor_lock = threading.Lock()
+
+# Pipelines currently running, by platform, for live stats
+ACTIVE_PIPELINES: Dict[str, 'Pipeline'] = {}
+
+@dataclass
+class PlatformSource:
+    """A platform plugged into the pipeline as a source + parser pair"""
+    name: str
+    fetch: Callable[[int], Any]  # page number -> raw payload
+    parse: Callable[[Any], List[Inspiration]]  # raw payload -> inspiration records
+    pages: int = 1
+    cpu_bound: bool = False  # Parse in the process pool (parse must be a module-level function)
+
+@dataclass
+class StageStats:
+    name: str
+    items_in: int = 0
+    items_out: int = 0
+    busy_seconds: float = 0.0
+    max_queue_depth: int = 0
+    errors: int = 0
+
+@dataclass
+class PipelineResult:
+    platform: str
+    pages_fetched: int = 0
+    items_parsed: int = 0
+    items_scraped: int = 0  # Newly inserted rows
+    items_updated: int = 0  # Existing rows whose content changed
+    items_unchanged: int = 0
+    duration: float = 0.0
+    stages: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    errors: List[str] = field(default_factory=list)
+    # First exception that lost a whole page or batch, for retry classification
+    failure: Optional[BaseException] = field(default=None, repr=False)
+
+    @property
+    def success(self) -> bool:
+        return not self.errors
+
+def get_parse_executor() -> ProcessPoolExecutor:
+    """Process pool shared by every pipeline in this process"""
+    global _parse_executor
+    with _parse_executor_lock:
+        if _parse_executor is None:
+            # Spawned, not forked: the pool starts from a parse thread while other
+            # threads hold locks, and forked children would inherit a log
+            # QueueHandler that nothing in the child drains
+            context = multiprocessing.get_context('spawn')
+            _parse_executor = ProcessPoolExecutor(
+                mp_context=context, initializer=init_process_logging,
+                initargs=(process_log_queue(context), logging.getLogger().getEffectiveLevel())
+            )
+        return _parse_executor
+
+def shutdown_parse_executor():
+    global _parse_executor
+    with _parse_executor_lock:
+        if _parse_executor is not None:
+            _parse_executor.shutdown(wait=True)
+            _parse_executor = None
+
+class Pipeline:
+    """Runs one PlatformSource through fetch, parse, score and write stages"""
+
+    def __init__(self, source: PlatformSource, queue_size: int = 100,
+                 write_batch_size: int = 50, write_flush_interval: float = 2.0,
+                 pages: Optional[Sequence[int]] = None, skip_pages: Iterable[int] = (),
+                 on_page_done: Optional[Callable[[int], None]] = None,
+                 stop: Optional[threading.Event] = None):
+        self.source = source
+        # Specific pages to fetch (e.g. one claimed task); defaults to 1..source.pages
+        skip = set(skip_pages)  # Already done by a checkpointed run
+        self.pages = [
+            page for page in (pages if pages is not None else range(1, source.pages + 1))
+            if page not in skip
+        ]
+        # Called (from the write thread) once every item of a page is written
+        self.on_page_done = on_page_done
+        # Set by the caller to stop fetching and writing (e.g. a lost task lease)
+        self.stop = stop
+        self._page_pending: Dict[int, int] = {}
+        self._pages_failed = set()
+        self._pages_lock = threading.Lock()
+        self.write_batch_size = write_batch_size
+        self.write_flush_interval = write_flush_interval
+
+        self.queues = {
+            'parse': queue.Queue(maxsize=max(2, queue_size // 25)),  # Raw pages are large
+            'score': queue.Queue(maxsize=queue_size),
+            'write': queue.Queue(maxsize=queue_size),
+        }
+        self.stages = {name: StageStats(name) for name in ('fetch', 'parse', 'score', 'write')}
+        self.result = PipelineResult(platform=source.name)
+        self._errors_lock = threading.Lock()
+        # Per-item score failures are logged as periodic counts, not one line each
+        self._score_errors = ItemLogSummary(logger, f"{source.name} score errors",
+                                            level=logging.WARNING)
+        self._started_at = 0.0
+
+    # -- stage plumbing ---------------------------------------------------
+
+    def _put(self, name: str, item: Any):
+        """Blocking put (backpressure) that tracks queue depth"""
+        q = self.queues[name]
+        q.put(item)
+        stats = self.stages[name]
+        stats.max_queue_depth = max(stats.max_queue_depth, q.qsize())
+
+    def _page_parsed(self, page: int, item_count: int):
+        with self._pages_lock:
+            self._page_pending[page] = item_count
+        if item_count == 0:
+            self._page_progress(page, 0)
+
+    def _page_progress(self, page: int, written: int, failed: bool = False):
+        """Account for items of `page` leaving the pipeline"""
+        with self._pages_lock:
+            if failed:
+                self._pages_failed.add(page)
+            self._page_pending[page] -= written
+            done = self._page_pending[page] == 0 and page not in self._pages_failed
+        if done and self.on_page_done:
+            try:
+                self.on_page_done(page)
+            except Exception as e:
+                logger.error(f"{self.source.name} page {page} callback failed: {e}")
+
+    def _record_error(self, stage: str, message: str, error: Optional[BaseException] = None):
+        self.stages[stage].errors += 1
+        with self._errors_lock:
+            self.result.errors.append(f"{stage}: {message}")
+            if error is not None and stage != 'score' and self.result.failure is None:
+                self.result.failure = error
+        if stage == 'score':
+            logger.debug(f"{self.source.name} score stage error: {message}")
+            self._score_errors.add(type(error).__name__ if error is not None else 'error')
+        else:
+            logger.error(f"{self.source.name} {stage} stage error: {message}")
+
+    def _fetch_stage(self):
+        stats = self.stages['fetch']
+        try:
+            for page in self.pages:
+                if self._stopped():
+                    break
+                started = time.perf_counter()
+                try:
+                    with tracing.span('fetch page', 'page', platform=self.source.name, page=page):
+                        payload = self.source.fetch(page)
+                except Exception as e:
+                    self._record_error('fetch', f"page {page}: {e}", e)
+                    break
+                finally:
+                    stats.busy_seconds += time.perf_counter() - started
+
+                if payload is None:
+                    break  # Source has no more pages
+                stats.items_out += 1
+                self.result.pages_fetched += 1
+                self._put('parse', (page, payload))
+        finally:
+            self._put('parse', _DONE)
+
+    def _parse_stage(self):
+        stats = self.stages['parse']
+        executor = get_parse_executor() if self.source.cpu_bound else None
+        try:
+            while True:
+                entry = self.queues['parse'].get()
+                if entry is _DONE:
+                    break
+                page, payload = entry
+                stats.items_in += 1
+                started = time.perf_counter()
+                try:
+                    with tracing.span('parse page', 'page', platform=self.source.name, page=page):
+                        if executor:
+                            items = executor.submit(self.source.parse, payload).result()
+                        else:
+                            items = self.source.parse(payload)
+                except Exception as e:
+                    self._record_error('parse', str(e), e)
+                    continue
+                finally:
+                    stats.busy_seconds += time.perf_counter() - started
+
+                self._page_parsed(page, len(items))
+                for item in items:
+                    stats.items_out += 1
+                    self._put('score', (page, item))
+        finally:
+            self._put('score', _DONE)
+
+    def _score_stage(self):
+        stats = self.stages['score']
+        # Same components and SCORE_WEIGHTS as rescoring; imported here to keep numpy
+        # out of scraper module imports
+        from scoring_optimized import OptimizedScoring
+        scorer = OptimizedScoring()
+        try:
+            while True:
+                entry = self.queues['score'].get()
+                if entry is _DONE:
+                    break
+                page, item = entry
+                stats.items_in += 1
+                started = time.perf_counter()
+                try:
+                    with tracing.span('calculate_score', 'item', sampled=True, page=page):
+                        item.score = scorer.weights.combine(scorer.score_components(item))
+                except Exception as e:
+                    self._record_error('score', str(e), e)
+                    self._page_progress(page, 1, failed=True)
+                    continue
+                finally:
+                    stats.busy_seconds += time.perf_counter() - started
+                stats.items_out += 1
+                self._put('write', entry)
+        finally:
+            self._put('write', _DONE)
+
+    def _stopped(self) -> bool:
+        return self.stop is not None and self.stop.is_set()
+
+    def _flush(self, batch: List[Tuple[int, Inspiration]]):
+        stats = self.stages['write']
+        if self._stopped():
+            self._record_error('write', f"batch of {len(batch)} dropped: pipeline stopped")
+            for page, count in Counter(page for page, _ in batch).items():
+                self._page_progress(page, count, failed=True)
+            return
+        started = time.perf_counter()
+        failed = False
+        try:
+            with tracing.span('save batch', 'db', platform=self.source.name, size=len(batch)):
+                counts = save_inspirations_batch([item for _, item in batch])
+            stats.items_out += counts.inserted + counts.updated
+            self.result.items_scraped += counts.inserted
+            self.result.items_updated += counts.updated
+            self.result.items_unchanged += counts.unchanged
+        except Exception as e:
+            failed = True
+            self._record_error('write', f"batch of {len(batch)}: {e}", e)
+        finally:
+            stats.busy_seconds += time.perf_counter() - started
+
+        for page, count in Counter(page for page, _ in batch).items():
+            self._page_progress(page, count, failed=failed)
+
+    def _write_stage(self):
+        stats = self.stages['write']
+        batch: List[Tuple[int, Inspiration]] = []
+        last_flush = time.monotonic()
+        while True:
+            try:
+                entry = self.queues['write'].get(timeout=self.write_flush_interval)
+            except queue.Empty:
+                entry = None
+
+            if entry is _DONE:
+                break
+            if entry is not None:
+                stats.items_in += 1
+                batch.append(entry)
+
+            if batch and (len(batch) >= self.write_batch_size
+                          or time.monotonic() - last_flush >= self.write_flush_interval):
+                self._flush(batch)
+                batch = []
+                last_flush = time.monotonic()
+
+        if batch:
+            self._flush(batch)
+
+    # -- public -----------------------------------------------------------
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Per-stage counters, current queue depth and utilization"""
+        elapsed = max(time.time() - self._started_at, 1e-9) if self._started_at else 0
+        snapshot = {}
+        for name, stage in self.stages.items():
+            inbound = self.queues.get(name)
+            snapshot[name] = {
+                'items_in': stage.items_in,
+                'items_out': stage.items_out,
+                'errors': stage.errors,
+                'queue_depth': inbound.qsize() if inbound else 0,
+                'max_queue_depth': stage.max_queue_depth,
+                'busy_seconds': round(stage.busy_seconds, 3),
+                'utilization': round(min(stage.busy_seconds / elapsed, 1.0), 3) if elapsed else 0.0,
+            }
+        return snapshot
+
+    def run(self) -> PipelineResult:
+        self._started_at = time.time()
+        ACTIVE_PIPELINES[self.source.name] = self
+
+        threads = [
+            threading.Thread(target=getattr(self, f"_{name}_stage"),
+                             name=f"{self.source.name}-{name}", daemon=True)
+            for name in ('fetch', 'parse', 'score', 'write')
+        ]
+        try:
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        finally:
+            ACTIVE_PIPELINES.pop(self.source.name, None)
+
+        self._score_errors.flush()
+        self.result.duration = time.time() - self._started_at
+        self.result.items_parsed = self.stages['parse'].items_out
+        self.result.stages = self.stats()
+
+        logger.info(
+            f"{self.source.name}: {self.result.pages_fetched} pages, "
+            f"{self.result.items_parsed} parsed, {self.result.items_scraped} new, "
+            f"{self.result.items_updated} updated, {self.result.items_unchanged} unchanged "
+            f"in {self.result.duration:.2f}s"
+        )
+        for name, stage in self.result.stages.items():
+            logger.debug(f"{self.source.name} {name} stage: {stage}")
+        return self.result
+
+def run_source(source: PlatformSource, **kwargs) -> PipelineResult:
+    """Run a platform source through the pipeline"""
+    return Pipeline(source, **kwargs).run()
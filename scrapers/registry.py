@@ -0,0 +1,48 @@
+"""
+Registry of platform scrapers.
+
+Scraper modules pull in requests, BeautifulSoup and psycopg2, so they are
+only imported when a scraper is actually run.
+"""
+import importlib
+import os
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional
+
+@dataclass(frozen=True)
+class ScraperSpec:
+    name: str  # Display name, matches inspirations.platform
+    module: str
+    function: str
+    required_env: Optional[str] = None
+    requirements: str = ""
+
+    @property
+    def available(self) -> bool:
+        return not self.required_env or bool(os.environ.get(self.required_env))
+
+SCRAPERS: Dict[str, ScraperSpec] = {
+    'medium': ScraperSpec('Medium', 'medium_scraper', 'scrape_medium',
+                          requirements="No API key required - using RSS feed"),
+    'core77': ScraperSpec('Core77', 'core77_scraper', 'scrape_core77',
+                          requirements="No API key required - web scraping"),
+    'awwwards': ScraperSpec('Awwwards', 'awwwards_scraper', 'scrape_awwwards',
+                            requirements="No API key required - web scraping"),
+    'behance': ScraperSpec('Behance', 'behance_scraper', 'scrape_behance', 'BEHANCE_API_KEY',
+                           requirements="Requires BEHANCE_API_KEY environment variable"),
+    'dribbble': ScraperSpec('Dribbble', 'dribbble_scraper', 'scrape_dribbble', 'DRIBBBLE_ACCESS_TOKEN',
+                            requirements="Requires DRIBBBLE_ACCESS_TOKEN environment variable"),
+}
+
+def platform_keys() -> List[str]:
+    return list(SCRAPERS)
+
+def load_scraper(key: str) -> Callable:
+    """Import a scraper module on demand and return its scrape function"""
+    spec = SCRAPERS[key]
+    return getattr(importlib.import_module(spec.module), spec.function)
+
+def load_source(key: str):
+    """Import a scraper module on demand and return its PlatformSource"""
+    spec = SCRAPERS[key]
+    return getattr(importlib.import_module(spec.module), f"{key.upper()}_SOURCE")
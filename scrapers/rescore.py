@@ -0,0 +1,332 @@
+#!/usr/bin/env python3
+"""
+Parallel full rescore of active inspirations.
+
+The table is split into keyset ranges of roughly equal size (ntile over
+the primary key) and the ranges are rescored by a process pool, each
+worker with its own connection, paging through its range by id and
+writing each batch back in one UPDATE that skips unchanged scores, along
+with the batch's score components (score_features.py).
+Workers report progress to the parent, which draws a global progress bar
+and checkpoints the last id done per range to a JSON file, so an
+interrupted rescore picks up where it stopped with --resume. Curation
+candidates are rebuilt once at the end rather than per batch.
+
+Usage:
+    python rescore.py [--workers 8] [--batch-size 1000] [--resume]
+"""
+import argparse
+import json
+import logging
+import multiprocessing
+import os
+import queue
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from psycopg2.extras import execute_values
+
+from coordination import leader_lock
+from curation_candidates import refresh_platforms
+from database import get_db_connection
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHECKPOINT = os.path.join('logs', 'rescore_checkpoint.json')
+SHARDS_PER_WORKER = 4  # Smaller ranges even out the tail when shards differ in cost
+
+@dataclass
+class Shard:
+    index: int
+    low: Optional[str]  # Exclusive; None = from the start
+    high: Optional[str]  # Inclusive; None = to the end
+    last_id: Optional[str] = None  # Last id written, for resume
+    rows: int = 0
+    changed: int = 0
+    done: bool = False
+
+@dataclass
+class RescoreResult:
+    rows: int = 0
+    changed: int = 0
+    shards: int = 0
+    workers: int = 0
+    resumed: bool = False
+    duration: float = 0.0
+    shard_stats: List[Dict[str, Any]] = field(default_factory=list)
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.duration if self.duration else 0.0
+
+def plan_shards(cursor, count: int) -> Tuple[List[Shard], int]:
+    """Split active rows into `count` id ranges of about equal size"""
+    cursor.execute("""
+        SELECT MAX(id), COUNT(*)
+        FROM (
+            SELECT id, ntile(%s) OVER (ORDER BY id) AS tile
+            FROM inspirations
+            WHERE archived = false
+        ) tiles
+        GROUP BY tile
+        ORDER BY tile
+    """, (count,))
+    bounds = cursor.fetchall()
+    shards, low = [], None
+    for index, (high, _) in enumerate(bounds):
+        # The last range is open-ended so rows inserted meanwhile are included
+        shards.append(Shard(index, low, None if index == len(bounds) - 1 else high))
+        low = high
+    return shards, sum(rows for _, rows in bounds)
+
+# Set in each worker process by _init_worker
+_progress: Optional[Any] = None
+
+def _init_worker(progress_queue):
+    global _progress
+    _progress = progress_queue
+
+def _rescore_shard(shard: Shard, batch_size: int) -> Shard:
+    """Rescore one id range in keyset-ordered batches; runs in a worker process"""
+    from inspiration import Inspiration
+    from scoring_optimized import OptimizedScoring
+    from score_features import store_features
+
+    scorer = OptimizedScoring()
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    after = shard.last_id or shard.low or ''
+    try:
+        while True:
+            cursor.execute("""
+                SELECT id, title, description, "thumbnailUrl", "contentUrl", platform,
+                       "authorName", "authorUrl", tags, "publishedAt", "sourceMeta", score
+                FROM inspirations
+                WHERE archived = false
+                  AND id > %s
+                  AND (%s::text IS NULL OR id <= %s)
+                ORDER BY id
+                LIMIT %s
+            """, (after, shard.high, shard.high, batch_size))
+            rows = cursor.fetchall()
+            if not rows:
+                break
+
+            items = [Inspiration.from_row(row) for row in rows]
+            scorer.attach_velocities(cursor, items)
+            components = [(item.id, scorer.score_components(item)) for item in items]
+            scores = [(item_id, scorer.weights.combine(c)) for item_id, c in components]
+
+            execute_values(cursor, """
+                UPDATE inspirations AS i
+                SET score = v.score, "updatedAt" = CURRENT_TIMESTAMP
+                FROM (VALUES %s) AS v(id, score)
+                WHERE i.id = v.id AND i.score IS DISTINCT FROM v.score
+            """, scores, page_size=len(scores))
+            changed = cursor.rowcount
+            store_features(cursor, components)
+            conn.commit()
+
+            after = rows[-1][0]
+            shard.last_id = after
+            shard.rows += len(rows)
+            shard.changed += changed
+            if _progress is not None:
+                _progress.put((shard.index, after, len(rows), changed))
+            if len(rows) < batch_size:
+                break
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cursor.close()
+        conn.close()
+    shard.done = True
+    return shard
+
+class _Checkpoint:
+    """Per-shard progress in a JSON file, replaced atomically"""
+
+    def __init__(self, path: str, min_interval: float = 1.0):
+        self.path = path
+        self.min_interval = min_interval
+        self._written_at = 0.0
+
+    def load(self) -> Optional[Dict[str, Any]]:
+        if not os.path.exists(self.path):
+            return None
+        with open(self.path) as f:
+            return json.load(f)
+
+    def save(self, shards: List[Shard], total: int, started_at: str, force: bool = False):
+        now = time.monotonic()
+        if not force and now - self._written_at < self.min_interval:
+            return
+        self._written_at = now
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        tmp = f"{self.path}.tmp"
+        with open(tmp, 'w') as f:
+            json.dump({'started_at': started_at, 'total': total,
+                       'shards': [asdict(s) for s in shards]}, f)
+        os.replace(tmp, self.path)
+
+    def clear(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+class _ProgressBar:
+    """One global bar on a terminal, periodic log lines otherwise"""
+
+    def __init__(self, total: int, initial: int = 0, stream=sys.stderr, log_interval: float = 10.0):
+        self.total = max(total, 1)
+        self.initial = initial  # Rows done before a resume, left out of the rate
+        self.stream = stream
+        self.tty = stream.isatty()
+        self.log_interval = log_interval
+        self.started = time.monotonic()
+        self._logged_at = self.started
+
+    def update(self, done: int, changed: int, final: bool = False):
+        elapsed = time.monotonic() - self.started
+        rate = (done - self.initial) / elapsed if elapsed else 0.0
+        fraction = min(done / self.total, 1.0)
+        eta = (self.total - done) / rate if rate and done < self.total else 0.0
+        text = (f"{fraction:6.1%} {done}/{self.total} rows, {changed} changed, "
+                f"{rate:,.0f} rows/s, ETA {eta:,.0f}s")
+        if self.tty:
+            width = 30
+            filled = int(width * fraction)
+            self.stream.write(f"\r[{'#' * filled}{'.' * (width - filled)}] {text}")
+            if final:
+                self.stream.write('\n')
+            self.stream.flush()
+        elif final or time.monotonic() - self._logged_at >= self.log_interval:
+            self._logged_at = time.monotonic()
+            logger.info(f"Rescore progress: {text}")
+
+def rescore_all(workers: Optional[int] = None, batch_size: int = 1000, resume: bool = False,
+                checkpoint_path: str = DEFAULT_CHECKPOINT, show_progress: bool = True) -> RescoreResult:
+    """
+    Rescore every active inspiration across `workers` processes (default:
+    one per CPU). With resume, ranges and positions come from the checkpoint
+    left by an interrupted run.
+    """
+    workers = workers or os.cpu_count() or 1
+    started = time.time()
+    checkpoint = _Checkpoint(checkpoint_path)
+    result = RescoreResult(workers=workers)
+
+    saved = checkpoint.load() if resume else None
+    if saved:
+        shards = [Shard(**s) for s in saved['shards']]
+        total, started_at = saved['total'], saved['started_at']
+        result.resumed = True
+        logger.info(f"Resuming rescore started {started_at}: "
+                    f"{sum(s.done for s in shards)}/{len(shards)} ranges already done")
+    else:
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        try:
+            shards, total = plan_shards(cursor, workers * SHARDS_PER_WORKER)
+            conn.commit()
+        finally:
+            cursor.close()
+            conn.close()
+        started_at = datetime.now().isoformat()
+    checkpoint.save(shards, total, started_at, force=True)
+    result.shards = len(shards)
+
+    done_rows = sum(s.rows for s in shards)
+    changed_rows = sum(s.changed for s in shards)
+    bar = _ProgressBar(total, done_rows) if show_progress else None
+
+    # Spawned workers start clean: no inherited pool, locks or scheduler threads
+    context = multiprocessing.get_context('spawn')
+    progress = context.Queue()
+
+    def drain(timeout: float):
+        nonlocal done_rows, changed_rows
+        try:
+            while True:
+                index, last_id, rows, changed = progress.get(timeout=timeout)
+                timeout = 0
+                shards[index].last_id = last_id
+                shards[index].rows += rows
+                shards[index].changed += changed
+                done_rows += rows
+                changed_rows += changed
+        except queue.Empty:
+            pass
+
+    try:
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context,
+                                 initializer=_init_worker, initargs=(progress,)) as executor:
+            pending = {executor.submit(_rescore_shard, shard, batch_size): shard.index
+                       for shard in shards if not shard.done}
+            try:
+                while pending:
+                    finished, _ = wait(pending, timeout=0.5, return_when=FIRST_COMPLETED)
+                    drain(0.05)
+                    for future in finished:
+                        index = pending.pop(future)
+                        future.result()  # Re-raises a worker failure
+                        shards[index].done = True
+                    checkpoint.save(shards, total, started_at)
+                    if bar:
+                        bar.update(done_rows, changed_rows)
+            finally:
+                # On failure or Ctrl-C, stop queued ranges and keep what finished
+                executor.shutdown(wait=True, cancel_futures=True)
+                drain(0.1)
+    finally:
+        checkpoint.save(shards, total, started_at, force=True)
+
+    if bar:
+        bar.update(done_rows, changed_rows, final=True)
+
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    try:
+        cursor.execute("SELECT DISTINCT platform FROM inspirations WHERE archived = false")
+        refresh_platforms(cursor, [row[0] for row in cursor.fetchall()])
+        conn.commit()
+    finally:
+        cursor.close()
+        conn.close()
+    checkpoint.clear()
+
+    result.rows = sum(s.rows for s in shards)
+    result.changed = sum(s.changed for s in shards)
+    result.duration = time.time() - started
+    result.shard_stats = [{'index': s.index, 'rows': s.rows, 'changed': s.changed} for s in shards]
+    logger.info(f"Rescore completed: {result.rows} rows, {result.changed} changed across "
+                f"{result.shards} ranges and {workers} workers in {result.duration:.1f}s "
+                f"({result.rows_per_second:,.0f} rows/s)")
+    return result
+
+def main():
+    parser = argparse.ArgumentParser(description='Rescore all active inspirations in parallel')
+    parser.add_argument('--workers', type=int, help='Worker processes (default: CPU count)')
+    parser.add_argument('--batch-size', type=int, default=1000, help='Rows per read/write batch')
+    parser.add_argument('--resume', action='store_true', help='Continue an interrupted rescore')
+    parser.add_argument('--checkpoint', default=DEFAULT_CHECKPOINT, help='Checkpoint file')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+    from dotenv import load_dotenv
+    load_dotenv()
+
+    # Shares the election with the worker's incremental rescore job
+    with leader_lock('rescore') as leadership:
+        if not leadership.acquired:
+            sys.exit(1)
+        result = rescore_all(args.workers, args.batch_size, args.resume, args.checkpoint)
+    print(json.dumps({k: v for k, v in asdict(result).items() if k != 'shard_stats'}, indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,204 @@
+"""
+Retry policy for the scrapers.
+
+Failures are classified before deciding anything: transient network
+errors, 429s and 5xx responses are retried with decorrelated-jitter
+exponential backoff (honoring Retry-After), while client errors and
+parse/logic errors are not, since retrying a bug only hides it. A
+circuit breaker per host or platform stops calls to something that keeps
+failing so the run can move on.
+"""
+import logging
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+from typing import Callable, Dict, FrozenSet, Optional, TypeVar
+
+import psycopg2
+import requests
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar('T')
+
+# Failure classes
+TRANSIENT = 'transient'  # Connection reset, DNS, timeouts
+RATE_LIMITED = 'rate_limited'  # HTTP 429
+SERVER = 'server'  # HTTP 5xx
+CLIENT = 'client'  # Other HTTP 4xx
+CIRCUIT_OPEN = 'circuit_open'
+PARSE = 'parse'  # Anything else: parse or logic errors
+
+RETRYABLE: FrozenSet[str] = frozenset({TRANSIENT, RATE_LIMITED, SERVER})
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a host/platform whose breaker is open"""
+
+    def __init__(self, name: str, retry_in: float):
+        super().__init__(f"Circuit open for {name}, retry in {retry_in:.0f}s")
+        self.name = name
+        self.retry_in = retry_in
+
+def classify(error: BaseException) -> str:
+    """Map an exception to one of the failure classes above"""
+    if isinstance(error, CircuitOpenError):
+        return CIRCUIT_OPEN
+    if isinstance(error, requests.HTTPError) and error.response is not None:
+        status = error.response.status_code
+        if status == 429:
+            return RATE_LIMITED
+        if status >= 500:
+            return SERVER
+        return CLIENT
+    if isinstance(error, (requests.ConnectionError, requests.Timeout,
+                          ConnectionError, TimeoutError,
+                          psycopg2.OperationalError, psycopg2.InterfaceError)):
+        return TRANSIENT
+    return PARSE
+
+def retry_after_seconds(error: BaseException) -> Optional[float]:
+    """Delay requested by the server's Retry-After header, if any"""
+    response = getattr(error, 'response', None)
+    value = response.headers.get('Retry-After') if response is not None else None
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max((retry_at - datetime.now(timezone.utc)).total_seconds(), 0.0)
+
+@dataclass
+class RetryPolicy:
+    max_attempts: int = 3
+    base_delay: float = 1.0
+    max_delay: float = 30.0
+    # Give up rather than honor a Retry-After longer than this
+    max_retry_after: float = 120.0
+    retry_on: FrozenSet[str] = field(default=RETRYABLE)
+
+    def next_delay(self, previous: float) -> float:
+        """Decorrelated jitter: uniform(base, previous * 3), capped"""
+        return min(self.max_delay, random.uniform(self.base_delay, max(previous, self.base_delay) * 3))
+
+class CircuitBreaker:
+    """
+    Opens after `failure_threshold` consecutive retryable failures and
+    rejects calls for `reset_timeout` seconds; then lets one trial call
+    through (half-open) and closes again if it succeeds.
+    """
+
+    def __init__(self, name: str, failure_threshold: int = 5, reset_timeout: float = 300.0):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return 'closed'
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return 'half_open'
+        return 'open'
+
+    def before_call(self):
+        """Raise CircuitOpenError unless a call may go through"""
+        with self._lock:
+            state = self.state
+            if state == 'closed':
+                return
+            if state == 'half_open' and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return
+            retry_in = max(self.reset_timeout - (time.monotonic() - self.opened_at), 0)
+        raise CircuitOpenError(self.name, retry_in)
+
+    def record_success(self):
+        with self._lock:
+            if self.opened_at is not None:
+                logger.info(f"Circuit for {self.name} closed again")
+            self.failures = 0
+            self.opened_at = None
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            trial_failed = self._trial_in_flight
+            self._trial_in_flight = False
+            if trial_failed or (self.opened_at is None and self.failures >= self.failure_threshold):
+                self.opened_at = time.monotonic()
+                logger.warning(f"Circuit for {self.name} opened after {self.failures} failures")
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+def get_breaker(name: str, **kwargs) -> CircuitBreaker:
+    """Process-wide breaker for a host or platform"""
+    with _breakers_lock:
+        if name not in _breakers:
+            _breakers[name] = CircuitBreaker(name, **kwargs)
+        return _breakers[name]
+
+def breaker_states() -> Dict[str, str]:
+    with _breakers_lock:
+        return {name: breaker.state for name, breaker in _breakers.items()}
+
+def call_with_retry(func: Callable[[], T], policy: RetryPolicy,
+                    breaker: Optional[CircuitBreaker] = None, description: str = 'call',
+                    on_retry: Optional[Callable[[int, BaseException, float], None]] = None,
+                    sleep: Callable[[float], None] = time.sleep) -> T:
+    """
+    Call `func` until it succeeds, fails with a non-retryable error or runs
+    out of attempts. Only retryable failures (and open downstream
+    breakers) count against the breaker.
+    """
+    delay = policy.base_delay
+    attempt = 1
+    while True:
+        if breaker is not None:
+            breaker.before_call()
+        try:
+            result = func()
+        except Exception as e:
+            kind = classify(e)
+            if breaker is not None:
+                if kind in RETRYABLE or kind == CIRCUIT_OPEN:
+                    breaker.record_failure()
+                else:
+                    breaker.record_success()  # The host answered; the bug is ours
+
+            if kind not in policy.retry_on or attempt >= policy.max_attempts:
+                raise
+
+            delay = policy.next_delay(delay)
+            retry_after = retry_after_seconds(e)
+            if retry_after is not None:
+                if retry_after > policy.max_retry_after:
+                    raise
+                delay = max(delay, retry_after)
+
+            logger.warning(f"{description} failed ({kind}: {e}), "
+                           f"retry {attempt}/{policy.max_attempts - 1} in {delay:.1f}s")
+            if on_retry is not None:
+                on_retry(attempt, e, delay)
+            sleep(delay)
+            attempt += 1
+            continue
+
+        if breaker is not None:
+            breaker.record_success()
+        return result
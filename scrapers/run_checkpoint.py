@@ -0,0 +1,181 @@
+"""
+Persisted checkpoints for the daily scraping run.
+
+Each run gets an ID and a row in scrape_runs whose JSONB checkpoint
+records which platforms and pages are done and the status of the
+curation/archival stages. A scheduler that restarts mid-run resumes its
+own unfinished run for today and skips whatever already completed.
+"""
+import json
+import logging
+import socket
+import threading
+import uuid
+from datetime import date
+from typing import Any, Dict, List, Optional
+
+from psycopg2.extras import Json
+
+from database import get_db_connection
+
+logger = logging.getLogger(__name__)
+
+def default_owner_id() -> str:
+    """Stable across restarts of the same host/container"""
+    return socket.gethostname()
+
+class RunCheckpoint:
+    """
+    Checkpoint of one daily run. Writes go straight to the database; if
+    that fails the run carries on with an in-memory checkpoint.
+    """
+
+    def __init__(self, run_id: str, run_date: date, owner_id: str,
+                 state: Optional[Dict[str, Any]] = None, resumed: bool = False):
+        self.run_id = run_id
+        self.run_date = run_date
+        self.owner_id = owner_id
+        self.state = state or {'platforms': {}, 'stages': {}}
+        self.state.setdefault('platforms', {})
+        self.state.setdefault('stages', {})
+        self.resumed = resumed
+        self._lock = threading.Lock()  # Page callbacks arrive from pipeline threads
+
+    @classmethod
+    def find_unfinished(cls, owner_id: Optional[str] = None,
+                        run_date: Optional[date] = None) -> Optional['RunCheckpoint']:
+        """Latest run this host left running today, if any"""
+        owner_id = owner_id or default_owner_id()
+        run_date = run_date or date.today()
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        try:
+            cursor.execute("""
+                SELECT id, checkpoint FROM scrape_runs
+                WHERE "ownerId" = %s AND "runDate" = %s AND status = 'running'
+                ORDER BY "startedAt" DESC
+                LIMIT 1
+            """, (owner_id, run_date))
+            row = cursor.fetchone()
+            conn.commit()
+        finally:
+            cursor.close()
+            conn.close()
+        if not row:
+            return None
+        return cls(row[0], run_date, owner_id, row[1], resumed=True)
+
+    @classmethod
+    def start(cls, owner_id: Optional[str] = None,
+              run_date: Optional[date] = None) -> 'RunCheckpoint':
+        """Resume today's unfinished run for this host, or start a new one"""
+        owner_id = owner_id or default_owner_id()
+        run_date = run_date or date.today()
+        try:
+            checkpoint = cls.find_unfinished(owner_id, run_date)
+            if checkpoint:
+                logger.info(f"Resuming run {checkpoint.run_id} from checkpoint: {checkpoint.summary()}")
+                return checkpoint
+
+            checkpoint = cls(str(uuid.uuid4()), run_date, owner_id)
+            conn = get_db_connection()
+            cursor = conn.cursor()
+            try:
+                # Older runs this host never finished are not coming back
+                cursor.execute("""
+                    UPDATE scrape_runs
+                    SET status = 'abandoned', "updatedAt" = CURRENT_TIMESTAMP
+                    WHERE "ownerId" = %s AND status = 'running' AND "runDate" < %s
+                """, (owner_id, run_date))
+                cursor.execute("""
+                    INSERT INTO scrape_runs (id, "runDate", "ownerId", checkpoint)
+                    VALUES (%s, %s, %s, %s)
+                """, (checkpoint.run_id, run_date, owner_id, Json(checkpoint.state)))
+                conn.commit()
+            finally:
+                cursor.close()
+                conn.close()
+            logger.info(f"Started run {checkpoint.run_id}")
+            return checkpoint
+
+        except Exception as e:
+            logger.error(f"Could not persist run checkpoint, continuing without resume support: {e}")
+            return cls(str(uuid.uuid4()), run_date, owner_id)
+
+    def _save(self, status: Optional[str] = None):
+        with self._lock:
+            payload = json.dumps(self.state)
+        try:
+            conn = get_db_connection()
+            cursor = conn.cursor()
+            try:
+                cursor.execute("""
+                    UPDATE scrape_runs
+                    SET checkpoint = %s::jsonb,
+                        status = COALESCE(%s, status),
+                        "updatedAt" = CURRENT_TIMESTAMP,
+                        "finishedAt" = CASE WHEN %s IS NULL THEN "finishedAt" ELSE CURRENT_TIMESTAMP END
+                    WHERE id = %s
+                """, (payload, status, status, self.run_id))
+                conn.commit()
+            finally:
+                cursor.close()
+                conn.close()
+        except Exception as e:
+            logger.warning(f"Failed to save checkpoint for run {self.run_id}: {e}")
+
+    # -- platforms --------------------------------------------------------
+
+    def _platform(self, platform: str) -> Dict[str, Any]:
+        return self.state['platforms'].setdefault(platform, {'status': 'pending', 'pages_done': []})
+
+    def platform_done(self, platform: str) -> bool:
+        return self.state['platforms'].get(platform, {}).get('status') == 'done'
+
+    def platform_result(self, platform: str) -> Optional[Dict[str, Any]]:
+        """Result recorded when the platform finished"""
+        return self.state['platforms'].get(platform, {}).get('result')
+
+    def pages_done(self, platform: str) -> List[int]:
+        return list(self.state['platforms'].get(platform, {}).get('pages_done', []))
+
+    def page_done(self, platform: str, page: int):
+        with self._lock:
+            pages = self._platform(platform)['pages_done']
+            if page in pages:
+                return
+            pages.append(page)
+        self._save()
+
+    def finish_platform(self, platform: str, success: bool, result: Dict[str, Any]):
+        with self._lock:
+            state = self._platform(platform)
+            state['status'] = 'done' if success else 'failed'
+            state['result'] = result
+        self._save()
+
+    # -- stages -----------------------------------------------------------
+
+    def stage_done(self, stage: str) -> bool:
+        return self.state['stages'].get(stage, {}).get('status') == 'done'
+
+    def stage_result(self, stage: str) -> Any:
+        return self.state['stages'].get(stage, {}).get('result')
+
+    def finish_stage(self, stage: str, success: bool, result: Any = None):
+        with self._lock:
+            self.state['stages'][stage] = {'status': 'done' if success else 'failed', 'result': result}
+        self._save()
+
+    def complete(self):
+        """Mark the run finished; it will not be resumed"""
+        self._save(status='completed')
+
+    def summary(self) -> str:
+        platforms = ', '.join(
+            f"{name}={state.get('status')}" for name, state in self.state['platforms'].items()
+        ) or 'none'
+        stages = ', '.join(
+            f"{name}={state.get('status')}" for name, state in self.state['stages'].items()
+        ) or 'none'
+        return f"platforms: {platforms}; stages: {stages}"
@@ -0,0 +1,248 @@
+"""
+Queryable history of per-platform scraper runs.
+
+Every run writes one scraper_run_history row per platform, so trend
+questions ("how has Behance scrape time moved over 30 days?") are one
+indexed query instead of a pass over logs/run_history.jsonl. The CLI
+reports p50/p95 duration, items/sec and failure rate per time window and
+flags platforms whose recent runs regressed against a rolling baseline.
+
+Usage:
+    python run_history.py report [--days 30] [--window day|week] [--platform behance]
+    python run_history.py regressions [--recent-days 3] [--baseline-days 28]
+    python run_history.py import logs/run_history.jsonl
+"""
+import argparse
+import json
+import logging
+import socket
+import sys
+import uuid
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional
+
+from psycopg2.extras import execute_values
+
+from database import get_db_connection
+
+logger = logging.getLogger(__name__)
+
+@dataclass
+class WindowStats:
+    platform: str
+    window_start: datetime
+    runs: int
+    failures: int
+    failure_rate: float
+    p50_seconds: Optional[float]
+    p95_seconds: Optional[float]
+    items_scraped: int
+    items_per_second: Optional[float]
+
+@dataclass
+class Regression:
+    platform: str
+    metric: str  # p50_seconds, items_per_second or failure_rate
+    baseline: float
+    recent: float
+    change: str
+
+def _insert(rows: List[tuple]) -> int:
+    if not rows:
+        return 0
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    try:
+        inserted = execute_values(cursor, """
+            INSERT INTO scraper_run_history (
+                id, "runId", platform, hostname, success, "errorKind",
+                attempts, "itemsScraped", "itemsParsed", "durationSeconds", "recordedAt"
+            ) VALUES %s
+            ON CONFLICT ("runId", platform, "recordedAt") DO NOTHING
+            RETURNING id
+        """, rows, fetch=True)
+        conn.commit()
+        return len(inserted)
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cursor.close()
+        conn.close()
+
+def record_results(run_id: Optional[str], results: Iterable[Any],
+                   recorded_at: Optional[datetime] = None) -> int:
+    """Store ScraperResults (or dicts with the same fields) for one run"""
+    recorded_at = recorded_at or datetime.now()
+    hostname = socket.gethostname()
+    rows = []
+    for r in results:
+        r = r if isinstance(r, dict) else asdict(r)
+        rows.append((
+            str(uuid.uuid4()), run_id, r['platform'], hostname, bool(r['success']),
+            r.get('error_kind'), r.get('attempts') or 0, r.get('items_scraped') or 0,
+            r.get('items_parsed') or 0, float(r.get('duration') or 0.0), recorded_at
+        ))
+    return _insert(rows)
+
+def import_jsonl(path: str) -> int:
+    """Backfill from a run_history.jsonl file; re-importing is a no-op"""
+    imported = 0
+    with open(path) as f:
+        for line in f:
+            if not line.strip():
+                continue
+            run = json.loads(line)
+            recorded_at = datetime.fromisoformat(run['timestamp'])
+            # Older lines have no run_id; the timestamp keeps them unique
+            run_id = run.get('run_id') or f"legacy-{run['timestamp']}"
+            imported += record_results(run_id, run.get('scrapers', []), recorded_at)
+    return imported
+
+def window_report(days: int = 30, window: str = 'day',
+                  platform: Optional[str] = None) -> List[WindowStats]:
+    """Per-platform stats for each day/week in the last `days` days"""
+    if window not in ('day', 'week'):
+        raise ValueError("window must be 'day' or 'week'")
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    try:
+        cursor.execute("""
+            SELECT platform,
+                   date_trunc(%s, "recordedAt") AS window_start,
+                   COUNT(*) AS runs,
+                   COUNT(*) FILTER (WHERE NOT success) AS failures,
+                   percentile_cont(0.5) WITHIN GROUP (ORDER BY "durationSeconds") FILTER (WHERE success),
+                   percentile_cont(0.95) WITHIN GROUP (ORDER BY "durationSeconds") FILTER (WHERE success),
+                   SUM("itemsScraped"),
+                   SUM("itemsScraped") FILTER (WHERE success)
+                       / NULLIF(SUM("durationSeconds") FILTER (WHERE success), 0)
+            FROM scraper_run_history
+            WHERE "recordedAt" >= NOW() - make_interval(days => %s)
+              AND (%s::text IS NULL OR lower(platform) = lower(%s))
+            GROUP BY platform, window_start
+            ORDER BY platform, window_start
+        """, (window, days, platform, platform))
+        return [
+            WindowStats(
+                platform=row[0], window_start=row[1], runs=row[2], failures=row[3],
+                failure_rate=row[3] / row[2] if row[2] else 0.0,
+                p50_seconds=row[4], p95_seconds=row[5], items_scraped=int(row[6] or 0),
+                items_per_second=float(row[7]) if row[7] is not None else None
+            )
+            for row in cursor.fetchall()
+        ]
+    finally:
+        cursor.close()
+        conn.close()
+
+def detect_regressions(recent_days: int = 3, baseline_days: int = 28,
+                       slowdown: float = 1.5, failure_increase: float = 0.25,
+                       min_runs: int = 3) -> List[Regression]:
+    """
+    Compare the last `recent_days` with the `baseline_days` before them.
+    Flags p50 duration up or items/sec down by more than `slowdown`x, and
+    failure rate up by more than `failure_increase`. Platforms with fewer
+    than `min_runs` baseline runs are skipped.
+    """
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    try:
+        cursor.execute("""
+            WITH periods AS (
+                SELECT *, CASE WHEN "recordedAt" >= NOW() - make_interval(days => %(recent)s)
+                               THEN 'recent' ELSE 'baseline' END AS period
+                FROM scraper_run_history
+                WHERE "recordedAt" >= NOW() - make_interval(days => %(recent)s + %(baseline)s)
+            )
+            SELECT platform, period, COUNT(*),
+                   COUNT(*) FILTER (WHERE NOT success)::float / COUNT(*),
+                   percentile_cont(0.5) WITHIN GROUP (ORDER BY "durationSeconds") FILTER (WHERE success),
+                   SUM("itemsScraped") FILTER (WHERE success)
+                       / NULLIF(SUM("durationSeconds") FILTER (WHERE success), 0)
+            FROM periods
+            GROUP BY platform, period
+        """, {'recent': recent_days, 'baseline': baseline_days})
+        stats: Dict[str, Dict[str, tuple]] = {}
+        for platform, period, runs, failure_rate, p50, rate in cursor.fetchall():
+            stats.setdefault(platform, {})[period] = (runs, failure_rate, p50,
+                                                      float(rate) if rate is not None else None)
+    finally:
+        cursor.close()
+        conn.close()
+
+    regressions = []
+    for platform, periods in sorted(stats.items()):
+        if 'recent' not in periods or 'baseline' not in periods or periods['baseline'][0] < min_runs:
+            continue
+        _, base_failures, base_p50, base_rate = periods['baseline']
+        _, recent_failures, recent_p50, recent_rate = periods['recent']
+
+        if base_p50 and recent_p50 and recent_p50 > base_p50 * slowdown:
+            regressions.append(Regression(platform, 'p50_seconds', base_p50, recent_p50,
+                                          f"{recent_p50 / base_p50:.1f}x slower"))
+        if base_rate and recent_rate is not None and recent_rate < base_rate / slowdown:
+            regressions.append(Regression(platform, 'items_per_second', base_rate, recent_rate,
+                                          f"{recent_rate / base_rate:.0%} of baseline"))
+        if recent_failures - base_failures > failure_increase:
+            regressions.append(Regression(platform, 'failure_rate', base_failures, recent_failures,
+                                          f"+{recent_failures - base_failures:.0%}"))
+    return regressions
+
+def _fmt(value: Optional[float], spec: str = '.1f') -> str:
+    return '-' if value is None else format(value, spec)
+
+def main():
+    parser = argparse.ArgumentParser(description='Scraper run history reports')
+    parser.add_argument('--json', action='store_true', help='Print JSON instead of a table')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    report = commands.add_parser('report', help='Per-platform stats per time window')
+    report.add_argument('--days', type=int, default=30)
+    report.add_argument('--window', choices=['day', 'week'], default='day')
+    report.add_argument('--platform')
+
+    regressions = commands.add_parser('regressions', help='Flag regressions against the baseline')
+    regressions.add_argument('--recent-days', type=int, default=3)
+    regressions.add_argument('--baseline-days', type=int, default=28)
+    regressions.add_argument('--slowdown', type=float, default=1.5)
+
+    backfill = commands.add_parser('import', help='Backfill from a run_history.jsonl file')
+    backfill.add_argument('path')
+
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+    from dotenv import load_dotenv
+    load_dotenv()
+
+    if args.command == 'import':
+        print(f"Imported {import_jsonl(args.path)} platform results")
+        return
+
+    if args.command == 'report':
+        rows = window_report(args.days, args.window, args.platform)
+        if args.json:
+            print(json.dumps([asdict(r) for r in rows], indent=2, default=str))
+            return
+        print(f"{'platform':<12} {args.window:<10} {'runs':>5} {'fail%':>6} "
+              f"{'p50 s':>8} {'p95 s':>8} {'items':>7} {'items/s':>8}")
+        for r in rows:
+            print(f"{r.platform:<12} {r.window_start:%Y-%m-%d} {r.runs:>5} {r.failure_rate:>6.0%} "
+                  f"{_fmt(r.p50_seconds):>8} {_fmt(r.p95_seconds):>8} {r.items_scraped:>7} "
+                  f"{_fmt(r.items_per_second, '.2f'):>8}")
+        return
+
+    found = detect_regressions(args.recent_days, args.baseline_days, args.slowdown)
+    if args.json:
+        print(json.dumps([asdict(r) for r in found], indent=2))
+    elif not found:
+        print("No regressions against the baseline")
+    else:
+        for r in found:
+            print(f"⚠️  {r.platform}: {r.metric} {_fmt(r.baseline, '.2f')} -> {_fmt(r.recent, '.2f')} ({r.change})")
+    sys.exit(1 if found else 0)
+
+if __name__ == "__main__":
+    main()
@@ -4,74 +4,70 @@ Main script to run all design inspiration scrapers
 """
 import os
 import sys
+import time
 import logging
 import argparse
 from datetime import datetime
-from dotenv import load_dotenv
 
-# Load environment variables
-load_dotenv()
+from registry import SCRAPERS, load_scraper, platform_keys
 
-# Import scrapers
-from behance_scraper import scrape_behance
-from dribbble_scraper import scrape_dribbble
-from medium_scraper import scrape_medium
-from core77_scraper import scrape_core77
-from awwwards_scraper import scrape_awwwards
-from curation import curate_daily_content
-from database import setup_database
+# Scrapers, curation and the database layer are imported lazily so that
+# e.g. `--curation-only` or `--platform medium` only load what they need.
 
-# Setup logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('scraper.log'),
-        logging.StreamHandler(sys.stdout)
-    ]
-)
 logger = logging.getLogger(__name__)
 
+def setup_logging():
+    from log_setup import setup_logging as setup_queue_logging
+    setup_queue_logging('scraper.log', retention_days=int(os.environ.get('LOG_RETENTION_DAYS', '7')))
+
 def run_all_scrapers():
     """Run all scrapers sequentially with error handling"""
     logger.info(f"Starting scraping process at {datetime.now()}")
     
-    # Scrapers configuration
-    scrapers = [
-        ("Medium", scrape_medium, "No API key required - using RSS feed"),
-        ("Core77", scrape_core77, "No API key required - web scraping"),
-        ("Awwwards", scrape_awwwards, "No API key required - web scraping"),
-        ("Behance", scrape_behance, "Requires BEHANCE_API_KEY environment variable"),
-        ("Dribbble", scrape_dribbble, "Requires DRIBBBLE_ACCESS_TOKEN environment variable"),
-    ]
-    
     results = {}
     
-    for platform, scraper_func, requirements in scrapers:
+    for key, spec in SCRAPERS.items():
         try:
-            logger.info(f"Starting {platform} scraper...")
-            logger.info(f"Requirements: {requirements}")
+            logger.info(f"Starting {spec.name} scraper...")
+            logger.info(f"Requirements: {spec.requirements}")
             
-            scraper_func()
+            load_scraper(key)()
             
-            results[platform] = "Success"
-            logger.info(f"✓ {platform} scraper completed successfully")
+            results[spec.name] = "Success"
+            logger.info(f"✓ {spec.name} scraper completed successfully")
             
         except Exception as e:
-            results[platform] = f"Failed: {str(e)}"
-            logger.error(f"✗ {platform} scraper failed: {e}")
+            results[spec.name] = f"Failed: {str(e)}"
+            logger.error(f"✗ {spec.name} scraper failed: {e}")
             
         # Small delay between scrapers
-        import time
         time.sleep(2)
     
     return results
 
+def run_distributed_scrapers():
+    """Share today's pages with other replicas through the scrape_tasks queue"""
+    from task_queue import run_distributed_scrape
+    
+    logger.info(f"Joining distributed scrape at {datetime.now()}")
+    summaries = run_distributed_scrape()
+    return {
+        summary.platform: "Success" if summary.success else f"Failed: {'; '.join(summary.errors)}"
+        for summary in summaries.values()
+    }
+
 def run_curation():
     """Run the curation algorithm"""
     try:
         logger.info("Starting curation process...")
-        curate_daily_content()
+        from curation_optimized import curate_daily_content
+        curated = curate_daily_content()
+        if curated is None:
+            logger.info("⏭️  Curation skipped: already done today or running on another replica")
+            return True
+        if not curated:
+            logger.error("✗ Curation failed")
+            return False
         logger.info("✓ Curation completed successfully")
         return True
     except Exception as e:
@@ -114,11 +110,17 @@ def main():
     parser = argparse.ArgumentParser(description='Run design inspiration scrapers')
     parser.add_argument('--scrapers-only', action='store_true', help='Run only scrapers, skip curation')
     parser.add_argument('--curation-only', action='store_true', help='Run only curation, skip scrapers')
-    parser.add_argument('--platform', choices=['behance', 'dribbble', 'medium', 'core77', 'awwwards'], 
+    parser.add_argument('--platform', choices=platform_keys(),
                         help='Run only specific platform scraper')
+    parser.add_argument('--distributed', action='store_true',
+                        help='Claim pages from the shared scrape_tasks queue instead of scraping everything')
     
     args = parser.parse_args()
     
+    from dotenv import load_dotenv
+    load_dotenv()
+    setup_logging()
+    
     logger.info("=== Design Inspiration Scraper Starting ===")
     
     # Check environment
@@ -129,6 +131,7 @@ def main():
     # Setup database
     try:
         logger.info("Setting up database connection...")
+        from database import setup_database
         setup_database()
         logger.info("✓ Database setup completed")
     except Exception as e:
@@ -139,17 +142,9 @@ def main():
     
     # Run specific platform if requested
     if args.platform:
-        scraper_map = {
-            'behance': scrape_behance,
-            'dribbble': scrape_dribbble,
-            'medium': scrape_medium,
-            'core77': scrape_core77,
-            'awwwards': scrape_awwwards
-        }
-        
         try:
             logger.info(f"Running {args.platform} scraper only...")
-            scraper_map[args.platform]()
+            load_scraper(args.platform)()
             logger.info(f"✓ {args.platform} scraper completed")
         except Exception as e:
             logger.error(f"✗ {args.platform} scraper failed: {e}")
@@ -157,7 +152,7 @@ def main():
     
     # Run scrapers unless curation-only is specified
     elif not args.curation_only:
-        results = run_all_scrapers()
+        results = run_distributed_scrapers() if args.distributed else run_all_scrapers()
         
         # Print summary
         logger.info("\n=== Scraping Results Summary ===")
@@ -2,7 +2,6 @@
 """
 Production-ready scheduler for daily scraping and curation workflow
 """
-import schedule
 import time
 import logging
 import os
@@ -11,17 +10,24 @@ import sys
 import json
 from datetime import datetime, timedelta
 from typing import Dict, List, Tuple, Optional
-from dataclasses import dataclass
+from dataclasses import dataclass, asdict
 from pathlib import Path
 
-# Import scrapers
-from behance_scraper import scrape_behance
-from dribbble_scraper import scrape_dribbble
-from medium_scraper import scrape_medium
-from core77_scraper import scrape_core77
-from awwwards_scraper import scrape_awwwards
-from curation import curate_daily_content
+from registry import SCRAPERS, load_scraper
+from curation_optimized import curate_daily_content
 from database import setup_database, get_db_connection
+from archival import archive_stale_content
+from engagement_history import compact_snapshots
+import http_metrics
+import metrics_server
+import run_history
+import tracing
+from coordination import drain_leadership_events, leader_lock
+from crawl_frequency import CrawlPolicy, learn_intervals
+from retry import RetryPolicy, call_with_retry, classify, get_breaker
+from job_scheduler import Every, JobScheduler, parse_cadence, parse_duration
+from log_setup import setup_logging
+from run_checkpoint import RunCheckpoint
 
 @dataclass
 class ScraperResult:
@@ -29,16 +35,48 @@ class ScraperResult:
     success: bool
     error: Optional[str] = None
     items_scraped: int = 0
+    items_parsed: int = 0  # Everything the crawl saw, new or not
     duration: float = 0.0
+    stages: Optional[Dict] = None  # Pipeline stage stats (queue depth, utilization)
+    error_kind: Optional[str] = None  # transient, rate_limited, server, client, parse, circuit_open
+    attempts: int = 0
 
 @dataclass
 class SchedulerConfig:
-    schedule_time: str = "03:00"  # 3:00 AM IST
+    schedule_time: str = "03:00"  # 3:00 AM IST; comma-separated HH:MM times and/or intervals like 6h
     max_retries: int = 3
     retry_delay: int = 300  # 5 minutes
     health_check_interval: int = 3600  # 1 hour
     log_retention_days: int = 7
     enable_health_checks: bool = True
+    enable_archival: bool = True
+    distributed_scraping: bool = False  # Share pages with other replicas via scrape_tasks
+    metrics_port: int = 0  # Serve /metrics and /healthz on this port (0 = off)
+    adaptive_crawl: bool = False  # Also crawl each platform at an interval learned from its yield
+    crawl_min_interval: float = 3600.0
+    crawl_max_interval: float = 3 * 86400.0
+    crawl_target_fill: float = 0.5  # Aim for this share of each crawl's items to be new
+    engagement_refresh_interval: str = ''  # e.g. 6h; re-poll stats of recent items ('' = off)
+    
+    @classmethod
+    def from_env(cls) -> 'SchedulerConfig':
+        """Create configuration from environment"""
+        return cls(
+            schedule_time=os.environ.get('SCHEDULE_TIME', '03:00'),
+            max_retries=int(os.environ.get('MAX_RETRIES', '3')),
+            retry_delay=int(os.environ.get('RETRY_DELAY', '300')),
+            health_check_interval=int(os.environ.get('HEALTH_CHECK_INTERVAL', '3600')),
+            log_retention_days=int(os.environ.get('LOG_RETENTION_DAYS', '7')),
+            enable_health_checks=os.environ.get('ENABLE_HEALTH_CHECKS', 'true').lower() == 'true',
+            enable_archival=os.environ.get('ENABLE_ARCHIVAL', 'true').lower() == 'true',
+            distributed_scraping=os.environ.get('DISTRIBUTED_SCRAPING', 'false').lower() == 'true',
+            metrics_port=int(os.environ.get('METRICS_PORT', '0')),
+            adaptive_crawl=os.environ.get('ADAPTIVE_CRAWL', 'false').lower() == 'true',
+            crawl_min_interval=parse_duration(os.environ.get('CRAWL_MIN_INTERVAL', '1h')),
+            crawl_max_interval=parse_duration(os.environ.get('CRAWL_MAX_INTERVAL', '3d')),
+            crawl_target_fill=float(os.environ.get('CRAWL_TARGET_FILL', '0.5')),
+            engagement_refresh_interval=os.environ.get('ENGAGEMENT_REFRESH_INTERVAL', '')
+        )
 
 class ProductionScheduler:
     def __init__(self, config: SchedulerConfig = None):
@@ -48,6 +86,7 @@ class ProductionScheduler:
         self.running = True
         self.last_successful_run: Optional[datetime] = None
         self.health_status: Dict[str, bool] = {}
+        self.jobs = JobScheduler()
         
         # Setup signal handlers for graceful shutdown
         signal.signal(signal.SIGINT, self._signal_handler)
@@ -58,14 +97,9 @@ class ProductionScheduler:
         log_dir = Path("logs")
         log_dir.mkdir(exist_ok=True)
         
-        logging.basicConfig(
-            level=logging.INFO,
-            format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-            handlers=[
-                logging.FileHandler(log_dir / 'scheduler.log'),
-                logging.StreamHandler(sys.stdout)
-            ]
-        )
+        # Queue-backed so scraper threads never block on log I/O; JSON file
+        # rotated daily, keeping log_retention_days files
+        setup_logging(str(log_dir / 'scheduler.log'), retention_days=self.config.log_retention_days)
         
         logger = logging.getLogger(__name__)
         logger.info("Scheduler logging initialized")
@@ -73,18 +107,17 @@ class ProductionScheduler:
     
     def _setup_scrapers(self) -> List[Tuple[str, callable, bool]]:
         """Setup scraper configuration with optional requirements"""
+        # Only import scrapers whose requirements are met
         return [
-            ("Medium", scrape_medium, True),  # Always available
-            ("Core77", scrape_core77, True),  # Always available
-            ("Awwwards", scrape_awwwards, True),  # Always available
-            ("Behance", scrape_behance, bool(os.environ.get('BEHANCE_API_KEY'))),
-            ("Dribbble", scrape_dribbble, bool(os.environ.get('DRIBBBLE_ACCESS_TOKEN'))),
+            (spec.name, load_scraper(key) if spec.available else None, spec.available)
+            for key, spec in SCRAPERS.items()
         ]
     
     def _signal_handler(self, signum, frame):
         """Handle shutdown signals gracefully"""
         self.logger.info(f"Received signal {signum}, shutting down gracefully...")
         self.running = False
+        self.jobs.wake()
     
     def _validate_environment(self) -> bool:
         """Validate required environment variables"""
@@ -104,60 +137,155 @@ class ProductionScheduler:
         
         return True
     
-    def _run_scraper_with_retry(self, platform: str, scraper_func: callable) -> ScraperResult:
-        """Run a single scraper with retry logic"""
+    def _retry_policy(self, max_retries: Optional[int] = None) -> RetryPolicy:
+        """Backoff for whole-scraper retries; RETRY_DELAY caps the delay"""
+        if max_retries is None:
+            max_retries = self.config.max_retries
+        return RetryPolicy(
+            max_attempts=max_retries + 1,
+            base_delay=min(30, self.config.retry_delay),
+            max_delay=self.config.retry_delay,
+            max_retry_after=self.config.retry_delay
+        )
+    
+    def _run_scraper_with_retry(self, platform: str, scraper_func: callable,
+                                max_retries: Optional[int] = None) -> ScraperResult:
+        """
+        Run a single scraper, retrying only transient/429/5xx failures with
+        backoff. A platform that keeps failing trips its circuit breaker and
+        is skipped until the breaker resets.
+        """
         start_time = time.time()
+        attempts = 0
         
-        for attempt in range(self.config.max_retries + 1):
-            try:
-                self.logger.info(f"Scraping {platform} (attempt {attempt + 1})")
-                
-                # Run the scraper
+        def run_once():
+            nonlocal attempts
+            attempts += 1
+            self.logger.info(f"Scraping {platform} (attempt {attempts})")
+            with tracing.span(f"scrape {platform}", 'platform', attempt=attempts):
                 result = scraper_func()
-                
-                duration = time.time() - start_time
-                self.logger.info(f"✓ {platform} scraping completed successfully in {duration:.2f}s")
-                
-                return ScraperResult(
-                    platform=platform,
-                    success=True,
-                    items_scraped=getattr(result, 'items_scraped', 0),
-                    duration=duration
-                )
-                
-            except Exception as e:
-                self.logger.error(f"✗ {platform} scraping failed (attempt {attempt + 1}): {e}")
-                
-                if attempt < self.config.max_retries:
-                    self.logger.info(f"Retrying {platform} in {self.config.retry_delay} seconds...")
-                    time.sleep(self.config.retry_delay)
-                else:
-                    duration = time.time() - start_time
-                    return ScraperResult(
-                        platform=platform,
-                        success=False,
-                        error=str(e),
-                        duration=duration
-                    )
+            # Pipelines record lost pages instead of raising; surface them here
+            failure = getattr(result, 'failure', None)
+            if failure is not None:
+                raise failure
+            return result
+        
+        try:
+            result = call_with_retry(
+                run_once, self._retry_policy(max_retries),
+                breaker=get_breaker(f"platform:{platform}", failure_threshold=3, reset_timeout=3600),
+                description=f"{platform} scraper"
+            )
+        except Exception as e:
+            kind = classify(e)
+            duration = time.time() - start_time
+            self.logger.error(f"✗ {platform} scraping failed after {attempts} attempts ({kind}): {e}")
+            return ScraperResult(
+                platform=platform,
+                success=False,
+                error=str(e),
+                error_kind=kind,
+                duration=duration,
+                attempts=attempts
+            )
+        
+        duration = time.time() - start_time
+        self.logger.info(f"✓ {platform} scraping completed successfully in {duration:.2f}s")
+        
+        return ScraperResult(
+            platform=platform,
+            success=True,
+            items_scraped=getattr(result, 'items_scraped', 0),
+            items_parsed=getattr(result, 'items_parsed', 0),
+            duration=duration,
+            stages=getattr(result, 'stages', None),
+            attempts=attempts
+        )
+    
+    def _run_checkpointed_scraper(self, checkpoint: RunCheckpoint, platform: str,
+                                  scraper_func: callable) -> ScraperResult:
+        """Run a scraper, skipping it (or the pages) the checkpoint already has"""
+        if checkpoint.platform_done(platform):
+            self.logger.info(f"⏭️  {platform} already scraped in this run")
+            return ScraperResult(**checkpoint.platform_result(platform))
+        
+        pages_done = checkpoint.pages_done(platform)
+        if pages_done:
+            self.logger.info(f"Resuming {platform}, skipping pages {sorted(pages_done)}")
+        
+        # Re-read the checkpoint on every attempt so retries skip pages that landed
+        result = self._run_scraper_with_retry(platform, lambda: scraper_func(
+            skip_pages=checkpoint.pages_done(platform),
+            on_page_done=lambda page: checkpoint.page_done(platform, page)
+        ))
+        checkpoint.finish_platform(platform, result.success, asdict(result))
+        return result
+    
+    def _run_distributed_scrapers(self) -> List[ScraperResult]:
+        """Scrape today's pages together with any other replicas via the scrape_tasks queue"""
+        from task_queue import run_distributed_scrape
+        
+        self.logger.info("Joining distributed scrape (scrape_tasks queue)...")
+        try:
+            summaries = run_distributed_scrape()
+        except Exception as e:
+            self.logger.error(f"✗ Distributed scrape failed: {e}")
+            return [ScraperResult(platform='distributed', success=False, error=str(e))]
+        
+        return [
+            ScraperResult(
+                platform=summary.platform,
+                success=summary.success,
+                error='; '.join(summary.errors) or None,
+                items_scraped=summary.items_scraped,
+                items_parsed=summary.items_parsed,
+                duration=summary.duration
+            )
+            for summary in summaries.values()
+        ]
     
     def _run_curation_with_retry(self) -> bool:
         """Run curation with retry logic"""
         for attempt in range(self.config.max_retries + 1):
             try:
                 self.logger.info(f"Running curation (attempt {attempt + 1})")
-                curate_daily_content()
-                self.logger.info("✓ Curation completed successfully")
-                return True
+                curated = curate_daily_content()
+                if curated is None:
+                    self.logger.info("⏭️  Curation skipped: already done today or running on another replica")
+                    return True
+                if curated:
+                    self.logger.info("✓ Curation completed successfully")
+                    metrics_server.record_curation(True)
+                    return True
+                self.logger.error(f"✗ Curation failed (attempt {attempt + 1})")
                 
             except Exception as e:
                 self.logger.error(f"✗ Curation failed (attempt {attempt + 1}): {e}")
-                
-                if attempt < self.config.max_retries:
-                    self.logger.info(f"Retrying curation in {self.config.retry_delay} seconds...")
-                    time.sleep(self.config.retry_delay)
+            
+            if attempt < self.config.max_retries:
+                self.logger.info(f"Retrying curation in {self.config.retry_delay} seconds...")
+                time.sleep(self.config.retry_delay)
         
         return False
     
+    def _run_archival(self) -> Optional[Dict]:
+        """Archive stale content so the curation hot set stays small"""
+        try:
+            self.logger.info("Running retention/archival job...")
+            result = archive_stale_content()
+            self.logger.info(f"✓ Archived {result.rows_archived} inspirations, hot set size: {result.hot_set_size}")
+            snapshots = compact_snapshots()
+            return {
+                'rows_archived': result.rows_archived,
+                'hot_set_size': result.hot_set_size,
+                'score_threshold': result.score_threshold,
+                'snapshots_expired': snapshots.daily_rows_expired,
+                'duration': result.duration + snapshots.duration
+            }
+        except Exception as e:
+            self.logger.error(f"✗ Archival failed: {e}")
+            return None
+    
     def _perform_health_check(self) -> Dict[str, bool]:
         """Perform system health checks"""
         health_status = {}
@@ -181,9 +309,11 @@ class ProductionScheduler:
         
         return health_status
     
-    def _save_run_results(self, results: List[ScraperResult], curation_success: bool):
+    def _save_run_results(self, results: List[ScraperResult], curation_success: bool,
+                          archival: Optional[Dict] = None, run_id: Optional[str] = None):
         """Save run results for monitoring"""
         run_data = {
+            'run_id': run_id,
             'timestamp': datetime.now().isoformat(),
             'scrapers': [
                 {
@@ -191,22 +321,39 @@ class ProductionScheduler:
                     'success': r.success,
                     'error': r.error,
                     'items_scraped': r.items_scraped,
-                    'duration': r.duration
+                    'items_parsed': r.items_parsed,
+                    'duration': r.duration,
+                    'stages': r.stages,
+                    'error_kind': r.error_kind,
+                    'attempts': r.attempts
                 }
                 for r in results
             ],
             'curation_success': curation_success,
+            'archival': archival,
+            'coordination': drain_leadership_events(),  # Leader elections (lock wait/hold)
+            'http': http_metrics.drain(),  # Per-host latency percentiles, statuses, retries, bytes
+            'trace': tracing.export_trace(),  # Chrome trace file when TRACE_ENABLED
             'health_status': self.health_status
         }
         
+        metrics_server.record_scraper_results(results)
+        try:
+            run_history.record_results(run_id, results)
+        except Exception as e:
+            self.logger.warning(f"Failed to record run history: {e}")
+        
         # Save to log file
         log_file = Path("logs") / "run_history.jsonl"
         with open(log_file, "a") as f:
             f.write(json.dumps(run_data) + "\n")
+        
+        return run_data
     
     def run_daily_scraping(self):
         """Run the complete daily scraping and curation process"""
         self.logger.info(f"=== Starting daily scraping process at {datetime.now()} ===")
+        started = time.time()
         
         try:
             # Environment validation
@@ -225,31 +372,56 @@ class ProductionScheduler:
                     self.logger.error("Database health check failed, aborting")
                     return
             
+            # Resume this host's unfinished run for today, or start a new one
+            checkpoint = RunCheckpoint.start()
+            tracing.start_trace(f"run-{checkpoint.run_id}")
+            
             # Run scrapers
-            results = []
-            successful_scrapers = 0
+            if checkpoint.stage_done('scraping'):
+                self.logger.info("⏭️  Scraping already completed in this run")
+                results = [ScraperResult(**r) for r in checkpoint.stage_result('scraping')]
+            elif self.config.distributed_scraping:
+                results = self._run_distributed_scrapers()
+            else:
+                results = []
+                for platform, scraper_func, available in self.scrapers:
+                    if not available:
+                        self.logger.info(f"⏭️  Skipping {platform} (requirements not met)")
+                        continue
+                    
+                    results.append(self._run_checkpointed_scraper(checkpoint, platform, scraper_func))
             
-            for platform, scraper_func, available in self.scrapers:
-                if not available:
-                    self.logger.info(f"⏭️  Skipping {platform} (requirements not met)")
-                    continue
-                
-                result = self._run_scraper_with_retry(platform, scraper_func)
-                results.append(result)
-                
-                if result.success:
-                    successful_scrapers += 1
+            if not checkpoint.stage_done('scraping'):
+                checkpoint.finish_stage('scraping', True, [asdict(r) for r in results])
+            
+            successful_scrapers = sum(1 for r in results if r.success)
             
             # Run curation if at least one scraper succeeded
             curation_success = False
-            if successful_scrapers > 0:
+            if checkpoint.stage_done('curation'):
+                self.logger.info("⏭️  Curation already completed in this run")
+                curation_success = True
+            elif successful_scrapers > 0:
                 self.logger.info("Running curation algorithm...")
-                curation_success = self._run_curation_with_retry()
+                with tracing.span('curation stage'):
+                    curation_success = self._run_curation_with_retry()
+                checkpoint.finish_stage('curation', curation_success)
             else:
                 self.logger.warning("No scrapers succeeded, skipping curation")
             
+            # Archive stale content after curation so today's picks are protected
+            archival = None
+            if checkpoint.stage_done('archival'):
+                archival = checkpoint.stage_result('archival')
+            elif self.config.enable_archival:
+                with tracing.span('archival stage'):
+                    archival = self._run_archival()
+                checkpoint.finish_stage('archival', archival is not None, archival)
+            
             # Save results and update status
-            self._save_run_results(results, curation_success)
+            run_data = self._save_run_results(results, curation_success, archival, checkpoint.run_id)
+            checkpoint.complete()
+            metrics_server.record_run(time.time() - started, successful_scrapers > 0 and curation_success)
             
             if successful_scrapers > 0 and curation_success:
                 self.last_successful_run = datetime.now()
@@ -264,56 +436,141 @@ class ProductionScheduler:
                 self.logger.info(f"{status} {result.platform}: {result.duration:.2f}s")
             
             self.logger.info(f"=== Process completed at {datetime.now()} ===")
+            return run_data
             
         except Exception as e:
             self.logger.error(f"Critical error in daily scraping process: {e}")
+            metrics_server.record_run(time.time() - started, False)
+            return None
+    
+    def _resume_unfinished_run(self):
+        """Finish a run interrupted by a restart instead of waiting for tomorrow"""
+        try:
+            checkpoint = RunCheckpoint.find_unfinished()
+        except Exception as e:
+            self.logger.warning(f"Could not check for unfinished runs: {e}")
+            return
+        
+        if checkpoint:
+            self.logger.info(f"♻️  Found unfinished run {checkpoint.run_id}, resuming")
+            self.run_daily_scraping()
+    
+    def _scheduled_health_check(self):
+        self.health_status = self._perform_health_check()
+    
+    def _heartbeat(self):
+        self.logger.info(f"💓 Scheduler heartbeat - Next run: {self.jobs.next_run()}")
+    
+    def _schedule_jobs(self):
+        """Register the scraping runs, health checks and heartbeat"""
+        # Scraping runs inline on the loop thread, one job per configured time/interval
+        for spec in self.config.schedule_time.split(','):
+            cadence = parse_cadence(spec)
+            self.jobs.add(f"daily_scraping {spec.strip()}", self.run_daily_scraping, cadence)
+            self.logger.info(f"📅 Scheduled scraping {cadence}")
+        
+        if self.config.adaptive_crawl:
+            self._schedule_adaptive_crawls()
+        
+        if self.config.engagement_refresh_interval:
+            self.jobs.add('engagement_refresh', self._run_engagement_refresh,
+                          Every(parse_duration(self.config.engagement_refresh_interval)))
+        
+        # Health checks and the heartbeat get their own thread so a long
+        # scrape never delays them
+        if self.config.enable_health_checks:
+            self.jobs.add('health_check', self._scheduled_health_check,
+                          Every(self.config.health_check_interval), lane='health')
+        self.jobs.add('heartbeat', self._heartbeat, Every(3600), lane='health')
+    
+    def _crawl_policy(self) -> CrawlPolicy:
+        return CrawlPolicy(
+            min_interval=self.config.crawl_min_interval,
+            max_interval=self.config.crawl_max_interval,
+            target_fill=self.config.crawl_target_fill
+        )
+    
+    def _schedule_adaptive_crawls(self):
+        """Crawl each platform between daily runs at an interval learned from its yield"""
+        available = [(platform, func) for platform, func, ok in self.scrapers if ok]
+        policy = self._crawl_policy()
+        try:
+            estimates = learn_intervals([platform for platform, _ in available], policy)
+        except Exception as e:
+            self.logger.warning(f"Could not learn crawl intervals, using defaults: {e}")
+            estimates = {}
+        
+        for platform, scraper_func in available:
+            estimate = estimates.get(platform)
+            interval = estimate.interval_seconds if estimate else policy.default_interval
+            self._schedule_crawl(platform, scraper_func, interval)
+    
+    def _schedule_crawl(self, platform: str, scraper_func: callable, interval: float):
+        self.jobs.add(f"crawl {platform}", lambda: self._run_adaptive_crawl(platform, scraper_func),
+                      Every(interval))
+        self.logger.info(f"🔁 Crawling {platform} every {interval / 3600:.1f}h")
+    
+    def _run_adaptive_crawl(self, platform: str, scraper_func: callable):
+        """One between-runs crawl, then reschedule from the updated yield"""
+        with leader_lock(f"crawl:{platform}") as leadership:
+            if not leadership.acquired:
+                return
+            result = self._run_scraper_with_retry(platform, scraper_func, max_retries=0)
+        
+        metrics_server.record_scraper_results([result])
+        try:
+            run_history.record_results(None, [result])
+            estimate = learn_intervals([platform], self._crawl_policy())[platform]
+        except Exception as e:
+            self.logger.warning(f"Could not update {platform} crawl interval: {e}")
+            return
+        
+        self.logger.info(f"{platform} crawl: {result.items_scraped}/{result.items_parsed} new, "
+                         f"next in {estimate.interval_seconds / 3600:.1f}h ({estimate.reason})")
+        self._schedule_crawl(platform, scraper_func, estimate.interval_seconds)
+    
+    def _run_engagement_refresh(self):
+        """Re-poll likes/views/comments for recent high-potential items (one replica)"""
+        from engagement_refresh import refresh_engagement
+        
+        with leader_lock('engagement_refresh') as leadership:
+            if leadership.acquired:
+                refresh_engagement()
     
     def start_scheduler(self):
         """Start the scheduler with health monitoring"""
         self.logger.info(f"🚀 Production scheduler starting...")
-        self.logger.info(f"📅 Scheduled daily scraping at {self.config.schedule_time} IST")
         
         # Validate environment at startup
         if not self._validate_environment():
             self.logger.error("❌ Environment validation failed, exiting")
             sys.exit(1)
         
-        # Schedule the main job
-        schedule.every().day.at(self.config.schedule_time).do(self.run_daily_scraping)
+        if self.config.metrics_port:
+            metrics_server.start_metrics_server(self, self.config.metrics_port)
         
-        # Schedule health checks if enabled
-        if self.config.enable_health_checks:
-            schedule.every(self.config.health_check_interval).seconds.do(self._perform_health_check)
+        self._schedule_jobs()
+        self._resume_unfinished_run()
         
         self.logger.info("⏰ Scheduler started. Waiting for scheduled jobs...")
         
-        # Main scheduler loop
+        # Sleep until the next job is due; signals wake the loop immediately
         while self.running:
             try:
-                schedule.run_pending()
-                time.sleep(60)  # Check every minute
-                
-                # Log heartbeat every hour
-                if datetime.now().minute == 0:
-                    next_run = schedule.next_run()
-                    self.logger.info(f"💓 Scheduler heartbeat - Next run: {next_run}")
-                    
+                self.jobs.run_pending()
+                if self.running:
+                    self.jobs.wait()
             except Exception as e:
                 self.logger.error(f"Scheduler loop error: {e}")
-                time.sleep(60)  # Continue after errors
+                time.sleep(5)  # Continue after errors
         
+        self.jobs.shutdown()
         self.logger.info("🛑 Scheduler shutdown completed")
 
 def main():
     """Main entry point"""
     # Create configuration from environment
-    config = SchedulerConfig(
-        schedule_time=os.environ.get('SCHEDULE_TIME', '03:00'),
-        max_retries=int(os.environ.get('MAX_RETRIES', '3')),
-        retry_delay=int(os.environ.get('RETRY_DELAY', '300')),
-        health_check_interval=int(os.environ.get('HEALTH_CHECK_INTERVAL', '3600')),
-        enable_health_checks=os.environ.get('ENABLE_HEALTH_CHECKS', 'true').lower() == 'true'
-    )
+    config = SchedulerConfig.from_env()
     
     # Start scheduler
     scheduler = ProductionScheduler(config)
@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+"""
+Stored score components for reweighting without recomputing features.
+
+Rescoring writes each item's unweighted component scores (engagement,
+trending, image quality, tag relevance, platform) to score_features as
+REAL columns. Recency is derived from publishedAt when the weights are
+applied, since it changes with time. A weight change then becomes one
+SQL UPDATE over the stored features, or a numpy dot product over a
+FeatureMatrix for what-if analysis, with the same weights
+(ScoreWeights) that per-item scoring uses.
+
+Usage:
+    python score_features.py backfill
+    python score_features.py reweight --weights engagement=0.5,platform=0.15 [--dry-run]
+"""
+import argparse
+import json
+import logging
+import sys
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from psycopg2.extras import execute_values
+
+from curation_candidates import MIN_CANDIDATE_SCORE, refresh_platforms
+from database import get_db_connection
+from inspiration import Inspiration
+from scoring_optimized import (RECENCY_FLOOR, RECENCY_STEPS, RECENCY_UNKNOWN,
+                               OptimizedScoring, ScoreWeights)
+
+logger = logging.getLogger(__name__)
+
+# Column order of FeatureMatrix.features and weight_vector()
+FEATURES = ('engagement', 'trending', 'image_quality', 'recency', 'tag_relevance', 'platform')
+
+@dataclass
+class ReweightResult:
+    rows: int = 0
+    changed: int = 0
+    crossed_threshold: int = 0  # Moved across MIN_CANDIDATE_SCORE (dry run only)
+    mean_abs_change: Optional[float] = None  # Dry run only
+    duration: float = 0.0
+
+def store_features(cursor, rows: Iterable[Tuple[str, Dict[str, Optional[float]]]]) -> int:
+    """Upsert (inspirationId, score_components()) rows; the caller commits"""
+    values = [(
+        inspiration_id, c['engagement'], c['trending'], c['image_quality'],
+        c['tag_relevance'], c['platform']
+    ) for inspiration_id, c in rows]
+    if not values:
+        return 0
+    execute_values(cursor, """
+        INSERT INTO score_features (
+            "inspirationId", engagement, trending, "imageQuality", "tagRelevance", "platformScore", "computedAt"
+        ) VALUES %s
+        ON CONFLICT ("inspirationId") DO UPDATE SET
+            engagement = EXCLUDED.engagement,
+            trending = EXCLUDED.trending,
+            "imageQuality" = EXCLUDED."imageQuality",
+            "tagRelevance" = EXCLUDED."tagRelevance",
+            "platformScore" = EXCLUDED."platformScore",
+            "computedAt" = EXCLUDED."computedAt"
+    """, values, template="(%s, %s, %s, %s, %s, %s, CURRENT_TIMESTAMP)", page_size=len(values))
+    return len(values)
+
+def weight_vector(weights: ScoreWeights) -> np.ndarray:
+    """Weights in FEATURES order; trending stands in for engagement when unknown"""
+    return np.array([
+        weights.engagement * (1 - weights.trending_share),
+        weights.engagement * weights.trending_share,
+        weights.image_quality,
+        weights.recency,
+        weights.tag_relevance,
+        weights.platform,
+    ])
+
+def epoch(moment: datetime) -> float:
+    """Seconds for a naive timestamp, matching EXTRACT(EPOCH FROM timestamp) in SQL"""
+    return moment.replace(tzinfo=timezone.utc).timestamp()
+
+def recency_scores(published_epoch: np.ndarray, as_of: Optional[datetime] = None) -> np.ndarray:
+    """Vectorized _calculate_recency_score_optimized; NaN epochs score as unknown"""
+    hours_old = (epoch(as_of or datetime.now()) - published_epoch) / 3600
+    known = ~np.isnan(published_epoch)
+    return np.select(
+        [~known] + [known & (hours_old <= max_hours) for max_hours, _ in RECENCY_STEPS],
+        [RECENCY_UNKNOWN] + [score for _, score in RECENCY_STEPS],
+        default=RECENCY_FLOOR
+    ).astype(np.float64)
+
+class FeatureMatrix:
+    """Stored features of active items, loaded once for vectorized scoring"""
+
+    def __init__(self, ids: List[str], platforms: np.ndarray, authors: np.ndarray,
+                 published_epoch: np.ndarray, scraped_epoch: np.ndarray, features: np.ndarray,
+                 scores: np.ndarray, tags: Optional[List[List[str]]] = None):
+        self.ids = ids
+        self.platforms = platforms
+        self.authors = authors
+        self.published_epoch = published_epoch
+        self.scraped_epoch = scraped_epoch
+        self.tags = tags
+        self.features = features  # (n, len(FEATURES)); the recency column is filled per call
+        self.stored_scores = scores
+
+    def __len__(self):
+        return len(self.ids)
+
+    @classmethod
+    def load(cls, include_archived: bool = False, with_tags: bool = False,
+             fetch_size: int = 50000) -> 'FeatureMatrix':
+        conn = get_db_connection()
+        cursor = conn.cursor(name='feature_matrix')  # Server-side, streamed in chunks
+        try:
+            cursor.itersize = fetch_size
+            cursor.execute("""
+                SELECT i.id, i.platform, i."authorName", EXTRACT(EPOCH FROM i."publishedAt"), i.score,
+                       f.engagement, COALESCE(f.trending, f.engagement), f."imageQuality",
+                       f."tagRelevance", f."platformScore",
+                       EXTRACT(EPOCH FROM i."scrapedAt"), CASE WHEN %s THEN i.tags END
+                FROM score_features f
+                JOIN inspirations i ON i.id = f."inspirationId"
+                WHERE %s OR i.archived = false
+            """, (with_tags, include_archived))
+            rows = list(cursor)
+        finally:
+            cursor.close()
+            conn.close()
+
+        n = len(rows)
+        features = np.zeros((n, len(FEATURES)))
+        if n:
+            stored = np.array([row[5:10] for row in rows], dtype=np.float64)
+            features[:, [0, 1, 2, 4, 5]] = stored
+        return cls(
+            ids=[row[0] for row in rows],
+            platforms=np.array([row[1] for row in rows], dtype=object),
+            authors=np.array([row[2] for row in rows], dtype=object),
+            published_epoch=np.array([np.nan if row[3] is None else float(row[3]) for row in rows]),
+            scraped_epoch=np.array([float(row[10]) for row in rows]),
+            features=features,
+            scores=np.array([row[4] for row in rows], dtype=np.float64),
+            tags=[row[11] or [] for row in rows] if with_tags else None,
+        )
+
+    def scores(self, weights: ScoreWeights, as_of: Optional[datetime] = None) -> np.ndarray:
+        """One dot product for every item under `weights`, clamped to 0-100"""
+        self.features[:, 3] = recency_scores(self.published_epoch, as_of)
+        return np.clip(self.features @ weight_vector(weights), 0, 100)
+
+def _recency_sql() -> str:
+    steps = ' '.join(
+        f"WHEN i.\"publishedAt\" >= LOCALTIMESTAMP - make_interval(hours => {max_hours}) THEN {score}"
+        for max_hours, score in RECENCY_STEPS
+    )
+    return f"CASE WHEN i.\"publishedAt\" IS NULL THEN {RECENCY_UNKNOWN} {steps} ELSE {RECENCY_FLOOR} END"
+
+def score_sql() -> str:
+    """SQL form of ScoreWeights.combine over score_features f / inspirations i"""
+    return f"""LEAST(GREATEST(
+        f.engagement * %(engagement)s +
+        COALESCE(f.trending, f.engagement) * %(trending)s +
+        f."imageQuality" * %(image_quality)s +
+        ({_recency_sql()}) * %(recency)s +
+        f."tagRelevance" * %(tag_relevance)s +
+        f."platformScore" * %(platform)s,
+    0), 100)"""
+
+def _sql_params(weights: ScoreWeights) -> Dict[str, float]:
+    return dict(zip(FEATURES, weight_vector(weights).tolist()))
+
+def reweight(weights: ScoreWeights, dry_run: bool = False) -> ReweightResult:
+    """
+    Apply `weights` to every active item with stored features. A dry run
+    scores in memory and reports the effect without writing.
+    """
+    started = time.time()
+    result = ReweightResult()
+
+    if dry_run:
+        matrix = FeatureMatrix.load()
+        new_scores = matrix.scores(weights)
+        delta = new_scores - matrix.stored_scores
+        result.rows = len(matrix)
+        result.changed = int(np.count_nonzero(np.abs(delta) > 1e-4))
+        result.crossed_threshold = int(np.count_nonzero(
+            (matrix.stored_scores >= MIN_CANDIDATE_SCORE) != (new_scores >= MIN_CANDIDATE_SCORE)))
+        result.mean_abs_change = float(np.abs(delta).mean()) if len(matrix) else None
+        result.duration = time.time() - started
+        return result
+
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    try:
+        # updatedAt is left alone: the content did not change, and stored
+        # features count as stale once updatedAt passes their computedAt
+        cursor.execute(f"""
+            UPDATE inspirations AS target
+            SET score = scored.score
+            FROM (
+                SELECT i.id, {score_sql()} AS score
+                FROM score_features f
+                JOIN inspirations i ON i.id = f."inspirationId"
+                WHERE i.archived = false
+            ) scored
+            WHERE target.id = scored.id
+              AND abs(target.score - scored.score) > 1e-4
+        """, _sql_params(weights))
+        result.changed = cursor.rowcount
+        cursor.execute("SELECT COUNT(*) FROM score_features")
+        result.rows = cursor.fetchone()[0]
+        cursor.execute("SELECT DISTINCT platform FROM inspirations WHERE archived = false")
+        refresh_platforms(cursor, [row[0] for row in cursor.fetchall()])
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cursor.close()
+        conn.close()
+
+    result.duration = time.time() - started
+    logger.info(f"Reweighted {result.changed}/{result.rows} scores in {result.duration:.1f}s")
+    return result
+
+def backfill(batch_size: int = 1000) -> int:
+    """Compute features for active items that have none or whose row changed since"""
+    scorer = OptimizedScoring()
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    written, after = 0, ''
+    try:
+        while True:
+            cursor.execute("""
+                SELECT i.id, i.title, i.description, i."thumbnailUrl", i."contentUrl", i.platform,
+                       i."authorName", i."authorUrl", i.tags, i."publishedAt", i."sourceMeta"
+                FROM inspirations i
+                LEFT JOIN score_features f ON f."inspirationId" = i.id
+                WHERE i.archived = false AND i.id > %s
+                  AND (f."inspirationId" IS NULL OR f."computedAt" < i."updatedAt")
+                ORDER BY i.id
+                LIMIT %s
+            """, (after, batch_size))
+            rows = cursor.fetchall()
+            if not rows:
+                break
+            items = [Inspiration.from_row(row) for row in rows]
+            scorer.attach_velocities(cursor, items)
+            written += store_features(cursor, ((item.id, scorer.score_components(item)) for item in items))
+            conn.commit()
+            after = rows[-1][0]
+            logger.info(f"Stored features for {written} inspirations")
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cursor.close()
+        conn.close()
+    return written
+
+def main():
+    parser = argparse.ArgumentParser(description='Score feature store')
+    commands = parser.add_subparsers(dest='command', required=True)
+    commands.add_parser('backfill', help='Compute missing or stale features')
+    apply = commands.add_parser('reweight', help='Rescore from stored features with new weights')
+    apply.add_argument('--weights', default='', help="e.g. 'engagement=0.5,platform=0.15'")
+    apply.add_argument('--dry-run', action='store_true', help='Report the effect without writing')
+    apply.add_argument('--skip-backfill', action='store_true')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+    from dotenv import load_dotenv
+    load_dotenv()
+
+    if args.command == 'backfill':
+        print(f"Stored features for {backfill()} inspirations")
+        return
+
+    weights = ScoreWeights.parse(args.weights)
+    if not args.skip_backfill:
+        backfill()
+    result = reweight(weights, dry_run=args.dry_run)
+    print(json.dumps(asdict(result), indent=2))
+    if not args.dry_run and args.weights:
+        print(f"Set SCORE_WEIGHTS={args.weights} for the scrapers and the worker so ingest, "
+              f"engagement refresh and rescoring use the same weights",
+              file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
@@ -1,76 +1,127 @@
+from dataclasses import dataclass, fields
 from datetime import datetime, timedelta
 import math
 import logging
-from typing import Dict, Any, List, Optional
-import psycopg2
 import os
+from typing import Dict, Any, List, Optional, Union
+from database import get_db_connection
+from curation_candidates import note_score_changes
+from coordination import leader_only
+from engagement_history import METRICS, TREND_SCALE, TREND_WEIGHTS, SnapshotPolicy, load_velocities
+from inspiration import Inspiration, as_record
 
 logger = logging.getLogger(__name__)
 
+# Share of the engagement weight given to velocity when an item has history
+TRENDING_SHARE = 1 / 3
+
+# Recency score by age: (max hours old, score); older items get RECENCY_FLOOR
+RECENCY_STEPS = ((24, 100), (48, 90), (168, 80), (720, 60), (2160, 40))
+RECENCY_FLOOR = 20
+RECENCY_UNKNOWN = 30  # No publishedAt
+
+@dataclass(frozen=True)
+class ScoreWeights:
+    """
+    Component weights shared by per-item scoring, the vectorized
+    reweighting over stored features and its SQL form (score_features.py).
+    """
+    engagement: float = 0.45
+    image_quality: float = 0.15
+    recency: float = 0.10
+    tag_relevance: float = 0.10
+    platform: float = 0.20
+    trending_share: float = TRENDING_SHARE  # Part of the engagement weight
+
+    @classmethod
+    def parse(cls, spec: str) -> 'ScoreWeights':
+        """'engagement=0.5,platform=0.15' -> defaults with those overridden"""
+        names = {f.name for f in fields(cls)}
+        overrides = {}
+        for pair in filter(None, (p.strip() for p in spec.split(','))):
+            name, _, value = pair.partition('=')
+            if name.strip() not in names:
+                raise ValueError(f"unknown score weight: {name.strip()}")
+            overrides[name.strip()] = float(value)
+        return cls(**overrides)
+
+    @classmethod
+    def from_env(cls) -> 'ScoreWeights':
+        return cls.parse(os.environ.get('SCORE_WEIGHTS', ''))
+
+    def combine(self, components: Dict[str, Optional[float]]) -> float:
+        """Weighted 0-100 score from score_components() output"""
+        engagement = components['engagement']
+        trending = components['trending']
+        if trending is None:
+            trending = engagement  # No history: the whole slice goes to totals
+        score = (
+            engagement * self.engagement * (1 - self.trending_share) +
+            trending * self.engagement * self.trending_share +
+            components['image_quality'] * self.image_quality +
+            components['recency'] * self.recency +
+            components['tag_relevance'] * self.tag_relevance +
+            components['platform'] * self.platform
+        )
+        return min(max(score, 0), 100)
+
 class OptimizedScoring:
     """
     Optimized scoring system that pre-calculates and caches scores for better performance.
     Supports batch processing and incremental updates.
     """
     
-    def __init__(self):
+    def __init__(self, weights: Optional[ScoreWeights] = None):
         self.conn = None
         self.cursor = None
+        self.weights = weights or ScoreWeights.from_env()
         
     def get_connection(self):
         """Get database connection"""
         if not self.conn or self.conn.closed:
-            self.conn = psycopg2.connect(os.environ['DATABASE_URL'])
+            self.conn = get_db_connection()
         return self.conn
 
-    def calculate_score_optimized(self, inspiration_data: Dict[str, Any]) -> float:
+    def score_components(self, inspiration: Union[Inspiration, Dict[str, Any]]) -> Dict[str, Optional[float]]:
+        """
+        Unweighted 0-100 component scores. trending is None unless the item
+        carries a velocity (see attach_velocities).
+        """
+        record = as_record(inspiration)
+        velocity = record.velocity
+        return {
+            # Engagement metrics - optimized calculation
+            'engagement': self._calculate_engagement_score_optimized(record),
+            # How fast engagement is growing
+            'trending': self._calculate_trending_score_optimized(velocity) if velocity is not None else None,
+            # Image quality - enhanced heuristics
+            'image_quality': self._calculate_image_quality_score_optimized(record),
+            # Recency - cached time calculations
+            'recency': self._calculate_recency_score_optimized(record.published_at),
+            # Tag relevance - optimized tag matching
+            'tag_relevance': self._calculate_tag_relevance_score_optimized(record.tags),
+            # Platform bonus - cached platform scores
+            'platform': self._get_platform_score_cached(record.platform),
+        }
+
+    def calculate_score_optimized(self, inspiration_data: Union[Inspiration, Dict[str, Any]]) -> float:
         """
         Optimized score calculation with improved performance.
-        Cached intermediate calculations and vectorized operations where possible.
+        Engagement 45% (a third of it velocity when known), image quality 15%,
+        recency 10%, tag relevance 10%, platform 20% by default.
         """
         try:
-            score = 0
-            
-            # Engagement metrics (45%) - optimized calculation
-            engagement_score = self._calculate_engagement_score_optimized(
-                inspiration_data.get('sourceMeta', {})
-            )
-            score += engagement_score * 0.45
-            
-            # Image quality (15%) - enhanced heuristics
-            image_quality_score = self._calculate_image_quality_score_optimized(inspiration_data)
-            score += image_quality_score * 0.15
-            
-            # Recency (10%) - cached time calculations
-            recency_score = self._calculate_recency_score_optimized(
-                inspiration_data.get('publishedAt')
-            )
-            score += recency_score * 0.10
-            
-            # Tag relevance (10%) - optimized tag matching
-            tag_relevance_score = self._calculate_tag_relevance_score_optimized(
-                inspiration_data.get('tags', [])
-            )
-            score += tag_relevance_score * 0.10
-            
-            # Platform bonus (20%) - cached platform scores
-            platform_score = self._get_platform_score_cached(
-                inspiration_data.get('platform', '')
-            )
-            score += platform_score * 0.20
-            
-            return min(max(score, 0), 100)  # Clamp between 0-100
-            
+            return self.weights.combine(self.score_components(inspiration_data))
         except Exception as e:
             logger.error(f"Error calculating optimized score: {e}")
             return 50.0  # Default fallback score
 
-    def _calculate_engagement_score_optimized(self, source_meta: Dict) -> float:
+    def _calculate_engagement_score_optimized(self, record: Inspiration) -> float:
         """Optimized engagement scoring with better normalization"""
-        likes = source_meta.get('likes', 0)
-        views = source_meta.get('views', 0)
-        comments = source_meta.get('comments', 0)
-        saves = source_meta.get('saves', 0)  # Additional metric
+        likes = record.likes
+        views = record.views
+        comments = record.comments
+        saves = record.saves  # Additional metric
         
         # Improved logarithmic normalization
         like_score = min(math.log10(likes + 1) * 20, 100) if likes > 0 else 0
@@ -90,26 +141,45 @@ class OptimizedScoring:
         
         return min(total_score, 100)
 
-    def _calculate_image_quality_score_optimized(self, inspiration_data: Dict) -> float:
+    def _calculate_trending_score_optimized(self, velocity: Dict[str, float]) -> float:
+        """Engagement gained per hour (see engagement_history.trending_scores)"""
+        weighted = sum(max(velocity.get(name) or 0, 0) * TREND_WEIGHTS[name] for name in METRICS)
+        return min(math.log10(weighted + 1) * TREND_SCALE, 100)
+
+    def attach_velocities(self, cursor, items: List[Inspiration],
+                          window_hours: Optional[float] = None) -> int:
+        """
+        Set each record's velocity from engagement snapshots for a batch in
+        one query. Records without enough history are left as they are.
+        """
+        if window_hours is None:
+            window_hours = SnapshotPolicy.from_env().velocity_window_hours
+        found = load_velocities(cursor, [item.id for item in items if item.id], window_hours)
+        for item in items:
+            if item.id in found:
+                item.velocity = found[item.id]
+        return len(found)
+
+    def _calculate_image_quality_score_optimized(self, record: Inspiration) -> float:
         """Enhanced image quality scoring with multiple heuristics"""
         score = 30  # Base score
         
         # Check for thumbnail
-        if inspiration_data.get('thumbnailUrl'):
+        thumbnail_url = record.thumbnail_url or ''
+        if thumbnail_url:
             score += 25
             
         # Check for high-resolution indicators in URL
-        thumbnail_url = inspiration_data.get('thumbnailUrl', '')
         if any(indicator in thumbnail_url.lower() for indicator in ['1200', 'hd', 'high', '2x']):
             score += 15
             
         # Platform-specific quality indicators
-        platform = inspiration_data.get('platform', '').lower()
+        platform = record.platform.lower()
         if platform in ['behance', 'dribbble', 'awwwards']:
             score += 10  # These platforms typically have higher quality standards
             
         # Content type indicators
-        tags = inspiration_data.get('tags', [])
+        tags = record.tags
         quality_tags = ['high-quality', 'premium', 'professional', '4k', 'retina']
         if any(tag.lower() in ' '.join(tags).lower() for tag in quality_tags):
             score += 10
@@ -119,28 +189,19 @@ class OptimizedScoring:
     def _calculate_recency_score_optimized(self, published_at) -> float:
         """Optimized recency calculation with caching"""
         if not published_at:
-            return 30
+            return RECENCY_UNKNOWN
         
         # Cache current time to avoid repeated calls
         now = datetime.now()
         if published_at.tzinfo:
             now = now.replace(tzinfo=published_at.tzinfo)
         
-        # More granular recency scoring
+        # More granular recency scoring: 1 day, 2 days, 1 week, 1 month, 3 months
         hours_old = (now - published_at).total_seconds() / 3600
-        
-        if hours_old <= 24:
-            return 100
-        elif hours_old <= 48:
-            return 90
-        elif hours_old <= 168:  # 1 week
-            return 80
-        elif hours_old <= 720:  # 1 month
-            return 60
-        elif hours_old <= 2160:  # 3 months
-            return 40
-        else:
-            return 20
+        for max_hours, score in RECENCY_STEPS:
+            if hours_old <= max_hours:
+                return score
+        return RECENCY_FLOOR
 
     def _calculate_tag_relevance_score_optimized(self, tags: List[str]) -> float:
         """Optimized tag relevance with weighted scoring"""
@@ -197,6 +258,7 @@ class OptimizedScoring:
         
         return platform_scores.get(platform, 50)
 
+    @leader_only('rescore', skipped=0)
     def batch_update_scores(self, batch_size: int = 100) -> int:
         """
         Batch update scores for inspirations that need recalculation.
@@ -219,36 +281,34 @@ class OptimizedScoring:
             
             inspirations = self.cursor.fetchall()
             updated_count = 0
+            score_changes = []
             
-            for inspiration in inspirations:
-                inspiration_data = {
-                    'id': inspiration[0],
-                    'title': inspiration[1],
-                    'description': inspiration[2],
-                    'thumbnailUrl': inspiration[3],
-                    'contentUrl': inspiration[4],
-                    'platform': inspiration[5],
-                    'authorName': inspiration[6],
-                    'authorUrl': inspiration[7],
-                    'tags': inspiration[8],
-                    'publishedAt': inspiration[9],
-                    'sourceMeta': inspiration[10] or {}
-                }
-                
-                new_score = self.calculate_score_optimized(inspiration_data)
+            batch = [Inspiration.from_row(inspiration) for inspiration in inspirations]
+            self.attach_velocities(self.cursor, batch)
+            features = []
+            
+            for inspiration_data in batch:
+                components = self.score_components(inspiration_data)
+                features.append((inspiration_data.id, components))
+                new_score = self.weights.combine(components)
                 
                 # Update score in database
                 self.cursor.execute("""
                     UPDATE inspirations 
                     SET score = %s, "updatedAt" = CURRENT_TIMESTAMP
                     WHERE id = %s
-                """, (new_score, inspiration_data['id']))
+                """, (new_score, inspiration_data.id))
+                score_changes.append((inspiration_data.id, inspiration_data.platform, new_score))
                 
                 updated_count += 1
                 
                 if updated_count % 10 == 0:
                     logger.info(f"Updated scores for {updated_count} inspirations")
             
+            note_score_changes(self.cursor, score_changes)
+            from score_features import store_features
+            store_features(self.cursor, features)
+            
             self.conn.commit()
             logger.info(f"Batch score update completed: {updated_count} records updated")
             return updated_count
@@ -264,27 +324,17 @@ class OptimizedScoring:
             if self.conn:
                 self.conn.close()
 
-    def recalculate_all_scores(self) -> bool:
+    @leader_only('rescore', skipped=False)
+    def recalculate_all_scores(self, workers: Optional[int] = None) -> bool:
         """
         Recalculate all scores in the database.
-        Use carefully as this can be a long-running operation.
+        Runs the sharded multi-process rescore (see rescore.py) under the
+        same election as batch_update_scores and the rescore CLI.
         """
+        from rescore import rescore_all
         try:
-            batch_size = 50  # Smaller batches for full recalculation
-            total_updated = 0
-            
-            while True:
-                updated = self.batch_update_scores(batch_size)
-                total_updated += updated
-                
-                if updated < batch_size:
-                    break  # No more records to update
-                
-                logger.info(f"Progress: {total_updated} scores recalculated")
-            
-            logger.info(f"Full score recalculation completed: {total_updated} total updates")
+            rescore_all(workers=workers, show_progress=False)
             return True
-            
         except Exception as e:
             logger.error(f"Full score recalculation failed: {e}")
             return False
@@ -0,0 +1,390 @@
+#!/usr/bin/env python3
+"""
+Postgres work queue that spreads a day's scraping across replicas.
+
+Each (run date, platform, page) is a row in scrape_tasks. Any number of
+scheduler/worker processes seed the same rows idempotently, claim pending
+ones with FOR UPDATE SKIP LOCKED under a time-limited lease, renew the
+lease with heartbeats while the page is scraped, and pick up pages whose
+lease expired because their owner died. A page that failed with a
+retryable error is not claimable again until its backoff (availableAt)
+has passed, and a worker whose lease was reclaimed stops working on it.
+"""
+import argparse
+import json
+import logging
+import os
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Dict, Iterable, List, Optional
+
+import tracing
+from database import get_db_connection
+from pipeline import run_source
+from registry import SCRAPERS, load_source
+from retry import RETRYABLE, RetryPolicy, classify, retry_after_seconds
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_LEASE_SECONDS = 300
+MAX_ATTEMPTS = 3
+IDLE_POLL_INTERVAL = 5  # While peers still hold leases or tasks back off
+# Backoff before a retryable failure may be claimed again
+TASK_RETRY_POLICY = RetryPolicy(max_attempts=MAX_ATTEMPTS, base_delay=30.0, max_delay=600.0,
+                                max_retry_after=600.0)
+
+@dataclass
+class ScrapeTask:
+    id: str
+    platform: str  # Registry key, e.g. 'behance'
+    page: int
+    attempts: int
+
+@dataclass
+class PlatformSummary:
+    """What this worker did for one platform"""
+    platform: str
+    tasks_done: int = 0
+    tasks_failed: int = 0
+    pages_fetched: int = 0
+    items_parsed: int = 0
+    items_scraped: int = 0
+    duration: float = 0.0
+    errors: List[str] = field(default_factory=list)
+
+    @property
+    def success(self) -> bool:
+        return self.tasks_failed == 0
+
+def default_worker_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+def seed_tasks(run_date: date, platforms: Iterable[str]) -> int:
+    """Create one pending task per page for each platform. Returns rows created."""
+    rows = []
+    for key in platforms:
+        source = load_source(key)
+        rows.extend((run_date, key, page) for page in range(1, source.pages + 1))
+    if not rows:
+        return 0
+
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    try:
+        created = 0
+        for run_day, key, page in rows:
+            cursor.execute("""
+                INSERT INTO scrape_tasks (id, "runDate", platform, page)
+                VALUES (gen_random_uuid()::text, %s, %s, %s)
+                ON CONFLICT ("runDate", platform, page) DO NOTHING
+            """, (run_day, key, page))
+            created += cursor.rowcount
+        conn.commit()
+        return created
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cursor.close()
+        conn.close()
+
+def expire_leases(cursor, run_date: date, max_attempts: int = MAX_ATTEMPTS) -> int:
+    """Return expired leases to the queue, or fail them once out of attempts"""
+    cursor.execute("""
+        UPDATE scrape_tasks
+        SET status = CASE WHEN attempts >= %s THEN 'failed' ELSE 'pending' END,
+            error = 'Lease expired (worker ' || COALESCE("leaseOwner", '?') || ' stopped heartbeating)',
+            "finishedAt" = CASE WHEN attempts >= %s THEN CURRENT_TIMESTAMP END,
+            "leaseOwner" = NULL,
+            "leaseExpiresAt" = NULL
+        WHERE "runDate" = %s
+          AND status = 'leased'
+          AND "leaseExpiresAt" < CURRENT_TIMESTAMP
+    """, (max_attempts, max_attempts, run_date))
+    return cursor.rowcount
+
+def retry_delay(attempts: int, error: Optional[BaseException] = None,
+                policy: RetryPolicy = TASK_RETRY_POLICY) -> float:
+    """Seconds before a task that failed on attempt `attempts` may be claimed again"""
+    requested = retry_after_seconds(error) if error is not None else None
+    if requested is not None:
+        return min(requested, policy.max_retry_after)
+    return policy.next_delay(policy.base_delay * 2 ** max(attempts - 1, 0))
+
+def claim_task(worker_id: str, run_date: date, platforms: List[str],
+               lease_seconds: int = DEFAULT_LEASE_SECONDS) -> Optional[ScrapeTask]:
+    """Lease the next pending task; other workers skip rows we have locked"""
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    try:
+        reclaimed = expire_leases(cursor, run_date)
+        if reclaimed:
+            logger.warning(f"Reclaimed {reclaimed} scrape tasks with expired leases")
+
+        cursor.execute("""
+            UPDATE scrape_tasks
+            SET status = 'leased',
+                "leaseOwner" = %s,
+                "leaseExpiresAt" = CURRENT_TIMESTAMP + make_interval(secs => %s),
+                "heartbeatAt" = CURRENT_TIMESTAMP,
+                attempts = attempts + 1
+            WHERE id = (
+                SELECT id FROM scrape_tasks
+                WHERE "runDate" = %s
+                  AND status = 'pending'
+                  AND platform = ANY(%s)
+                  AND ("availableAt" IS NULL OR "availableAt" <= CURRENT_TIMESTAMP)
+                ORDER BY page, attempts, platform
+                LIMIT 1
+                FOR UPDATE SKIP LOCKED
+            )
+            RETURNING id, platform, page, attempts
+        """, (worker_id, lease_seconds, run_date, platforms))
+        row = cursor.fetchone()
+        conn.commit()
+        return ScrapeTask(*row) if row else None
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cursor.close()
+        conn.close()
+
+def renew_lease(task_id: str, worker_id: str, lease_seconds: int = DEFAULT_LEASE_SECONDS) -> bool:
+    """Extend our lease. False means it expired and was reclaimed by someone else."""
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    try:
+        cursor.execute("""
+            UPDATE scrape_tasks
+            SET "leaseExpiresAt" = CURRENT_TIMESTAMP + make_interval(secs => %s),
+                "heartbeatAt" = CURRENT_TIMESTAMP
+            WHERE id = %s AND "leaseOwner" = %s AND status = 'leased'
+        """, (lease_seconds, task_id, worker_id))
+        renewed = cursor.rowcount == 1
+        conn.commit()
+        return renewed
+    finally:
+        cursor.close()
+        conn.close()
+
+def finish_task(task: ScrapeTask, worker_id: str, pages_fetched: int, items_scraped: int,
+                error: Optional[str] = None, retryable: bool = True,
+                max_attempts: int = MAX_ATTEMPTS, delay: float = 0.0) -> str:
+    """
+    Record the outcome of a leased task. Retryable failures go back to
+    pending, claimable again after `delay` seconds, until they run out of
+    attempts. Returns the new status.
+    """
+    if error is None:
+        status = 'done'
+    else:
+        status = 'pending' if retryable and task.attempts < max_attempts else 'failed'
+
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    try:
+        cursor.execute("""
+            UPDATE scrape_tasks
+            SET status = %s,
+                "pagesFetched" = %s,
+                "itemsScraped" = "itemsScraped" + %s,
+                error = %s,
+                "leaseOwner" = NULL,
+                "leaseExpiresAt" = NULL,
+                "availableAt" = CASE WHEN %s = 'pending' THEN CURRENT_TIMESTAMP + make_interval(secs => %s) END,
+                "finishedAt" = CASE WHEN %s IN ('done', 'failed') THEN CURRENT_TIMESTAMP END
+            WHERE id = %s AND "leaseOwner" = %s
+        """, (status, pages_fetched, items_scraped, error, status, delay, status, task.id, worker_id))
+        if cursor.rowcount == 0:
+            logger.warning(f"Lost lease on {task.platform} page {task.page} before it finished")
+        conn.commit()
+        return status
+    finally:
+        cursor.close()
+        conn.close()
+
+def task_counts(run_date: date, platforms: Optional[List[str]] = None) -> Dict[str, int]:
+    """Tasks for the day by status, optionally only for `platforms`"""
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    try:
+        if platforms is None:
+            cursor.execute("""
+                SELECT status, COUNT(*) FROM scrape_tasks
+                WHERE "runDate" = %s
+                GROUP BY status
+            """, (run_date,))
+        else:
+            cursor.execute("""
+                SELECT status, COUNT(*) FROM scrape_tasks
+                WHERE "runDate" = %s AND platform = ANY(%s)
+                GROUP BY status
+            """, (run_date, list(platforms)))
+        counts = dict(cursor.fetchall())
+        conn.commit()
+        return counts
+    finally:
+        cursor.close()
+        conn.close()
+
+class LeaseHeartbeat:
+    """Renews a task's lease in the background while it is being scraped"""
+
+    def __init__(self, task: ScrapeTask, worker_id: str, lease_seconds: int):
+        self.task = task
+        self.worker_id = worker_id
+        self.lease_seconds = lease_seconds
+        self.lost = threading.Event()  # Set once another worker reclaimed the task
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True,
+                                        name=f"lease-{task.platform}-{task.page}")
+
+    def _run(self):
+        interval = max(self.lease_seconds / 3, 1)
+        while not self._stop.wait(interval):
+            try:
+                if not renew_lease(self.task.id, self.worker_id, self.lease_seconds):
+                    self.lost.set()
+                    logger.warning(f"Lease on {self.task.platform} page {self.task.page} was reclaimed")
+                    return
+            except Exception as e:
+                logger.error(f"Heartbeat for {self.task.platform} page {self.task.page} failed: {e}")
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+
+class TaskRunner:
+    """Claims and scrapes tasks for a run date until none are left anywhere"""
+
+    def __init__(self, worker_id: Optional[str] = None, run_date: Optional[date] = None,
+                 platforms: Optional[List[str]] = None, concurrency: int = 1,
+                 lease_seconds: int = DEFAULT_LEASE_SECONDS):
+        self.worker_id = worker_id or default_worker_id()
+        self.run_date = run_date or date.today()
+        # Only claim platforms whose API keys this replica has
+        self.platforms = platforms or [key for key, spec in SCRAPERS.items() if spec.available]
+        self.concurrency = concurrency
+        self.lease_seconds = lease_seconds
+        self.summaries: Dict[str, PlatformSummary] = {
+            key: PlatformSummary(SCRAPERS[key].name) for key in self.platforms
+        }
+        self._lock = threading.Lock()
+
+    def _run_task(self, task: ScrapeTask):
+        summary = self.summaries[task.platform]
+        logger.info(f"Scraping {summary.platform} page {task.page} (attempt {task.attempts})")
+
+        error = None
+        failure: Optional[BaseException] = None
+        pages_fetched = items_scraped = items_parsed = 0
+        duration = 0.0
+        heartbeat = LeaseHeartbeat(task, self.worker_id, self.lease_seconds)
+        try:
+            with heartbeat, \
+                    tracing.span(f"scrape {task.platform}", 'platform', page=task.page, attempt=task.attempts):
+                # The pipeline stops fetching and writing once the lease is lost
+                result = run_source(load_source(task.platform), pages=[task.page], stop=heartbeat.lost)
+            pages_fetched, items_parsed = result.pages_fetched, result.items_parsed
+            items_scraped, duration = result.items_scraped, result.duration
+            if result.failure is not None:
+                error = '; '.join(result.errors)
+                failure = result.failure
+        except Exception as e:
+            error = str(e)
+            failure = e
+
+        if heartbeat.lost.is_set():
+            # The page now belongs to whoever reclaimed it; leave its row alone
+            logger.warning(f"Stopped {summary.platform} page {task.page}: lease was reclaimed")
+            with self._lock:
+                summary.items_scraped += items_scraped
+            return
+
+        retryable = failure is None or classify(failure) in RETRYABLE
+        delay = retry_delay(task.attempts, failure) if error and retryable else 0.0
+        status = finish_task(task, self.worker_id, pages_fetched, items_scraped, error, retryable,
+                             delay=delay)
+        if status == 'pending':
+            logger.info(f"Requeued {summary.platform} page {task.page}, claimable again in {delay:.0f}s")
+
+        with self._lock:
+            summary.pages_fetched += pages_fetched
+            summary.items_parsed += items_parsed
+            summary.items_scraped += items_scraped
+            summary.duration += duration
+            if status == 'done':
+                summary.tasks_done += 1
+            elif status == 'failed':
+                summary.tasks_failed += 1
+            if error:
+                summary.errors.append(f"page {task.page}: {error}")
+
+    def _worker_loop(self):
+        while True:
+            task = claim_task(self.worker_id, self.run_date, self.platforms, self.lease_seconds)
+            if task:
+                self._run_task(task)
+                continue
+
+            # Nothing pending; wait while peers hold leases on our platforms that may still expire
+            counts = task_counts(self.run_date, self.platforms)
+            if not counts.get('leased') and not counts.get('pending'):
+                return
+            time.sleep(IDLE_POLL_INTERVAL)
+
+    def run(self, seed: bool = True) -> Dict[str, PlatformSummary]:
+        """Seed today's tasks (idempotent) and drain the queue"""
+        if not self.platforms:
+            return {}
+        if seed:
+            created = seed_tasks(self.run_date, self.platforms)
+            if created:
+                logger.info(f"Seeded {created} scrape tasks for {self.run_date}")
+
+        with ThreadPoolExecutor(max_workers=self.concurrency,
+                                thread_name_prefix='scrape-task') as executor:
+            for future in [executor.submit(self._worker_loop) for _ in range(self.concurrency)]:
+                future.result()
+
+        for summary in self.summaries.values():
+            logger.info(
+                f"{summary.platform}: {summary.tasks_done} pages done, {summary.tasks_failed} failed, "
+                f"{summary.items_scraped} new items on this worker"
+            )
+        return self.summaries
+
+def run_distributed_scrape(platforms: Optional[List[str]] = None,
+                           concurrency: Optional[int] = None) -> Dict[str, PlatformSummary]:
+    """Join today's shared scrape with settings from the environment"""
+    return TaskRunner(
+        platforms=platforms,
+        concurrency=concurrency or int(os.environ.get('SCRAPE_TASK_CONCURRENCY', '2')),
+        lease_seconds=int(os.environ.get('SCRAPE_TASK_LEASE_SECONDS', str(DEFAULT_LEASE_SECONDS))),
+    ).run()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Work through today's shared scrape tasks")
+    parser.add_argument('--status', action='store_true', help="Print today's task counts and exit")
+    parser.add_argument('--concurrency', type=int, help='Tasks scraped in parallel by this process')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+    from dotenv import load_dotenv
+    load_dotenv()
+
+    if args.status:
+        print(json.dumps(task_counts(date.today()), indent=2))
+    else:
+        summaries = run_distributed_scrape(concurrency=args.concurrency)
+        print(json.dumps({key: s.__dict__ for key, s in summaries.items()}, indent=2))
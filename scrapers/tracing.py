@@ -0,0 +1,165 @@
+"""
+Lightweight span tracing exported as Chrome trace-event JSON.
+
+Spans are recorded as complete ("X") events per thread, so nesting shows
+up in chrome://tracing or https://ui.perfetto.dev without parent IDs.
+Tracing is off unless TRACE_ENABLED=true; disabled spans are a shared
+no-op context manager. High-volume spans (per item) are marked `sampled`
+and only kept for a TRACE_SAMPLE_RATE fraction of calls. The TRACE_*
+variables are read on first use, so entry points may load .env after
+importing this module.
+"""
+import functools
+import json
+import logging
+import os
+import random
+import threading
+import time
+from contextlib import nullcontext
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+MAX_EVENTS = 200_000  # Bounds memory if a trace is never exported
+
+_NOOP = nullcontext()
+_enabled: Optional[bool] = None  # None until the environment is read
+_sample_rate = 0.01
+_trace_dir = Path('logs/traces')
+
+_events: List[Dict[str, Any]] = []
+_thread_names: Dict[int, str] = {}  # Pipeline threads are gone by export time
+_dropped = 0
+_label: Optional[str] = None
+_epoch_ns = time.perf_counter_ns()
+_lock = threading.Lock()
+
+def _load_settings() -> bool:
+    global _enabled, _sample_rate, _trace_dir
+    with _lock:
+        if _enabled is None:
+            _sample_rate = float(os.environ.get('TRACE_SAMPLE_RATE', '0.01'))
+            _trace_dir = Path(os.environ.get('TRACE_DIR', 'logs/traces'))
+            _enabled = os.environ.get('TRACE_ENABLED', 'false').lower() == 'true'
+    return _enabled
+
+def configure(enabled: Optional[bool] = None, sample_rate: Optional[float] = None,
+              trace_dir: Optional[str] = None):
+    """Override the environment settings"""
+    global _enabled, _sample_rate, _trace_dir
+    _load_settings()
+    if enabled is not None:
+        _enabled = enabled
+    if sample_rate is not None:
+        _sample_rate = sample_rate
+    if trace_dir is not None:
+        _trace_dir = Path(trace_dir)
+
+def is_enabled() -> bool:
+    return _enabled if _enabled is not None else _load_settings()
+
+class _Span:
+    __slots__ = ('name', 'category', 'args', 'start_ns')
+
+    def __init__(self, name: str, category: str, args: Dict[str, Any]):
+        self.name = name
+        self.category = category
+        self.args = args
+
+    def __enter__(self):
+        self.start_ns = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        end_ns = time.perf_counter_ns()
+        if exc_type is not None:
+            self.args['error'] = f"{exc_type.__name__}: {exc}"
+        _record({
+            'name': self.name,
+            'cat': self.category,
+            'ph': 'X',
+            'ts': (self.start_ns - _epoch_ns) / 1000,
+            'dur': (end_ns - self.start_ns) / 1000,
+            'pid': os.getpid(),
+            'tid': threading.get_native_id(),
+            'args': self.args,
+        })
+        return False
+
+def _record(event: Dict[str, Any]):
+    global _dropped
+    with _lock:
+        if len(_events) < MAX_EVENTS:
+            _events.append(event)
+            _thread_names[event['tid']] = threading.current_thread().name
+        else:
+            _dropped += 1
+
+def span(name: str, category: str = 'run', sampled: bool = False, **args):
+    """
+    Context manager timing a block. `sampled` spans are kept with
+    probability TRACE_SAMPLE_RATE.
+    """
+    if not is_enabled() or (sampled and random.random() >= _sample_rate):
+        return _NOOP
+    return _Span(name, category, args)
+
+def traced(name: Optional[str] = None, category: str = 'run', sampled: bool = False):
+    """Decorator form of span()"""
+    def decorator(func: Callable) -> Callable:
+        span_name = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(span_name, category, sampled):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+def start_trace(label: str):
+    """Discard buffered events and start collecting for `label`"""
+    global _dropped, _label
+    with _lock:
+        _events.clear()
+        _thread_names.clear()
+        _dropped = 0
+        _label = label
+
+def export_trace(path: Optional[str] = None) -> Optional[str]:
+    """
+    Write buffered events as a trace-event JSON file and clear the buffer.
+    Returns the file path, or None when tracing is off or nothing was recorded.
+    """
+    global _dropped
+    if not is_enabled():
+        return None
+    with _lock:
+        events = list(_events)
+        dropped = _dropped
+        label = _label or 'trace'
+        thread_names = dict(_thread_names)
+        _events.clear()
+        _thread_names.clear()
+        _dropped = 0
+    if not events:
+        return None
+
+    metadata = [
+        {'name': 'thread_name', 'ph': 'M', 'pid': pid, 'tid': tid,
+         'args': {'name': thread_names.get(tid, str(tid))}}
+        for pid, tid in {(e['pid'], e['tid']) for e in events}
+    ]
+
+    target = Path(path) if path else _trace_dir / f"{label}-{time.strftime('%Y%m%d-%H%M%S')}.json"
+    target.parent.mkdir(parents=True, exist_ok=True)
+    with open(target, 'w') as f:
+        json.dump({
+            'traceEvents': metadata + events,
+            'displayTimeUnit': 'ms',
+            'otherData': {'label': label, 'sample_rate': _sample_rate, 'dropped_events': dropped},
+        }, f, default=str)
+
+    logger.info(f"Wrote trace with {len(events)} spans to {target}")
+    return str(target)
@@ -0,0 +1,409 @@
+#!/usr/bin/env python3
+"""
+Resident scraper worker.
+
+Runs the daily schedule like ProductionScheduler and additionally serves
+on-demand jobs (platform scrape, curation, rescore) from the scraper_jobs
+table. The admin ingest API enqueues a job and sends NOTIFY; the worker
+claims it with SKIP LOCKED, runs it on warm pooled connections and the
+shared HTTP session, and writes status, result and timings back for the
+caller to poll.
+
+Usage:
+    python worker.py                           # run the worker
+    python worker.py enqueue scrape --platform medium
+    python worker.py status <job-id>
+"""
+import argparse
+import json
+import os
+import select
+import socket
+import sys
+import time
+from dataclasses import asdict
+from typing import Dict, Optional, Tuple
+
+import psycopg2
+import psycopg2.extensions
+from psycopg2.extras import Json
+
+import http_metrics
+import metrics_server
+import run_history
+import tracing
+from coordination import drain_leadership_events
+from database import enable_connection_pool, get_db_connection, setup_database
+from registry import SCRAPERS
+from scheduler import ProductionScheduler, SchedulerConfig
+
+JOB_CHANNEL = 'scraper_jobs'
+JOB_KINDS = ('scrape', 'curation', 'rescore')
+
+def dedupe_key(kind: str, platform: Optional[str] = None) -> str:
+    """Identical in-flight requests share one job"""
+    return f"{kind}:{platform or 'all'}"
+
+def enqueue_job(kind: str, platform: Optional[str] = None,
+                requested_by: Optional[str] = None) -> Tuple[str, bool]:
+    """
+    Queue a job unless an identical one is already queued or running.
+    Returns (job_id, deduplicated).
+    """
+    if kind not in JOB_KINDS:
+        raise ValueError(f"Unknown job kind: {kind}")
+    if platform is not None and platform not in SCRAPERS:
+        raise ValueError(f"Unknown platform: {platform}")
+
+    key = dedupe_key(kind, platform)
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    try:
+        for _ in range(3):
+            cursor.execute("""
+                INSERT INTO scraper_jobs (id, kind, platform, "dedupeKey", "requestedBy")
+                VALUES (gen_random_uuid()::text, %s, %s, %s, %s)
+                ON CONFLICT ("dedupeKey") WHERE status IN ('queued', 'running') DO NOTHING
+                RETURNING id
+            """, (kind, platform, key, requested_by))
+            row = cursor.fetchone()
+            if row:
+                cursor.execute("SELECT pg_notify(%s, %s)", (JOB_CHANNEL, row[0]))
+                conn.commit()
+                return row[0], False
+
+            cursor.execute("""
+                SELECT id FROM scraper_jobs
+                WHERE "dedupeKey" = %s AND status IN ('queued', 'running')
+            """, (key,))
+            row = cursor.fetchone()
+            conn.commit()
+            if row:
+                return row[0], True
+            # The in-flight job finished between the two statements; try again
+
+        raise RuntimeError(f"Could not enqueue {key}")
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cursor.close()
+        conn.close()
+
+def get_job(job_id: str) -> Optional[Dict]:
+    """Job status with queue wait and run time in milliseconds"""
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    try:
+        cursor.execute("""
+            SELECT id, kind, platform, status, "workerId", result, error,
+                   "createdAt", "startedAt", "finishedAt",
+                   EXTRACT(EPOCH FROM (COALESCE("startedAt", NOW()) - "createdAt")) * 1000,
+                   EXTRACT(EPOCH FROM ("finishedAt" - "startedAt")) * 1000
+            FROM scraper_jobs
+            WHERE id = %s
+        """, (job_id,))
+        row = cursor.fetchone()
+        conn.commit()
+    finally:
+        cursor.close()
+        conn.close()
+
+    if not row:
+        return None
+    return {
+        'id': row[0],
+        'kind': row[1],
+        'platform': row[2],
+        'status': row[3],
+        'workerId': row[4],
+        'result': row[5],
+        'error': row[6],
+        'createdAt': row[7].isoformat() if row[7] else None,
+        'startedAt': row[8].isoformat() if row[8] else None,
+        'finishedAt': row[9].isoformat() if row[9] else None,
+        'queueWaitMs': round(row[10]) if row[10] is not None else None,
+        'runMs': round(row[11]) if row[11] is not None else None,
+    }
+
+class ScraperWorker(ProductionScheduler):
+    """ProductionScheduler that also serves queued jobs between scheduled runs"""
+
+    def __init__(self, config: SchedulerConfig = None, poll_interval: float = 5.0,
+                 pool_size: int = 5, run_schedule: bool = True):
+        # Pool first so every get_db_connection() below is a warm connection
+        enable_connection_pool(minconn=1, maxconn=pool_size)
+        super().__init__(config)
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}"
+        self.poll_interval = poll_interval
+        self.run_schedule = run_schedule
+        self.listen_conn = None
+        self.handlers = {
+            'scrape': self._run_scrape_job,
+            'curation': self._run_curation_job,
+            'rescore': self._run_rescore_job,
+        }
+
+    def _listen(self):
+        """Dedicated autocommit connection for LISTEN (kept out of the pool)"""
+        if self.listen_conn is not None and not self.listen_conn.closed:
+            return
+        self.listen_conn = psycopg2.connect(os.environ['DATABASE_URL'])
+        self.listen_conn.set_isolation_level(psycopg2.extensions.ISOLATION_LEVEL_AUTOCOMMIT)
+        self.listen_conn.cursor().execute(f"LISTEN {JOB_CHANNEL}")
+
+    def _wait_for_jobs(self, timeout: float):
+        """Sleep until a job is announced, the timeout passes or we are stopped"""
+        try:
+            self._listen()
+            if select.select([self.listen_conn], [], [], timeout) != ([], [], []):
+                self.listen_conn.poll()
+                self.listen_conn.notifies.clear()
+        except (psycopg2.Error, OSError, ValueError) as e:
+            # select() on a dropped socket or a failed reconnect; fall back to polling
+            self.logger.warning(f"LISTEN connection lost, polling instead: {e}")
+            if self.listen_conn is not None:
+                self.listen_conn.close()
+            self.listen_conn = None
+            time.sleep(min(timeout, 5))
+
+    def _recover_abandoned_jobs(self):
+        """Fail jobs left running by a previous worker process on this host"""
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        try:
+            cursor.execute("""
+                UPDATE scraper_jobs
+                SET status = 'failed',
+                    error = 'Worker restarted before the job finished',
+                    "finishedAt" = CURRENT_TIMESTAMP
+                WHERE status = 'running'
+                  AND "workerId" LIKE %s
+                  AND "workerId" <> %s
+                RETURNING id
+            """, (f"{socket.gethostname()}:%", self.worker_id))
+            abandoned = [row[0] for row in cursor.fetchall()]
+            conn.commit()
+            if abandoned:
+                self.logger.warning(f"Marked {len(abandoned)} abandoned jobs as failed: {abandoned}")
+        finally:
+            cursor.close()
+            conn.close()
+
+    def _claim_job(self) -> Optional[Tuple[str, str, Optional[str]]]:
+        """Claim the oldest queued job; concurrent workers skip each other's rows"""
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        try:
+            cursor.execute("""
+                UPDATE scraper_jobs
+                SET status = 'running', "startedAt" = CURRENT_TIMESTAMP, "workerId" = %s
+                WHERE id = (
+                    SELECT id FROM scraper_jobs
+                    WHERE status = 'queued'
+                    ORDER BY "createdAt"
+                    LIMIT 1
+                    FOR UPDATE SKIP LOCKED
+                )
+                RETURNING id, kind, platform
+            """, (self.worker_id,))
+            row = cursor.fetchone()
+            conn.commit()
+            return row
+        finally:
+            cursor.close()
+            conn.close()
+
+    def _finish_job(self, job_id: str, result: Optional[Dict], error: Optional[str]):
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        try:
+            cursor.execute("""
+                UPDATE scraper_jobs
+                SET status = %s, result = %s, error = %s, "finishedAt" = CURRENT_TIMESTAMP
+                WHERE id = %s
+            """, ('failed' if error else 'succeeded', Json(result) if result is not None else None,
+                  error, job_id))
+            conn.commit()
+        finally:
+            cursor.close()
+            conn.close()
+
+    def process_next_job(self) -> bool:
+        """Run one queued job. Returns False when the queue is empty."""
+        job = self._claim_job()
+        if not job:
+            return False
+
+        job_id, kind, platform = job
+        self.logger.info(f"▶️  Job {job_id}: {kind} ({platform or 'all'})")
+        start_time = time.time()
+        result, error = None, None
+        tracing.start_trace(f"job-{job_id}")
+
+        try:
+            handler = self.handlers.get(kind)
+            if handler is None:
+                raise ValueError(f"Unknown job kind: {kind}")
+            with tracing.span(f"{kind} job", 'run', job_id=job_id, platform=platform):
+                result = handler(platform)
+            if isinstance(result, dict):
+                result['coordination'] = drain_leadership_events()
+                result['trace'] = tracing.export_trace()
+            if isinstance(result, dict) and result.get('success') is False:
+                error = result.get('error') or f"{kind} job failed"
+        except Exception as e:
+            error = str(e)
+
+        duration = time.time() - start_time
+        self._finish_job(job_id, result, error)
+        if error:
+            self.logger.error(f"✗ Job {job_id} failed after {duration:.2f}s: {error}")
+        else:
+            self.logger.info(f"✓ Job {job_id} completed in {duration:.2f}s")
+        return True
+
+    def _run_scrape_job(self, platform: Optional[str]) -> Dict:
+        """Scrape one platform (or every available one), then re-curate"""
+        names = {SCRAPERS[platform].name} if platform else None
+        results = []
+        for name, scraper_func, available in self.scrapers:
+            if names is not None and name not in names:
+                continue
+            if not available:
+                if names is not None:
+                    raise ValueError(f"{name} scraper requirements not met")
+                continue
+            # Manual runs report back quickly instead of waiting out retry delays
+            results.append(self._run_scraper_with_retry(name, scraper_func, max_retries=0))
+
+        metrics_server.record_scraper_results(results)
+        try:
+            run_history.record_results(None, results)
+        except Exception as e:
+            self.logger.warning(f"Failed to record run history: {e}")
+        curation = None
+        if any(r.success for r in results):
+            curation = self._run_curation_job(None)  # Re-curates even if today is already done
+
+        return {
+            'success': any(r.success for r in results),
+            'scrapers': [asdict(r) for r in results],
+            'curation': curation,
+            'http': http_metrics.drain(),
+        }
+
+    def _run_curation_job(self, platform: Optional[str]) -> Dict:
+        from curation_optimized import curate_daily_content
+        start_time = time.time()
+        try:
+            # Requested explicitly, so not held to the once-per-day guard
+            curated = curate_daily_content(once=False)
+        except Exception as e:
+            return {'success': False, 'error': str(e), 'duration': time.time() - start_time}
+        duration = time.time() - start_time
+        if curated is None:
+            return {'success': False, 'skipped': True, 'duration': duration,
+                    'error': 'Curation is running on another replica'}
+        if not curated:
+            return {'success': False, 'error': 'Curation failed', 'duration': duration}
+        metrics_server.record_curation(True)
+        return {'success': True, 'duration': duration}
+
+    def _run_rescore_job(self, platform: Optional[str]) -> Dict:
+        from scoring_optimized import OptimizedScoring
+        start_time = time.time()
+        updated = OptimizedScoring().batch_update_scores(batch_size=1000)
+        return {'success': True, 'updated': updated, 'duration': time.time() - start_time}
+
+    def start_worker(self):
+        """Serve queued jobs and, unless disabled, the daily schedule"""
+        self.logger.info(f"🚀 Scraper worker {self.worker_id} starting...")
+
+        if not self._validate_environment():
+            self.logger.error("❌ Environment validation failed, exiting")
+            sys.exit(1)
+
+        setup_database()
+        self._recover_abandoned_jobs()
+        if self.config.metrics_port:
+            metrics_server.start_metrics_server(self, self.config.metrics_port)
+
+        if self.run_schedule:
+            self._schedule_jobs()
+            self._resume_unfinished_run()
+
+        self.logger.info(f"⏰ Listening for jobs on '{JOB_CHANNEL}'")
+
+        while self.running:
+            try:
+                self.jobs.run_pending()
+
+                while self.running and self.process_next_job():
+                    pass
+
+                # Wake for a NOTIFY, the next scheduled job or the poll interval
+                timeout = self.poll_interval
+                until_next = self.jobs.seconds_until_next()
+                if until_next is not None:
+                    timeout = min(timeout, until_next)
+                if self.running:
+                    self._wait_for_jobs(timeout)
+
+            except Exception as e:
+                self.logger.error(f"Worker loop error: {e}")
+                time.sleep(5)
+
+        self.jobs.shutdown()
+        if self.listen_conn is not None:
+            self.listen_conn.close()
+        self.logger.info("🛑 Worker shutdown completed")
+
+def main():
+    parser = argparse.ArgumentParser(description='Resident scraper worker')
+    subparsers = parser.add_subparsers(dest='command')
+
+    enqueue_parser = subparsers.add_parser('enqueue', help='Queue a job')
+    enqueue_parser.add_argument('kind', choices=JOB_KINDS)
+    enqueue_parser.add_argument('--platform', choices=list(SCRAPERS))
+
+    status_parser = subparsers.add_parser('status', help='Show a job')
+    status_parser.add_argument('job_id')
+
+    parser.add_argument('--no-schedule', action='store_true',
+                        help='Only serve queued jobs, skip the daily schedule')
+    args = parser.parse_args()
+
+    from dotenv import load_dotenv
+    load_dotenv()
+
+    if args.command == 'enqueue':
+        job_id, deduplicated = enqueue_job(args.kind, args.platform, requested_by='cli')
+        print(json.dumps({'jobId': job_id, 'deduplicated': deduplicated}))
+        return
+
+    if args.command == 'status':
+        job = get_job(args.job_id)
+        if not job:
+            print(f"Job {args.job_id} not found", file=sys.stderr)
+            sys.exit(1)
+        print(json.dumps(job, indent=2, default=str))
+        return
+
+    worker = ScraperWorker(
+        SchedulerConfig.from_env(),
+        poll_interval=float(os.environ.get('WORKER_POLL_INTERVAL', '5')),
+        pool_size=int(os.environ.get('WORKER_DB_POOL_SIZE', '5')),
+        run_schedule=not args.no_schedule
+    )
+
+    try:
+        worker.start_worker()
+    except KeyboardInterrupt:
+        worker.logger.info("Received keyboard interrupt, shutting down...")
+    except Exception as e:
+        worker.logger.error(f"Worker crashed: {e}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()